@@ -0,0 +1,7 @@
+"""
+Benchmarks do backend.
+
+Cada módulo é executado a partir do diretório `backend`, com `python -m benchmarks.<nome>`,
+usando o banco de dados configurado em `DATABASE_URL`. Use um banco de dados dedicado:
+os benchmarks inserem produtos quando a tabela não possui linhas suficientes.
+"""
@@ -0,0 +1,113 @@
+"""
+Gerador de dados para os benchmarks.
+
+Insere produtos sintéticos distribuídos igualmente entre as categorias de `categories.CATEGORIES`,
+com preços e fornecedores variados. A geração usa uma semente fixa, de modo que duas
+execuções com os mesmos argumentos produzem os mesmos dados.
+
+Uso:
+    python -m benchmarks.data --products 100000 --reset
+
+Methods:
+    generate_products(count, seed): Gera os dados de `count` produtos sintéticos.
+    seed_products(count, batch_size, seed): Insere `count` produtos sintéticos em lotes.
+    ensure_products(count): Garante que a tabela de produtos possui ao menos `count` linhas.
+    main: Executa o gerador de dados.
+"""
+
+import argparse
+import random
+from typing import Iterator
+
+from sqlalchemy import delete, func, select
+
+from categories import CATEGORIES
+from crud import create_products
+from database import SessionLocal
+from models import ProductModel
+from schemas import ProductCreate
+
+ADJETIVOS = ["Básico", "Premium", "Compacto", "Inteligente", "Portátil", "Clássico"]
+FORNECEDORES = 50
+
+
+def generate_products(count: int, seed: int = 0) -> Iterator[ProductCreate]:
+    """
+    Gera os dados de `count` produtos sintéticos.
+
+    Args:
+        count (int): A quantidade de produtos.
+        seed (int): A semente do gerador de números aleatórios.
+
+    Yields:
+        ProductCreate: Os dados de cada produto, alternando entre as categorias.
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        categoria = CATEGORIES[index % len(CATEGORIES)]
+        yield ProductCreate(
+            name=f"{categoria} {rng.choice(ADJETIVOS)} {index}",
+            description=f"Produto sintético {index} da categoria {categoria}",
+            price=round(rng.uniform(1, 5000), 2),
+            categoria=categoria,
+            email_fornecedor=f"fornecedor{rng.randrange(FORNECEDORES)}@example.com",
+        )
+
+
+def seed_products(count: int, batch_size: int = 5000, seed: int = 0) -> None:
+    """
+    Insere `count` produtos sintéticos em lotes.
+
+    Args:
+        count (int): A quantidade de produtos.
+        batch_size (int): A quantidade de produtos inseridos por transação.
+        seed (int): A semente do gerador de números aleatórios.
+    """
+    batch = []
+    with SessionLocal() as db:
+        for product in generate_products(count, seed):
+            batch.append(product)
+            if len(batch) == batch_size:
+                create_products(db, batch)
+                batch = []
+        create_products(db, batch)
+
+
+def ensure_products(count: int) -> None:
+    """
+    Garante que a tabela de produtos possui ao menos `count` linhas.
+
+    Args:
+        count (int): A quantidade mínima de produtos.
+    """
+    with SessionLocal() as db:
+        existing = db.scalar(select(func.count()).select_from(ProductModel))
+    if existing < count:
+        seed_products(count - existing, seed=existing)
+
+
+def main() -> None:
+    """
+    Executa o gerador de dados.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--products", type=int, default=100_000, help="produtos")
+    parser.add_argument(
+        "--batch-size", type=int, default=5000, help="produtos por lote"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="semente")
+    parser.add_argument(
+        "--reset", action="store_true", help="apaga os produtos existentes antes"
+    )
+    args = parser.parse_args()
+
+    if args.reset:
+        with SessionLocal() as db:
+            db.execute(delete(ProductModel))
+            db.commit()
+    seed_products(args.products, args.batch_size, args.seed)
+    print(f"{args.products} produtos inseridos")
+
+
+if __name__ == "__main__":
+    main()
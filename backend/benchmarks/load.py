@@ -0,0 +1,157 @@
+"""
+Cenário de carga HTTP executado contra a aplicação no próprio processo.
+
+Clientes concorrentes enviam uma mistura de requisições (listagem, leitura por ID, criação e
+atualização) pela interface ASGI da aplicação, sem rede nem servidor, e o resultado é um
+relatório JSON com a latência p50/p95/p99 e a vazão de cada operação e do total. As rotas
+síncronas rodam no threadpool, como no servidor.
+
+Uso:
+    python -m benchmarks.load --requests 5000 --concurrency 32 --output load.json
+
+Methods:
+    parse_mix(value): Converte a mistura de operações informada na linha de comando.
+    run_load(requests, concurrency, mix, seed, base_url): Executa o cenário de carga.
+    main: Executa o benchmark.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import func, select
+
+from benchmarks.data import ensure_products, generate_products
+from benchmarks.report import summarize, write_report
+from database import SessionLocal
+from main import app
+from models import ProductModel
+from pagination import encode_cursor
+
+DEFAULT_MIX = "list=60,get=25,create=10,update=5"
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """
+    Converte a mistura de operações informada na linha de comando.
+
+    Args:
+        value (str): Os pesos no formato `operação=peso`, separados por vírgula.
+
+    Returns:
+        Dict[str, int]: O peso de cada operação.
+
+    Raises:
+        argparse.ArgumentTypeError: Se a operação for desconhecida ou o peso inválido.
+    """
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name not in ("list", "get", "create", "update") or not weight.isdigit():
+            raise argparse.ArgumentTypeError(f"mistura inválida: {item}")
+        mix[name] = int(weight)
+    return mix
+
+
+async def run_load(
+    requests: int,
+    concurrency: int,
+    mix: Dict[str, int],
+    seed: int = 0,
+    base_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Executa o cenário de carga.
+
+    Args:
+        requests (int): A quantidade total de requisições.
+        concurrency (int): A quantidade de clientes concorrentes.
+        mix (Dict[str, int]): O peso de cada operação.
+        seed (int): A semente do gerador de números aleatórios.
+        base_url (Optional[str]): O endereço de um servidor em execução; se None, as
+            requisições são enviadas à aplicação no próprio processo.
+
+    Returns:
+        Dict[str, Any]: O resumo de cada operação e do total.
+    """
+    rng = random.Random(seed)
+    with SessionLocal() as db:
+        first, last = db.execute(
+            select(func.min(ProductModel.id), func.max(ProductModel.id))
+        ).one()
+    new_product = next(generate_products(1, seed)).model_dump()
+    operations = rng.choices(list(mix), weights=list(mix.values()), k=requests)
+    samples: Dict[str, List[float]] = {name: [] for name in mix}
+    errors = {name: 0 for name in mix}
+
+    async def send(client: httpx.AsyncClient, operation: str) -> httpx.Response:
+        if operation == "list":
+            cursor = encode_cursor(rng.randint(first, last))
+            return await client.get(
+                "/products/", params={"limit": 50, "cursor": cursor}
+            )
+        if operation == "get":
+            return await client.get(f"/products/{rng.randint(first, last)}")
+        if operation == "create":
+            return await client.post("/products/", json=new_product)
+        return await client.put(
+            f"/products/{rng.randint(first, last)}",
+            json={"price": round(rng.uniform(1, 5000), 2)},
+        )
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        while operations:
+            operation = operations.pop()
+            start = time.perf_counter()
+            response = await send(client, operation)
+            samples[operation].append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors[operation] += 1
+
+    if base_url is None:
+        options = {
+            "transport": httpx.ASGITransport(app=app),
+            "base_url": "http://bench",
+        }
+    else:
+        limits = httpx.Limits(max_connections=concurrency)
+        options = {"base_url": base_url, "limits": limits, "timeout": 60}
+    async with httpx.AsyncClient(**options) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    results = {name: summarize(samples[name], elapsed, errors[name]) for name in mix}
+    results["total"] = summarize(
+        [sample for values in samples.values() for sample in values],
+        elapsed,
+        sum(errors.values()),
+    )
+    return results
+
+
+def main() -> None:
+    """
+    Executa o benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--products", type=int, default=10_000, help="produtos na base")
+    parser.add_argument("--requests", type=int, default=5000, help="requisições")
+    parser.add_argument("--concurrency", type=int, default=32, help="clientes")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="pesos")
+    parser.add_argument("--seed", type=int, default=0, help="semente")
+    parser.add_argument("--output", help="arquivo do relatório JSON")
+    args = parser.parse_args()
+
+    ensure_products(args.products)
+    results = asyncio.run(
+        run_load(args.requests, args.concurrency, args.mix, args.seed)
+    )
+    write_report("load", vars(args), results, args.output)
+
+
+if __name__ == "__main__":
+    main()
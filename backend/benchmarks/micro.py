@@ -0,0 +1,117 @@
+"""
+Micro-benchmarks das funções de `crud` e da validação de `ProductResponse`.
+
+Cada operação é executada isoladamente, com uma sessão nova por chamada como em uma
+requisição, e o resultado é um relatório JSON com a latência p50/p95/p99 e as operações por
+segundo de cada uma.
+
+Uso:
+    python -m benchmarks.micro --products 10000 --repeat 2000 --output micro.json
+
+Methods:
+    measure(func, repeat): Mede a latência de cada execução de `func`.
+    main: Executa os micro-benchmarks.
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy import func, select
+
+import crud
+from benchmarks.data import ensure_products, generate_products
+from benchmarks.report import summarize, write_report
+from database import SessionLocal
+from models import ProductModel
+from schemas import ProductResponse, ProductUpdate
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """
+    Mede a latência de cada execução de `func`.
+
+    Args:
+        func (Callable[[], object]): A função medida; as primeiras execuções servem de aquecimento.
+        repeat (int): A quantidade de execuções medidas.
+
+    Returns:
+        Dict[str, float]: O resumo das latências e a vazão, como em `summarize`.
+    """
+    for _ in range(max(repeat // 10, 1)):
+        func()
+    samples: List[float] = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call_start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - call_start)
+    return summarize(samples, time.perf_counter() - start)
+
+
+def main() -> None:
+    """
+    Executa os micro-benchmarks.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--products", type=int, default=10_000, help="produtos na base")
+    parser.add_argument("--repeat", type=int, default=2000, help="execuções medidas")
+    parser.add_argument("--seed", type=int, default=0, help="semente")
+    parser.add_argument("--output", help="arquivo do relatório JSON")
+    args = parser.parse_args()
+
+    ensure_products(args.products)
+    rng = random.Random(args.seed)
+    with SessionLocal() as db:
+        first, last = db.execute(
+            select(func.min(ProductModel.id), func.max(ProductModel.id))
+        ).one()
+        db_product = db.get(ProductModel, first)
+        row = crud.get_products(db, limit=1, as_rows=True)[0]
+    data = ProductResponse.model_validate(db_product).model_dump()
+    new_product = next(generate_products(1, args.seed))
+
+    def random_id() -> int:
+        return rng.randint(first, last)
+
+    def with_session(operation: Callable) -> Callable[[], object]:
+        def run():
+            with SessionLocal() as db:
+                return operation(db)
+
+        return run
+
+    operations = {
+        "crud.get_product": with_session(lambda db: crud.get_product(db, random_id())),
+        "crud.get_products": with_session(
+            lambda db: crud.get_products(db, limit=50, after_id=random_id())
+        ),
+        "crud.get_products(as_rows)": with_session(
+            lambda db: crud.get_products(
+                db, limit=50, after_id=random_id(), as_rows=True
+            )
+        ),
+        "crud.create_product": with_session(
+            lambda db: crud.create_product(db, new_product)
+        ),
+        "crud.update_product": with_session(
+            lambda db: crud.update_product(
+                db, random_id(), ProductUpdate(price=rng.uniform(1, 5000))
+            )
+        ),
+        "ProductResponse(orm)": lambda: ProductResponse.model_validate(db_product),
+        "ProductResponse(row)": lambda: ProductResponse.model_validate(row),
+        "ProductResponse(dict)": lambda: ProductResponse.model_validate(data),
+        "ProductResponse.model_dump(json)": lambda: ProductResponse.model_validate(
+            data
+        ).model_dump(mode="json"),
+    }
+    results = {
+        name: measure(operation, args.repeat) for name, operation in operations.items()
+    }
+    write_report("micro", vars(args), results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Estatísticas e relatórios dos benchmarks.
+
+Os relatórios JSON registram o commit e a configuração de cada execução, para que os
+resultados possam ser comparados entre commits.
+
+Methods:
+    percentiles(samples): Calcula a latência p50, p95 e p99 das amostras.
+    summarize(samples, elapsed, errors): Resume as latências e a vazão de uma operação.
+    git_commit(): Retorna o commit atual do repositório, se disponível.
+    write_report(name, config, results, path): Grava o relatório JSON de um benchmark.
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """
+    Calcula a latência p50, p95 e p99 das amostras.
+
+    Args:
+        samples (List[float]): As latências medidas, em segundos.
+
+    Returns:
+        Dict[str, float]: As latências p50, p95 e p99, em milissegundos.
+    """
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49] * 1000, "p95": cuts[94] * 1000, "p99": cuts[98] * 1000}
+
+
+def summarize(samples: List[float], elapsed: float, errors: int = 0) -> Dict[str, Any]:
+    """
+    Resume as latências e a vazão de uma operação.
+
+    Args:
+        samples (List[float]): As latências medidas, em segundos.
+        elapsed (float): A duração total da medição, em segundos.
+        errors (int): A quantidade de execuções com erro.
+
+    Returns:
+        Dict[str, Any]: A quantidade, os erros, os percentis em milissegundos e a vazão por segundo.
+    """
+    return {
+        "count": len(samples),
+        "errors": errors,
+        **{key: round(value, 3) for key, value in percentiles(samples).items()},
+        "throughput": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def git_commit() -> Optional[str]:
+    """
+    Retorna o commit atual do repositório, se disponível.
+
+    Returns:
+        Optional[str]: O hash abreviado do commit, ou None fora de um repositório git.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(
+    name: str, config: Dict[str, Any], results: Dict[str, Any], path: Optional[str]
+) -> Dict[str, Any]:
+    """
+    Grava o relatório JSON de um benchmark.
+
+    Args:
+        name (str): O nome do benchmark.
+        config (Dict[str, Any]): Os parâmetros da execução.
+        results (Dict[str, Any]): Os resultados de cada operação.
+        path (Optional[str]): O arquivo de destino; se None, o relatório é impresso.
+
+    Returns:
+        Dict[str, Any]: O relatório gravado.
+    """
+    report = {
+        "benchmark": name,
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": config,
+        "results": results,
+    }
+    content = json.dumps(report, indent=2, ensure_ascii=False)
+    if path is None:
+        print(content)
+    else:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content + "\n")
+    return report
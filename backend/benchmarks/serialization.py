@@ -0,0 +1,96 @@
+"""
+Benchmark da serialização da listagem de produtos (`GET /products/`).
+
+Compara o caminho padrão (objetos ORM -> `ProductPage` -> `jsonable_encoder` -> `json`) com o
+caminho rápido de `JSON_FAST_PATH` (linhas do banco -> orjson), isoladamente e de ponta a
+ponta pela aplicação, e imprime as operações e as requisições por segundo de cada um.
+
+Uso:
+    python -m benchmarks.serialization --rows 500 --requests 300
+
+Methods:
+    measure(func, repeat): Mede as execuções por segundo de `func`.
+    main: Executa o benchmark.
+"""
+
+import argparse
+import json
+import time
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+import router
+from benchmarks.data import ensure_products
+from crud import get_products
+from database import SessionLocal
+from main import app
+from schemas import ProductPage
+from serialization import dumps
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """
+    Mede as execuções por segundo de `func`.
+
+    Args:
+        func (Callable[[], object]): A função medida; uma execução de aquecimento é descartada.
+        repeat (int): A quantidade de execuções medidas.
+
+    Returns:
+        float: As execuções por segundo.
+    """
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return repeat / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """
+    Executa o benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=500, help="produtos por página")
+    parser.add_argument("--requests", type=int, default=300, help="repetições")
+    args = parser.parse_args()
+
+    ensure_products(args.rows)
+    with SessionLocal() as db:
+        objects = get_products(db, limit=args.rows)
+        rows = get_products(db, limit=args.rows, as_rows=True)
+
+    def default_encode():
+        page = ProductPage(items=objects, next_cursor=None)
+        return json.dumps(jsonable_encoder(page)).encode()
+
+    def fast_encode():
+        return dumps({"items": [row._asdict() for row in rows], "next_cursor": None})
+
+    client = TestClient(app)
+
+    def request():
+        response = client.get("/products/", params={"limit": args.rows})
+        response.raise_for_status()
+
+    results = {}
+    for fast_path in (False, True):
+        router.JSON_FAST_PATH = fast_path
+        results[fast_path] = (
+            measure(fast_encode if fast_path else default_encode, args.requests),
+            measure(request, args.requests),
+        )
+
+    print(f"GET /products/?limit={args.rows} ({args.requests} repetições)")
+    print(f"{'caminho':<10}{'serializações/s':>18}{'requisições/s':>16}")
+    for fast_path, (encodes, requests) in results.items():
+        name = "rápido" if fast_path else "padrão"
+        print(f"{name:<10}{encodes:>18.1f}{requests:>16.1f}")
+    speedup = results[True][1] / results[False][1]
+    print(f"ganho de ponta a ponta: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
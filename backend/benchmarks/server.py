@@ -0,0 +1,118 @@
+"""
+Compara a vazão do servidor de produção com diferentes quantidades de processos.
+
+Para cada valor de `--workers`, inicia `python -m serve` com `SERVER_WORKERS` igual ao valor,
+aguarda a sonda de prontidão e executa o cenário de `benchmarks.load` por HTTP, contra o
+servidor real. O primeiro valor (1, por padrão) é a referência de processo único. O cliente
+de carga roda em um único processo; em máquinas com muitos núcleos, use uma concorrência
+alta o bastante para que o cliente não seja o gargalo.
+
+Uso:
+    python -m benchmarks.server --workers 1,4 --requests 20000 --concurrency 128 --output server.json
+
+Methods:
+    wait_ready(base_url, timeout): Aguarda a sonda de prontidão do servidor.
+    run_server(workers, port, args): Inicia o servidor e executa o cenário de carga contra ele.
+    main: Executa o benchmark.
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict
+
+import httpx
+
+from benchmarks.data import ensure_products
+from benchmarks.load import DEFAULT_MIX, parse_mix, run_load
+from benchmarks.report import write_report
+
+
+def wait_ready(base_url: str, timeout: float = 60.0) -> None:
+    """
+    Aguarda a sonda de prontidão do servidor.
+
+    Args:
+        base_url (str): O endereço do servidor.
+        timeout (float): Segundos de espera antes de desistir.
+
+    Raises:
+        TimeoutError: Se o servidor não ficar pronto dentro do prazo.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health/ready").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise TimeoutError(f"servidor não ficou pronto em {base_url}")
+
+
+def run_server(workers: int, port: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Inicia o servidor e executa o cenário de carga contra ele.
+
+    Args:
+        workers (int): A quantidade de processos do servidor.
+        port (int): A porta do servidor.
+        args (argparse.Namespace): Os parâmetros do cenário de carga.
+
+    Returns:
+        Dict[str, Any]: O resumo de cada operação e do total, como em `run_load`.
+    """
+    env = {**os.environ, "SERVER_WORKERS": str(workers), "SERVER_PORT": str(port)}
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "serve"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(base_url)
+        return asyncio.run(
+            run_load(
+                args.requests, args.concurrency, args.mix, args.seed, base_url=base_url
+            )
+        )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    """
+    Executa o benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--workers",
+        type=lambda value: [int(item) for item in value.split(",")],
+        default=[1, os.cpu_count() or 1],
+        help="quantidades de processos, separadas por vírgula",
+    )
+    parser.add_argument("--products", type=int, default=10_000, help="produtos na base")
+    parser.add_argument("--requests", type=int, default=5000, help="requisições")
+    parser.add_argument("--concurrency", type=int, default=64, help="clientes")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="pesos")
+    parser.add_argument("--seed", type=int, default=0, help="semente")
+    parser.add_argument("--port", type=int, default=8100, help="porta do servidor")
+    parser.add_argument("--output", help="arquivo do relatório JSON")
+    args = parser.parse_args()
+
+    ensure_products(args.products)
+    results = {
+        f"workers={workers}": run_server(workers, args.port, args)
+        for workers in dict.fromkeys(args.workers)
+    }
+    write_report("server", vars(args), results, args.output)
+
+
+if __name__ == "__main__":
+    main()
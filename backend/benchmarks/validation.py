@@ -0,0 +1,119 @@
+"""
+Benchmark da validação dos itens de um lote (`POST /products/bulk`).
+
+Compara a validação atual, que verifica a categoria com uma consulta ao frozenset de
+`categories`, com a validação anterior, que montava a lista dos valores de `CategoriaBase` e a
+percorria a cada item. Mede tanto a verificação isolada da categoria quanto a validação
+completa de um lote de `MAX_BULK_ITEMS` itens por `bulk.validate_bulk_items`, e o resultado é
+um relatório JSON com a latência de cada lote e os itens validados por segundo.
+
+Uso:
+    python -m benchmarks.validation --items 5000 --repeat 50 --output validation.json
+
+Methods:
+    LegacyProductCreate: `ProductCreate` com a verificação de categoria anterior.
+    legacy_check(value): Verifica a categoria percorrendo a lista de valores.
+    measure(func, repeat, items): Mede a latência de cada lote e os itens por segundo.
+    main: Executa o benchmark.
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Dict, List
+
+from pydantic import field_validator
+
+from benchmarks.data import generate_products
+from benchmarks.report import summarize, write_report
+from bulk import validate_bulk_items
+from categories import CategoriaBase, is_valid_category
+from schemas import MAX_BULK_ITEMS, ProductCreate
+
+
+def legacy_check(value: str) -> bool:
+    """
+    Verifica a categoria percorrendo a lista de valores, como antes do registro.
+
+    Args:
+        value (str): O valor da categoria.
+
+    Returns:
+        bool: Verdadeiro se o valor pertence a `CategoriaBase`.
+    """
+    return value in [item.value for item in CategoriaBase]
+
+
+class LegacyProductCreate(ProductCreate):
+    """
+    `ProductCreate` com a verificação de categoria anterior, usado como referência.
+    """
+
+    @field_validator("categoria")
+    def check_categoria(cls, v):
+        if legacy_check(v):
+            return v
+        raise ValueError("Categoria inválida")
+
+
+def measure(func: Callable[[], object], repeat: int, items: int) -> Dict[str, Any]:
+    """
+    Mede a latência de cada lote e os itens por segundo.
+
+    Args:
+        func (Callable[[], object]): A função medida, que processa um lote inteiro; a primeira
+            execução serve de aquecimento.
+        repeat (int): A quantidade de execuções medidas.
+        items (int): Os itens de cada lote.
+
+    Returns:
+        Dict[str, Any]: O resumo das latências, como em `summarize`, e os itens por segundo.
+    """
+    func()
+    samples: List[float] = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call_start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - call_start)
+    summary = summarize(samples, time.perf_counter() - start)
+    summary["items_per_second"] = round(summary["throughput"] * items, 1)
+    return summary
+
+
+def main() -> None:
+    """
+    Executa o benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--items", type=int, default=MAX_BULK_ITEMS, help="itens por lote"
+    )
+    parser.add_argument("--repeat", type=int, default=50, help="lotes medidos")
+    parser.add_argument("--seed", type=int, default=0, help="semente")
+    parser.add_argument("--output", help="arquivo do relatório JSON")
+    args = parser.parse_args()
+
+    items = [
+        product.model_dump() for product in generate_products(args.items, args.seed)
+    ]
+    values = [item["categoria"] for item in items]
+
+    operations = {
+        "categoria(list)": lambda: all(map(legacy_check, values)),
+        "categoria(frozenset)": lambda: all(map(is_valid_category, values)),
+        "validate_bulk_items(list)": lambda: validate_bulk_items(
+            LegacyProductCreate, items
+        ),
+        "validate_bulk_items(frozenset)": lambda: validate_bulk_items(
+            ProductCreate, items
+        ),
+    }
+    results = {
+        name: measure(operation, args.repeat, args.items)
+        for name, operation in operations.items()
+    }
+    write_report("validation", vars(args), results, args.output)
+
+
+if __name__ == "__main__":
+    main()
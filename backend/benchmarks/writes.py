@@ -0,0 +1,134 @@
+"""
+Benchmark de latência das escritas de um produto (criar, atualizar e deletar).
+
+Compara as funções de `crud`, que executam um único `INSERT/UPDATE/DELETE ... RETURNING`
+por operação, com o fluxo pelo ORM (`SELECT`, alteração do objeto e commit, seguido de
+`refresh` na criação), e imprime a latência p50/p95/p99 de cada operação em milissegundos.
+
+Uso:
+    python -m benchmarks.writes --operations 1000
+
+Methods:
+    orm_create(db, product): Cria o produto pelo ORM, com `refresh` após o commit.
+    orm_update(db, product_id, product): Atualiza o produto pelo ORM, a partir de um `SELECT`.
+    orm_delete(db, product_id): Deleta o produto pelo ORM, a partir de um `SELECT`.
+    run(create, update, delete, operations): Executa o ciclo criar, atualizar e deletar.
+    main: Executa o benchmark.
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List
+
+from sqlalchemy.orm import Session
+
+import crud
+from benchmarks.report import percentiles
+from database import SessionLocal
+from models import ProductModel
+from schemas import ProductCreate, ProductUpdate
+
+PRODUCT = ProductCreate(
+    name="Produto",
+    description="Produto gerado pelo benchmark",
+    price=10.0,
+    categoria="Eletrônico",
+    email_fornecedor="benchmark@example.com",
+)
+CHANGES = ProductUpdate(price=12.5, description="Produto alterado pelo benchmark")
+
+
+def orm_create(db: Session, product: ProductCreate) -> ProductModel:
+    """
+    Cria o produto pelo ORM, com `refresh` após o commit.
+    """
+    db_product = ProductModel(**product.model_dump())
+    db.add(db_product)
+    db.commit()
+    db.refresh(db_product)
+    return db_product
+
+
+def orm_update(db: Session, product_id: int, product: ProductUpdate) -> ProductModel:
+    """
+    Atualiza o produto pelo ORM, a partir de um `SELECT`.
+    """
+    db_product = db.get(ProductModel, product_id)
+    for field, value in product.model_dump(exclude_none=True).items():
+        setattr(db_product, field, value)
+    db.commit()
+    return db_product
+
+
+def orm_delete(db: Session, product_id: int) -> ProductModel:
+    """
+    Deleta o produto pelo ORM, a partir de um `SELECT`.
+    """
+    db_product = db.get(ProductModel, product_id)
+    db.delete(db_product)
+    db.commit()
+    return db_product
+
+
+def run(
+    create: Callable, update: Callable, delete: Callable, operations: int
+) -> Dict[str, List[float]]:
+    """
+    Executa o ciclo criar, atualizar e deletar, com uma sessão nova por operação.
+
+    Args:
+        create (Callable): A função que cria o produto.
+        update (Callable): A função que atualiza o produto.
+        delete (Callable): A função que deleta o produto.
+        operations (int): A quantidade de ciclos.
+
+    Returns:
+        Dict[str, List[float]]: As latências de cada operação, em segundos.
+    """
+    samples = {"create": [], "update": [], "delete": []}
+    for _ in range(operations):
+        start = time.perf_counter()
+        with SessionLocal() as db:
+            product_id = create(db, PRODUCT).id
+        samples["create"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with SessionLocal() as db:
+            update(db, product_id, CHANGES)
+        samples["update"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with SessionLocal() as db:
+            delete(db, product_id)
+        samples["delete"].append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    """
+    Executa o benchmark.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--operations", type=int, default=1000, help="ciclos medidos")
+    args = parser.parse_args()
+
+    paths = {
+        "orm": (orm_create, orm_update, orm_delete),
+        "returning": (crud.create_product, crud.update_product, crud.delete_product),
+    }
+    for functions in paths.values():
+        run(*functions, operations=max(args.operations // 10, 1))
+
+    print(f"Latência das escritas em ms ({args.operations} ciclos)")
+    print(f"{'caminho':<11}{'operação':<10}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, functions in paths.items():
+        for operation, samples in run(*functions, operations=args.operations).items():
+            result = percentiles(samples)
+            print(
+                f"{name:<11}{operation:<10}"
+                f"{result['p50']:>9.3f}{result['p95']:>9.3f}{result['p99']:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
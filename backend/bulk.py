@@ -0,0 +1,175 @@
+"""
+Módulo de apoio às operações em lote de produtos.
+
+Concentra a validação item a item e a montagem dos erros por item, compartilhadas pelas
+rotas síncronas e assíncronas de criação, atualização e deleção em lote, e a montagem do
+resultado da consulta de vários produtos pelos seus IDs.
+
+Methods:
+    validate_bulk_items(model, items): Valida os itens de um lote individualmente, separando os válidos dos inválidos.
+    split_repeated_ids(valid): Separa os itens com ID repetido no lote, mantendo a primeira ocorrência.
+    not_found_errors(positions, rows, ignore): Gera os erros dos IDs que não foram encontrados no banco de dados.
+    version_conflict_errors(positions, conflicts): Gera os erros dos IDs com conflito de versão.
+    parse_ids(value, limit): Converte a lista de IDs separados por vírgula de `GET /products/lookup`.
+    lookup_result(product_ids, products): Monta o resultado da consulta de produtos por IDs.
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Row
+
+from schemas import BulkItemError
+
+
+def validate_bulk_items(
+    model: Type[BaseModel], items: List[Dict[str, Any]]
+) -> Tuple[List[Tuple[int, BaseModel]], List[BulkItemError]]:
+    """
+    Valida os itens de um lote individualmente, separando os válidos dos inválidos.
+
+    Args:
+        model (Type[BaseModel]): O modelo Pydantic usado para validar cada item.
+        items (List[Dict[str, Any]]): Os itens recebidos no corpo da requisição.
+
+    Returns:
+        Tuple[List[Tuple[int, BaseModel]], List[BulkItemError]]: Os itens válidos com sua
+            posição no lote e os erros dos itens inválidos.
+    """
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, model.model_validate(item)))
+        except ValidationError as exc:
+            errors.append(
+                BulkItemError(
+                    index=index,
+                    id=item.get("id") if isinstance(item.get("id"), int) else None,
+                    detail=[
+                        {"loc": list(error["loc"]), "msg": error["msg"]}
+                        for error in exc.errors()
+                    ],
+                )
+            )
+    return valid, errors
+
+
+def split_repeated_ids(
+    valid: List[Tuple[int, BaseModel]],
+) -> Tuple[List[BaseModel], Dict[int, int], List[BulkItemError]]:
+    """
+    Separa os itens com ID repetido no lote, mantendo a primeira ocorrência.
+
+    Args:
+        valid (List[Tuple[int, BaseModel]]): Os itens válidos com sua posição no lote.
+
+    Returns:
+        Tuple[List[BaseModel], Dict[int, int], List[BulkItemError]]: Os itens únicos, a posição
+            de cada ID no lote e os erros dos itens repetidos.
+    """
+    unique, positions, errors = [], {}, []
+    for index, item in valid:
+        if item.id in positions:
+            errors.append(
+                BulkItemError(index=index, id=item.id, detail="ID repetido no lote")
+            )
+        else:
+            positions[item.id] = index
+            unique.append(item)
+    return unique, positions, errors
+
+
+def not_found_errors(
+    positions: Dict[int, int], rows: Iterable[Row], ignore: Iterable[int] = ()
+) -> List[BulkItemError]:
+    """
+    Gera os erros dos IDs que não foram encontrados no banco de dados.
+
+    Args:
+        positions (Dict[int, int]): A posição no lote de cada ID enviado.
+        rows (Iterable[Row]): As linhas efetivamente afetadas pela operação.
+        ignore (Iterable[int]): IDs existentes que não foram afetados por outro motivo.
+
+    Returns:
+        List[BulkItemError]: Um erro "Product not found" para cada ID ausente em `rows`.
+    """
+    found = {row.id for row in rows} | set(ignore)
+    return [
+        BulkItemError(index=index, id=product_id, detail="Product not found")
+        for product_id, index in positions.items()
+        if product_id not in found
+    ]
+
+
+def version_conflict_errors(
+    positions: Dict[int, int], conflicts: Iterable[int]
+) -> List[BulkItemError]:
+    """
+    Gera os erros dos IDs com conflito de versão.
+
+    Args:
+        positions (Dict[int, int]): A posição no lote de cada ID enviado.
+        conflicts (Iterable[int]): Os IDs cuja versão informada não é a versão atual.
+
+    Returns:
+        List[BulkItemError]: Um erro "Version conflict" para cada ID em `conflicts`.
+    """
+    return [
+        BulkItemError(
+            index=positions[product_id], id=product_id, detail="Version conflict"
+        )
+        for product_id in conflicts
+    ]
+
+
+def parse_ids(value: str, limit: int) -> List[int]:
+    """
+    Converte a lista de IDs separados por vírgula de `GET /products/lookup`.
+
+    Args:
+        value (str): Os IDs, como "1,2,3".
+        limit (int): A quantidade máxima de IDs.
+
+    Returns:
+        List[int]: Os IDs, na ordem informada.
+
+    Raises:
+        ValueError: Se algum ID não for um número inteiro, se nenhum for informado ou se a
+            quantidade exceder `limit`.
+    """
+    try:
+        product_ids = [int(item) for item in value.split(",") if item.strip()]
+    except ValueError:
+        raise ValueError("ids must be comma separated integers") from None
+    if not product_ids:
+        raise ValueError("ids must not be empty")
+    if len(product_ids) > limit:
+        raise ValueError(f"At most {limit} ids per request")
+    return product_ids
+
+
+def lookup_result(
+    product_ids: Sequence[int], products: Dict[int, dict]
+) -> Dict[str, List[Any]]:
+    """
+    Monta o resultado da consulta de produtos por IDs.
+
+    Os produtos seguem a ordem dos IDs pedidos; IDs repetidos aparecem uma única vez, na
+    primeira posição em que foram pedidos.
+
+    Args:
+        product_ids (Sequence[int]): Os IDs pedidos.
+        products (Dict[int, dict]): Os produtos encontrados, serializados, pelo ID.
+
+    Returns:
+        Dict[str, List[Any]]: Os produtos encontrados em `items` e os IDs ausentes em
+            `missing`, no formato de `ProductLookupResult`.
+    """
+    items, missing = [], []
+    for product_id in dict.fromkeys(product_ids):
+        product = products.get(product_id)
+        if product is None:
+            missing.append(product_id)
+        else:
+            items.append(product)
+    return {"items": items, "missing": missing}
@@ -0,0 +1,344 @@
+"""
+Módulo de cache de leitura (read-through) para produtos.
+
+Oferece um cache em memória do processo (LRU com TTL e tamanho máximo) e um cache
+compartilhado compatível com o protocolo Redis. O backend é escolhido por `CACHE_BACKEND`.
+Os valores armazenados são dicionários serializáveis em JSON, prontos para a resposta.
+
+Os métodos dos caches são síncronos. As rotas assíncronas os chamam por `call_cache`, que
+executa no threadpool as chamadas de rede do cache Redis, para não bloquear o event loop.
+
+Methods:
+    create_cache(name, ttl): Cria o cache configurado em `CACHE_BACKEND`.
+    serialize_product(db_product): Converte um produto do banco de dados no dicionário armazenado no cache.
+    read_through(cache, key, loader, use_cached, store): Retorna o valor do cache ou o carrega com
+        `loader` e o armazena.
+    read_through_many(cache, keys, loader, use_cached, store): Retorna os valores do cache e carrega
+        os ausentes de uma vez.
+    call_cache(method, *args): Chama um método do cache a partir de código assíncrono.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence
+
+from prometheus_client import Counter
+from starlette.concurrency import run_in_threadpool
+
+from config import (
+    CACHE_BACKEND,
+    CACHE_MAXSIZE,
+    CACHE_REDIS_URL,
+    CACHE_TTL,
+    STATS_CACHE_TTL,
+)
+from schemas import ProductResponse
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Consultas ao cache, por resultado (hit ou miss).",
+    ["cache", "result"],
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Entradas removidas do cache em memória, por motivo (size ou expired).",
+    ["cache", "reason"],
+)
+
+
+class NullCache:
+    """
+    Cache desativado: nunca armazena nada e toda consulta é um miss.
+
+    Parameters:
+        name (str): O nome do cache, usado nos rótulos das métricas.
+    """
+
+    blocking = False
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        CACHE_REQUESTS.labels(self.name, "miss").inc()
+        return None
+
+    def get_many(self, keys: Sequence[Hashable]) -> Dict[Hashable, Any]:
+        CACHE_REQUESTS.labels(self.name, "miss").inc(len(keys))
+        return {}
+
+    def set(self, key: Hashable, value: Any) -> None:
+        pass
+
+    def set_many(self, items: Dict[Hashable, Any]) -> None:
+        pass
+
+    def delete(self, *keys: Hashable) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryCache:
+    """
+    Cache LRU em memória do processo, com TTL e quantidade máxima de entradas.
+
+    É seguro para uso concorrente pelas threads do threadpool do FastAPI. Cada processo
+    (worker) possui o seu próprio cache, por isso alterações feitas em outro processo só
+    são percebidas após o TTL.
+
+    Parameters:
+        name (str): O nome do cache, usado nos rótulos das métricas.
+        maxsize (int): A quantidade máxima de entradas; a menos usada recentemente é removida.
+        ttl (float): O tempo de vida de cada entrada, em segundos.
+    """
+
+    blocking = False
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._data[key]
+                CACHE_EVICTIONS.labels(self.name, "expired").inc()
+                entry = None
+            if entry is None:
+                CACHE_REQUESTS.labels(self.name, "miss").inc()
+                return None
+            self._data.move_to_end(key)
+        CACHE_REQUESTS.labels(self.name, "hit").inc()
+        return entry[1]
+
+    def get_many(self, keys: Sequence[Hashable]) -> Dict[Hashable, Any]:
+        values = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[Hashable, Any]) -> None:
+        with self._lock:
+            expires = time.monotonic() + self.ttl
+            for key, value in items.items():
+                self._data[key] = (expires, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                CACHE_EVICTIONS.labels(self.name, "size").inc()
+
+    def delete(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache:
+    """
+    Cache compartilhado entre processos, compatível com o protocolo Redis.
+
+    Recebe o cliente já construído, o que permite usar qualquer implementação compatível
+    com `redis.Redis` (por exemplo, um `fakeredis.FakeRedis` local). A remoção de entradas
+    por tamanho fica a cargo da política `maxmemory` do servidor.
+
+    Parameters:
+        name (str): O nome do cache, usado como prefixo das chaves e nos rótulos das métricas.
+        client: O cliente Redis.
+        ttl (float): O tempo de vida de cada entrada, em segundos.
+    """
+
+    # as chamadas aguardam a rede e devem sair do event loop
+    blocking = True
+
+    def __init__(self, name: str, client, ttl: float):
+        self.name = name
+        self.client = client
+        self.ttl = ttl
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.name}:{key}"
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        raw = self.client.get(self._key(key))
+        if raw is None:
+            CACHE_REQUESTS.labels(self.name, "miss").inc()
+            return None
+        CACHE_REQUESTS.labels(self.name, "hit").inc()
+        return json.loads(raw)
+
+    def get_many(self, keys: Sequence[Hashable]) -> Dict[Hashable, Any]:
+        if not keys:
+            return {}
+        # um único MGET, em vez de uma ida ao servidor por chave
+        raws = self.client.mget([self._key(key) for key in keys])
+        values = {
+            key: json.loads(raw) for key, raw in zip(keys, raws) if raw is not None
+        }
+        CACHE_REQUESTS.labels(self.name, "hit").inc(len(values))
+        CACHE_REQUESTS.labels(self.name, "miss").inc(len(keys) - len(values))
+        return values
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.client.set(
+            self._key(key), json.dumps(value), px=max(int(self.ttl * 1000), 1)
+        )
+
+    def set_many(self, items: Dict[Hashable, Any]) -> None:
+        pipeline = self.client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipeline.set(
+                self._key(key), json.dumps(value), px=max(int(self.ttl * 1000), 1)
+            )
+        pipeline.execute()
+
+    def delete(self, *keys: Hashable) -> None:
+        if keys:
+            self.client.delete(*(self._key(key) for key in keys))
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.name}:*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+def create_cache(name: str, ttl: Optional[float] = None):
+    """
+    Cria o cache configurado em `CACHE_BACKEND`.
+
+    Args:
+        name (str): O nome do cache, usado nas métricas e como prefixo das chaves no Redis.
+        ttl (Optional[float]): O tempo de vida das entradas, em segundos; se None, usa `CACHE_TTL`.
+
+    Returns:
+        NullCache | MemoryCache | RedisCache: O cache do backend configurado.
+
+    Raises:
+        ValueError: Se `CACHE_BACKEND` não for "memory", "redis" ou "none".
+    """
+    ttl = CACHE_TTL if ttl is None else ttl
+    if CACHE_BACKEND == "none":
+        return NullCache(name)
+    if CACHE_BACKEND == "memory":
+        return MemoryCache(name, maxsize=CACHE_MAXSIZE, ttl=ttl)
+    if CACHE_BACKEND == "redis":
+        import redis
+
+        return RedisCache(name, redis.Redis.from_url(CACHE_REDIS_URL), ttl=ttl)
+    raise ValueError(f"CACHE_BACKEND inválido: {CACHE_BACKEND}")
+
+
+def serialize_product(db_product) -> dict:
+    """
+    Converte um produto do banco de dados no dicionário armazenado no cache.
+
+    Args:
+        db_product: O objeto `ProductModel` (ou linha com os mesmos atributos).
+
+    Returns:
+        dict: Os campos de `ProductResponse` em tipos compatíveis com JSON.
+    """
+    return ProductResponse.model_validate(db_product).model_dump(mode="json")
+
+
+def read_through(
+    cache,
+    key: Hashable,
+    loader: Callable[[], Any],
+    use_cached: bool = True,
+    store: bool = True,
+) -> Optional[dict]:
+    """
+    Retorna o valor do cache ou o carrega com `loader` e o armazena.
+
+    Args:
+        cache: O cache consultado.
+        key (Hashable): A chave da entrada.
+        loader (Callable[[], Any]): Função que busca o produto no banco de dados, retornando None se não existir.
+        use_cached (bool): Se falso, o cache não é consultado e o produto é sempre carregado.
+        store (bool): Se falso, o produto carregado não é armazenado no cache.
+
+    Returns:
+        Optional[dict]: O produto serializado, ou None se não existir.
+    """
+    value = cache.get(key) if use_cached else None
+    if value is None:
+        db_product = loader()
+        if db_product is None:
+            return None
+        value = serialize_product(db_product)
+        if store:
+            cache.set(key, value)
+    return value
+
+
+def read_through_many(
+    cache,
+    keys: Sequence[Hashable],
+    loader: Callable[[List[Hashable]], Iterable[Any]],
+    use_cached: bool = True,
+    store: bool = True,
+) -> Dict[Hashable, dict]:
+    """
+    Retorna os valores do cache e carrega os ausentes de uma única vez.
+
+    Args:
+        cache: O cache consultado.
+        keys (Sequence[Hashable]): As chaves (IDs dos produtos) das entradas.
+        loader (Callable[[List[Hashable]], Iterable[Any]]): Função que busca no banco de dados
+            os produtos das chaves ausentes do cache, em uma única consulta.
+        use_cached (bool): Se falso, o cache não é consultado e todos os produtos são carregados.
+        store (bool): Se falso, os produtos carregados não são armazenados no cache.
+
+    Returns:
+        Dict[Hashable, dict]: Os produtos serializados encontrados, pelo ID; os inexistentes
+            ficam de fora.
+    """
+    keys = list(dict.fromkeys(keys))
+    values = cache.get_many(keys) if use_cached else {}
+    missing = [key for key in keys if key not in values]
+    if missing:
+        loaded = {row.id: serialize_product(row) for row in loader(missing)}
+        if loaded and store:
+            cache.set_many(loaded)
+        values.update(loaded)
+    return values
+
+
+async def call_cache(method: Callable[..., Any], *args: Any) -> Any:
+    """
+    Chama um método do cache a partir de código assíncrono.
+
+    Os caches em memória e desativado respondem sem I/O e são chamados diretamente; o cache
+    Redis é chamado no threadpool, pois o cliente síncrono bloquearia o event loop.
+
+    Args:
+        method (Callable[..., Any]): O método do cache, como `product_cache.get`.
+        *args (Any): Os argumentos do método.
+
+    Returns:
+        Any: O retorno do método.
+    """
+    if method.__self__.blocking:
+        return await run_in_threadpool(method, *args)
+    return method(*args)
+
+
+product_cache = create_cache("products")
+stats_cache = create_cache("stats", ttl=STATS_CACHE_TTL)
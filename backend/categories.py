@@ -0,0 +1,93 @@
+"""
+Módulo do registro de categorias de produtos.
+
+As categorias são definidas uma única vez em `CategoriaBase`, usada pelos schemas, pelas
+rotas e pelos benchmarks, e publicadas em `GET /categories` para que o frontend não mantenha
+a sua própria lista. `VALID_CATEGORIES` guarda os valores em um frozenset, montado na
+importação do módulo, de modo que a verificação de uma categoria é uma consulta O(1), sem
+percorrer a enumeração a cada item validado.
+
+Methods:
+    is_valid_category(value): Verifica se o valor é uma categoria cadastrada.
+    read_categories: Rota que retorna as categorias de produtos.
+"""
+
+from enum import Enum
+from typing import FrozenSet, Optional, Tuple
+
+import orjson
+from fastapi import APIRouter, Header, Response
+
+from config import CATEGORIES_MAX_AGE
+from etag import categories_etag, etag_matches, not_modified
+
+
+class CategoriaBase(Enum):
+    """
+    Uma enumeração que representa categorias disponíveis para produtos.
+
+    Valores da Enum:
+
+    - categoria1: "Eletrônico".
+    - categoria2: "Eletrodoméstico".
+    - categoria3: "Móveis".
+    - categoria4: "Roupas".
+    - categoria5: "Calçados".
+    """
+
+    categoria1 = "Eletrônico"
+    categoria2 = "Eletrodoméstico"
+    categoria3 = "Móveis"
+    categoria4 = "Roupas"
+    categoria5 = "Calçados"
+
+
+# os valores das categorias, na ordem de exibição
+CATEGORIES: Tuple[str, ...] = tuple(item.value for item in CategoriaBase)
+
+VALID_CATEGORIES: FrozenSet[str] = frozenset(CATEGORIES)
+
+# a resposta de GET /categories não muda durante a vida do processo
+CATEGORIES_BODY = orjson.dumps(CATEGORIES)
+CATEGORIES_ETAG = categories_etag(CATEGORIES)
+
+
+def is_valid_category(value: str) -> bool:
+    """
+    Verifica se o valor é uma categoria cadastrada.
+
+    Args:
+        value (str): O valor da categoria.
+
+    Returns:
+        bool: Verdadeiro se o valor pertence ao registro de categorias.
+    """
+    return value in VALID_CATEGORIES
+
+
+router = APIRouter()
+
+
+@router.get("/categories", response_model=list[str])
+async def read_categories(if_none_match: Optional[str] = Header(None)) -> Response:
+    """
+    Rota que retorna as categorias de produtos.
+
+    A resposta é serializada uma única vez e enviada com `ETag` e `Cache-Control`, para que
+    clientes e proxies a reutilizem por `CATEGORIES_MAX_AGE` segundos.
+
+    Args:
+        if_none_match (Optional[str]): ETag das categorias que o cliente já possui.
+
+    Returns:
+        Response: A lista das categorias, ou `304 Not Modified` se o cliente já a possui.
+    """
+    headers = {
+        "ETag": CATEGORIES_ETAG,
+        "Cache-Control": f"public, max-age={CATEGORIES_MAX_AGE}",
+    }
+    if etag_matches(if_none_match, CATEGORIES_ETAG):
+        response = not_modified(CATEGORIES_ETAG)
+        response.headers["Cache-Control"] = headers["Cache-Control"]
+        return response
+    return Response(CATEGORIES_BODY, media_type="application/json", headers=headers)
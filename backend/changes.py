@@ -0,0 +1,333 @@
+"""
+Módulo do feed de alterações de produtos.
+
+As escritas de `crud` (e as tarefas em segundo plano que alteram produtos) gravam um evento
+por produto na tabela `product_changes` (outbox), na mesma transação da alteração. A rota
+`GET /products/changes` publica esses eventos como Server-Sent Events, em ordem de `id`, e
+pode ser retomada a partir do último evento recebido (`Last-Event-ID` ou `?after=`), de
+modo que os consumidores recebem apenas as alterações, sem reler a listagem inteira.
+
+O feed consulta o outbox periodicamente (`CHANGES_POLL_INTERVAL`), com uma sessão curta a
+cada consulta, sem manter uma conexão do pool aberta por cliente conectado.
+
+Methods:
+    change_values(operation, rows): Monta os eventos de alteração das linhas de produtos.
+    record_changes(db, operation, rows): Grava os eventos de alteração na transação corrente.
+    read_changes(db, after_id, limit): Retorna os eventos posteriores a `after_id`.
+    first_change_id(db): Retorna o ID do evento mais antigo ainda retido.
+    last_change_id(db): Retorna o ID do evento mais recente.
+    purge_changes(db, retention_hours): Remove os eventos mais antigos que a retenção.
+    format_event(change): Formata um evento no formato de Server-Sent Events.
+    change_events(request, after_id, poll_interval): Gera os eventos do feed enquanto o
+        cliente estiver conectado.
+    invalidate_caches(poll_interval): Descarta do cache em memória os produtos alterados por
+        outros processos.
+    read_product_changes: Rota que publica o feed de alterações de produtos.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Callable, List, Optional, Sequence, TypeVar
+
+import orjson
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, delete, func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from cache import call_cache, product_cache, stats_cache
+from config import CHANGES_POLL_INTERVAL
+from database import SessionLocal
+from models import ProductChangeModel
+from serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# eventos lidos por consulta ao outbox
+BATCH_SIZE = 500
+
+# segundos de espera por um ID ausente na sequência: um evento de ID menor pode ainda estar
+# em uma transação não confirmada; depois disso, o ID é tratado como uma transação desfeita
+GAP_TIMEOUT = 5.0
+
+# segundos sem eventos após os quais um comentário é enviado, para manter a conexão aberta
+# em proxies que encerram conexões ociosas
+KEEPALIVE = 15.0
+
+
+def change_values(operation: str, rows: Sequence[Row]) -> List[dict]:
+    """
+    Monta os eventos de alteração das linhas de produtos.
+
+    Args:
+        operation (str): A operação: "create", "update" ou "delete".
+        rows (Sequence[Row]): As linhas dos produtos após a alteração, ou as linhas removidas.
+
+    Returns:
+        List[dict]: Os parâmetros do `INSERT` de cada evento.
+    """
+    return [
+        {
+            "product_id": row.id,
+            "operation": operation,
+            "version": row.version,
+            "data": dumps(row._asdict()).decode(),
+        }
+        for row in rows
+    ]
+
+
+def record_changes(db: Session, operation: str, rows: Sequence[Row]) -> None:
+    """
+    Grava os eventos de alteração na transação corrente, sem confirmá-la.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy.
+        operation (str): A operação: "create", "update" ou "delete".
+        rows (Sequence[Row]): As linhas dos produtos alterados.
+    """
+    if rows:
+        db.execute(insert(ProductChangeModel), change_values(operation, rows))
+
+
+def read_changes(db: Session, after_id: int, limit: int) -> List[Row]:
+    """
+    Retorna os eventos posteriores a `after_id`, em ordem de `id`.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy.
+        after_id (int): O ID do último evento já recebido.
+        limit (int): A quantidade máxima de eventos.
+
+    Returns:
+        List[Row]: As linhas dos eventos seguintes.
+    """
+    return db.execute(
+        select(*ProductChangeModel.__table__.columns)
+        .where(ProductChangeModel.id > after_id)
+        .order_by(ProductChangeModel.id)
+        .limit(limit)
+    ).all()
+
+
+def first_change_id(db: Session) -> Optional[int]:
+    """
+    Retorna o ID do evento mais antigo ainda retido.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy.
+
+    Returns:
+        Optional[int]: O menor ID do outbox, ou None se estiver vazio.
+    """
+    return db.scalar(select(func.min(ProductChangeModel.id)))
+
+
+def last_change_id(db: Session) -> int:
+    """
+    Retorna o ID do evento mais recente.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy.
+
+    Returns:
+        int: O maior ID do outbox, ou 0 se estiver vazio.
+    """
+    return db.scalar(select(func.max(ProductChangeModel.id))) or 0
+
+
+def purge_changes(db: Session, retention_hours: float) -> int:
+    """
+    Remove os eventos mais antigos que a retenção.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy.
+        retention_hours (float): Horas de retenção dos eventos.
+
+    Returns:
+        int: A quantidade de eventos removidos.
+    """
+    limit = datetime.now(timezone.utc) - timedelta(hours=retention_hours)
+    result = db.execute(
+        delete(ProductChangeModel).where(ProductChangeModel.created_at < limit)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def format_event(change: Row) -> bytes:
+    """
+    Formata um evento no formato de Server-Sent Events.
+
+    O nome do evento é a operação e o `id` é o ID do evento, enviado de volta pelo cliente
+    em `Last-Event-ID` ao reconectar. O produto é incluído sem ser decodificado, a partir do
+    JSON gravado no outbox.
+
+    Args:
+        change (Row): A linha do evento de alteração.
+
+    Returns:
+        bytes: O evento codificado.
+    """
+    data = orjson.dumps(
+        {
+            "id": change.id,
+            "operation": change.operation,
+            "product_id": change.product_id,
+            "version": change.version,
+            "product": orjson.Fragment(change.data),
+        }
+    )
+    return b"id: %d\nevent: %s\ndata: %s\n\n" % (
+        change.id,
+        change.operation.encode(),
+        data,
+    )
+
+
+def _read(operation: Callable[..., T], *args) -> T:
+    with SessionLocal() as db:
+        return operation(db, *args)
+
+
+async def change_events(
+    request: Request, after_id: Optional[int], poll_interval: float
+) -> AsyncIterator[bytes]:
+    """
+    Gera os eventos do feed enquanto o cliente estiver conectado.
+
+    Sem `after_id`, o feed começa pelas alterações feitas a partir da conexão. Se eventos
+    posteriores a `after_id` já tiverem sido removidos pela retenção, um evento "reset" avisa
+    o cliente de que deve reler a listagem antes de continuar.
+
+    IDs ausentes na sequência são aguardados por até `GAP_TIMEOUT` segundos antes de serem
+    pulados: uma transação iniciada antes pode confirmar um evento de ID menor depois de
+    outra já ter confirmado um de ID maior.
+
+    Args:
+        request (Request): A requisição, usada para detectar a desconexão do cliente.
+        after_id (Optional[int]): O ID do último evento recebido pelo cliente.
+        poll_interval (float): Segundos de espera entre as consultas ao outbox.
+
+    Yields:
+        bytes: Os eventos codificados, e comentários periódicos para manter a conexão.
+    """
+    yield b"retry: %d\n\n" % int(poll_interval * 1000 * 3)
+    if after_id is None:
+        after_id = await run_in_threadpool(_read, last_change_id)
+    else:
+        first_id = await run_in_threadpool(_read, first_change_id)
+        if first_id is not None and first_id > after_id + 1:
+            after_id = first_id - 1
+            yield b'id: %d\nevent: reset\ndata: {"after": %d}\n\n' % (
+                after_id,
+                after_id,
+            )
+
+    loop = asyncio.get_running_loop()
+    gap_since: Optional[float] = None
+    last_sent = loop.time()
+    while not await request.is_disconnected():
+        changes = await run_in_threadpool(_read, read_changes, after_id, BATCH_SIZE)
+        sent = 0
+        for change in changes:
+            if change.id != after_id + 1:
+                if gap_since is None:
+                    gap_since = loop.time()
+                if loop.time() - gap_since < GAP_TIMEOUT:
+                    break
+            yield format_event(change)
+            after_id, gap_since, sent = change.id, None, sent + 1
+        if sent:
+            last_sent = loop.time()
+        elif loop.time() - last_sent >= KEEPALIVE:
+            yield b": keepalive\n\n"
+            last_sent = loop.time()
+        if sent < BATCH_SIZE:
+            await asyncio.sleep(poll_interval)
+
+
+async def invalidate_caches(poll_interval: float) -> None:
+    """
+    Descarta do cache em memória os produtos alterados por outros processos.
+
+    O cache em memória é invalidado diretamente apenas pelas escritas do próprio processo.
+    As feitas por outros processos do servidor ou pelo worker (como o reajuste de preços) são
+    percebidas lendo o feed de alterações a cada `poll_interval` segundos, de modo que uma
+    entrada fica desatualizada por esse intervalo, e não pelo `CACHE_TTL` inteiro. Executa até
+    ser cancelada; falhas do banco são registradas e a leitura é repetida.
+
+    IDs ausentes na sequência são tratados como em `change_events`: a leitura volta a
+    incluí-los por até `GAP_TIMEOUT` segundos, pois a transação pode ainda confirmá-los.
+
+    Args:
+        poll_interval (float): Segundos de espera entre as consultas ao outbox.
+    """
+    loop = asyncio.get_running_loop()
+    after_id: Optional[int] = None
+    gap_since: Optional[float] = None
+    while True:
+        try:
+            if after_id is None:
+                after_id = await run_in_threadpool(_read, last_change_id)
+            changes = await run_in_threadpool(_read, read_changes, after_id, BATCH_SIZE)
+        except SQLAlchemyError as exc:
+            logger.warning("Falha ao ler o feed de alterações: %s", exc)
+            changes = []
+        if changes:
+            await call_cache(
+                product_cache.delete, *{change.product_id for change in changes}
+            )
+            await call_cache(stats_cache.clear)
+            for change in changes:
+                if change.id != after_id + 1:
+                    if gap_since is None:
+                        gap_since = loop.time()
+                    if loop.time() - gap_since < GAP_TIMEOUT:
+                        break
+                after_id, gap_since = change.id, None
+        if len(changes) < BATCH_SIZE:
+            await asyncio.sleep(poll_interval)
+
+
+router = APIRouter()
+
+
+@router.get("/products/changes")
+def read_product_changes(
+    request: Request,
+    after: Optional[int] = Query(
+        None, ge=0, description="ID do último evento recebido"
+    ),
+    last_event_id: Optional[int] = Header(None, ge=0),
+) -> StreamingResponse:
+    """
+    Rota que publica o feed de alterações de produtos como Server-Sent Events.
+
+    Cada evento tem como nome a operação ("create", "update" ou "delete") e como dados o ID
+    do evento, o ID e a versão do produto e o produto após a alteração (ou o produto
+    removido). A conexão é mantida aberta e os novos eventos são enviados à medida que são
+    gravados.
+
+    Args:
+        request (Request): A requisição, usada para detectar a desconexão do cliente.
+        after (Optional[int]): O ID do último evento recebido; sem ele, o feed começa pelas
+            alterações feitas a partir da conexão.
+        last_event_id (Optional[int]): O cabeçalho `Last-Event-ID`, enviado pelo cliente ao
+            reconectar; tem precedência sobre `after`.
+
+    Returns:
+        StreamingResponse: O fluxo `text/event-stream` de eventos.
+    """
+    after_id = last_event_id if last_event_id is not None else after
+    return StreamingResponse(
+        change_events(request, after_id, CHANGES_POLL_INTERVAL),
+        media_type="text/event-stream",
+        # desativa o buffer de proxies como o nginx, que atrasaria a entrega dos eventos
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,187 @@
+"""
+Módulo de compressão das respostas HTTP.
+
+O middleware negocia a codificação pelo cabeçalho `Accept-Encoding` entre as configuradas em
+`COMPRESSION_ENCODINGS` (zstd, br e gzip) e comprime as respostas de texto e JSON a partir de
+`COMPRESSION_MIN_SIZE` bytes. Respostas em streaming, como a exportação do catálogo, são
+comprimidas bloco a bloco, sem serem acumuladas em memória; o feed de Server-Sent Events
+não é comprimido, para que cada evento seja entregue assim que enviado.
+
+Os pacotes `brotli` (ou `brotlicffi`) e `zstandard` são opcionais: sem eles, as codificações
+correspondentes são ignoradas. Os níveis de compressão são moderados, pois a compressão roda
+no event loop e o ganho dos níveis mais altos em JSON é pequeno diante do custo de CPU.
+
+Methods:
+    negotiate(accept_encoding, encodings): Escolhe a codificação da resposta.
+    CompressionMiddleware: Middleware ASGI que comprime as respostas.
+"""
+
+import zlib
+from typing import List, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+# codificações cujas bibliotecas estão instaladas
+AVAILABLE = (
+    {"gzip"} | ({"br"} if brotli else set()) | ({"zstd"} if zstandard else set())
+)
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+}
+
+
+class _Compressor:
+    """
+    Interface comum aos compressores incrementais de cada codificação.
+
+    Parameters:
+        encoding (str): A codificação: "gzip", "br" ou "zstd".
+    """
+
+    def __init__(self, encoding: str):
+        if encoding == "gzip":
+            # wbits 31: formato gzip (cabeçalho e CRC), e não zlib puro
+            compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+            self.compress, self.finish = compressor.compress, compressor.flush
+        elif encoding == "br":
+            compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self.compress, self.finish = compressor.process, compressor.finish
+        else:
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+            self.compress, self.finish = compressor.compress, compressor.flush
+
+
+def negotiate(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """
+    Escolhe a codificação da resposta.
+
+    Args:
+        accept_encoding (str): O cabeçalho `Accept-Encoding` da requisição, com pesos `q`
+            opcionais, como "gzip, br;q=0.9".
+        encodings (Sequence[str]): As codificações oferecidas, em ordem de preferência.
+
+    Returns:
+        Optional[str]: A codificação aceita com o maior peso (nos empates, a preferida do
+            servidor), ou None se nenhuma for aceita.
+    """
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                continue
+        weights[name.strip()] = weight
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def _compressible(headers: MutableHeaders) -> bool:
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    if "content-encoding" in headers or content_type == "text/event-stream":
+        return False
+    return content_type.startswith("text/") or content_type in COMPRESSIBLE_TYPES
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime as respostas com a codificação negociada.
+
+    Parameters:
+        app: A aplicação ASGI envolvida.
+        encodings (Sequence[str]): As codificações oferecidas, em ordem de preferência; as
+            que não têm a biblioteca instalada são ignoradas.
+        minimum_size (int): O tamanho mínimo, em bytes, das respostas comprimidas.
+    """
+
+    def __init__(self, app, encodings: Sequence[str], minimum_size: int):
+        self.app = app
+        self.encodings: List[str] = [
+            encoding for encoding in encodings if encoding in AVAILABLE
+        ]
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(raw=start["headers"])
+                compressible = _compressible(headers)
+                if compressible:
+                    headers.add_vary_header("Accept-Encoding")
+                if not compressible or (
+                    not more_body and len(body) < self.minimum_size
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                del headers["Content-Length"]
+                body = compressor.compress(body)
+                if not more_body:
+                    body += compressor.finish()
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+            else:
+                body = compressor.compress(body)
+                if not more_body:
+                    body += compressor.finish()
+            if body or not more_body:
+                await send(
+                    {"type": "http.response.body", "body": body, "more_body": more_body}
+                )
+
+        await self.app(scope, receive, send_wrapper)
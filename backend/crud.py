@@ -2,11 +2,34 @@
 Este módulo fornece operações CRUD (Create, Read, Update, Delete) para a entidade de produto.
 
 Utiliza SQLAlchemy para interagir com o banco de dados e manipular objetos `ProductModel`.
+As escritas gravam, na mesma transação, os eventos do feed de alterações de produtos
+(módulo `changes`).
 
 Methods:
     get_product(db, product_id): Retorna um produto específico com base no ID fornecido.
 
-    get_products(db): Retorna todos os produtos presentes no banco de dados.
+    get_products(db, limit, after_id, categoria, price_min, price_max, email_fornecedor, as_rows, sort,
+        after_value, columns): Retorna uma página de produtos na ordem de `sort`, aplicando os filtros informados.
+
+    get_products_by_ids(db, product_ids): Retorna os produtos dos IDs informados, em uma única consulta.
+
+    products_by_ids_query(product_ids, dialect): Monta a consulta de produtos por IDs, compartilhada
+        pelas versões síncrona e assíncrona.
+
+    products_page_query(limit, after_id, categoria, price_min, price_max, email_fornecedor, as_rows, sort,
+        after_value, dialect, columns): Monta a consulta de uma página de produtos, compartilhada pelas versões síncrona e assíncrona.
+
+    search_products(db, q, limit, offset): Busca produtos por nome e descrição, ordenados por relevância.
+
+    products_search_query(q, dialect, limit, offset): Monta a consulta da busca textual, compartilhada
+        pelas versões síncrona e assíncrona.
+
+    get_product_stats(db, bucket, fornecedores): Calcula as estatísticas agregadas do catálogo de produtos.
+
+    product_stats_queries(dialect, bucket, fornecedores): Monta as consultas de agregação das estatísticas,
+        compartilhadas pelas versões síncrona e assíncrona.
+
+    iter_products(db, batch_size): Percorre todos os produtos em lotes a partir de um cursor no servidor.
 
     create_product(db, product): Cria um novo produto e o adiciona ao banco de dados.
 
@@ -14,12 +37,67 @@ Methods:
 
     update_product(db, product_id, product): Atualiza um produto existente com base no ID fornecido.
 
+    product_update_query(product_id, product): Monta a consulta de atualização de um produto, compartilhada
+        pelas versões síncrona e assíncrona.
+
+    create_products(db, products): Cria vários produtos em uma única transação.
+
+    update_products(db, products): Atualiza vários produtos existentes em uma única transação.
+
+    bulk_update_values(products, versions): Monta os parâmetros da atualização em lote, compartilhada
+        pelas versões síncrona e assíncrona.
+
+    delete_products(db, product_ids): Deleta vários produtos em uma única transação.
+
 """
 
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from sqlalchemy import (
+    Integer,
+    Row,
+    RowMapping,
+    Select,
+    Update,
+    any_,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session
-from schemas import ProductUpdate, ProductCreate
+from sqlalchemy.orm.exc import StaleDataError
+from schemas import ProductBulkUpdate, ProductUpdate, ProductCreate
+from cache import product_cache
+from changes import record_changes
 from models import ProductModel
 
+# campos aceitos na ordenação da listagem; cada um tem um índice (campo, id) para o keyset
+SORT_FIELDS = ("id", "name", "price", "created_at")
+
+# dicionário do PostgreSQL usado na coluna `search_vector` (migração 0003)
+SEARCH_CONFIG = "portuguese"
+
+# início de cada intervalo do histograma nos bancos sem `date_trunc`, como o SQLite
+_BUCKET_FORMATS = {
+    "hour": "%Y-%m-%d %H:00:00",
+    "day": "%Y-%m-%d 00:00:00",
+    "month": "%Y-%m-01 00:00:00",
+}
+
+
+class VersionConflictError(Exception):
+    """
+    Exceção lançada quando a versão informada do produto não é a versão atual.
+    """
+
 
 def get_product(db: Session, product_id: int) -> ProductModel:
     """
@@ -37,71 +115,399 @@ def get_product(db: Session, product_id: int) -> ProductModel:
     return db.query(ProductModel).filter(ProductModel.id == product_id).first()
 
 
-def get_products(db: Session) -> ProductModel:
+def get_products(
+    db: Session,
+    limit: int = 50,
+    after_id: Optional[int] = None,
+    categoria: Optional[str] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+    email_fornecedor: Optional[str] = None,
+    as_rows: bool = False,
+    sort: str = "id",
+    after_value: Any = None,
+    columns: Optional[Sequence[str]] = None,
+) -> Union[List[ProductModel], List[Row]]:
     """
-    Retorna todos os produtos presentes no banco de dados.
+    Retorna uma página de produtos na ordem de `sort`, aplicando os filtros informados.
 
-    Esta função consulta o banco de dados para recuperar todos os produtos armazenados.
+    A paginação é feita por keyset (`WHERE id > after_id ORDER BY id LIMIT n`, ou
+    `WHERE (campo, id) > (after_value, after_id)` nas demais ordenações), de modo que páginas
+    profundas custam o mesmo que a primeira, ao contrário de `OFFSET`.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy utilizada para interagir com o banco de dados.
+        limit (int): Quantidade máxima de produtos retornados.
+        after_id (Optional[int]): O ID do último produto da página anterior.
+        categoria (Optional[str]): Filtra os produtos pela categoria.
+        price_min (Optional[float]): Filtra os produtos com preço maior ou igual a este valor.
+        price_max (Optional[float]): Filtra os produtos com preço menor ou igual a este valor.
+        email_fornecedor (Optional[str]): Filtra os produtos pelo e-mail do fornecedor.
+        as_rows (bool): Retorna linhas com as colunas da tabela em vez de objetos `ProductModel`,
+            evitando o custo de instanciar e rastrear objetos ORM em leituras somente para resposta.
+        sort (str): O campo de ordenação (um de `SORT_FIELDS`), precedido de "-" para ordem decrescente.
+        after_value (Any): O valor do campo de ordenação no último produto da página anterior.
+        columns (Optional[Sequence[str]]): Com `as_rows`, seleciona apenas estas colunas (além
+            das usadas pelo cursor e pela ETag); se None, todas.
+
+    Returns:
+        Union[List[ProductModel], List[Row]]: Os objetos `ProductModel` (ou linhas, com `as_rows`)
+            da página, com no máximo `limit` produtos.
+    """
+    query = products_page_query(
+        limit=limit,
+        after_id=after_id,
+        categoria=categoria,
+        price_min=price_min,
+        price_max=price_max,
+        email_fornecedor=email_fornecedor,
+        as_rows=as_rows,
+        sort=sort,
+        after_value=after_value,
+        dialect=db.get_bind().dialect.name,
+        columns=columns,
+    )
+    return (db.execute(query) if as_rows else db.scalars(query)).all()
+
+
+def products_page_query(
+    limit: int,
+    after_id: Optional[int] = None,
+    categoria: Optional[str] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+    email_fornecedor: Optional[str] = None,
+    as_rows: bool = False,
+    sort: str = "id",
+    after_value: Any = None,
+    dialect: str = "postgresql",
+    columns: Optional[Sequence[str]] = None,
+) -> Select:
+    """
+    Monta a consulta de uma página de produtos, compartilhada pelas versões síncrona e assíncrona.
+
+    Args:
+        limit (int): Quantidade máxima de produtos retornados.
+        after_id (Optional[int]): O ID do último produto da página anterior.
+        categoria (Optional[str]): Filtra os produtos pela categoria.
+        price_min (Optional[float]): Filtra os produtos com preço maior ou igual a este valor.
+        price_max (Optional[float]): Filtra os produtos com preço menor ou igual a este valor.
+        email_fornecedor (Optional[str]): Filtra os produtos pelo e-mail do fornecedor.
+        as_rows (bool): Seleciona as colunas da tabela em vez da entidade `ProductModel`.
+        sort (str): O campo de ordenação (um de `SORT_FIELDS`), precedido de "-" para ordem decrescente.
+        after_value (Any): O valor do campo de ordenação no último produto da página anterior.
+        dialect (str): O nome do dialeto do banco de dados, como "postgresql".
+        columns (Optional[Sequence[str]]): Com `as_rows`, seleciona apenas estas colunas; `id`,
+            `version` e o campo de ordenação são sempre incluídos, pois o cursor e a ETag
+            dependem deles. Se None, todas as colunas.
+
+    Returns:
+        Select: A consulta `SELECT` na ordem de `sort`, com o ID como desempate, limitada a `limit` linhas.
+
+    Raises:
+        ValueError: Se `sort` não for um campo de `SORT_FIELDS`.
+    """
+    descending = sort.startswith("-")
+    field = sort.lstrip("-")
+    if field not in SORT_FIELDS:
+        raise ValueError(f"Ordenação inválida: {sort}")
+    if field == "created_at" and isinstance(after_value, str):
+        # o cursor guarda a data em ISO 8601
+        after_value = datetime.fromisoformat(after_value)
+    column = getattr(ProductModel, field)
+    value = literal(after_value, column.type)
+    if field == "created_at" and dialect != "postgresql":
+        # o SQLite guarda datas como texto, com ou sem microssegundos; `datetime()`
+        # normaliza o formato para que a comparação e a ordenação coincidam
+        column, value = func.datetime(column), func.datetime(value)
+    # o ID desempata valores repetidos e torna a ordem, e portanto o cursor, estável
+    key = ProductModel.id if field == "id" else tuple_(column, ProductModel.id)
+    last = after_id if field == "id" else tuple_(value, literal(after_id))
+
+    if not as_rows:
+        query = select(ProductModel)
+    elif columns is None:
+        query = select(*ProductModel.__table__.columns)
+    else:
+        names = dict.fromkeys([*columns, "id", "version", field])
+        query = select(*(ProductModel.__table__.c[name] for name in names))
+    if after_id is not None:
+        query = query.where(key < last if descending else key > last)
+    if categoria is not None:
+        query = query.where(ProductModel.categoria == categoria)
+    if price_min is not None:
+        query = query.where(ProductModel.price >= price_min)
+    if price_max is not None:
+        query = query.where(ProductModel.price <= price_max)
+    if email_fornecedor is not None:
+        query = query.where(ProductModel.email_fornecedor == email_fornecedor)
+    order = [column] if field == "id" else [column, ProductModel.id]
+    if descending:
+        order = [item.desc() for item in order]
+    return query.order_by(*order).limit(limit)
+
+
+def get_products_by_ids(db: Session, product_ids: Sequence[int]) -> List[Row]:
+    """
+    Retorna os produtos dos IDs informados, em uma única consulta.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy utilizada para interagir com o banco de dados.
+        product_ids (Sequence[int]): Os IDs dos produtos.
+
+    Returns:
+        List[Row]: As linhas dos produtos encontrados, em qualquer ordem.
+    """
+    dialect = db.get_bind().dialect.name
+    return db.execute(products_by_ids_query(product_ids, dialect)).all()
+
+
+def products_by_ids_query(product_ids: Sequence[int], dialect: str) -> Select:
+    """
+    Monta a consulta de produtos por IDs.
+
+    No PostgreSQL, os IDs são enviados como um único parâmetro do tipo array
+    (`id = ANY(:ids)`), de modo que o texto da consulta é o mesmo para qualquer quantidade de
+    IDs; nos demais bancos, é usado `IN`.
+
+    Args:
+        product_ids (Sequence[int]): Os IDs dos produtos.
+        dialect (str): O nome do dialeto do banco de dados, como "postgresql".
+
+    Returns:
+        Select: A consulta das colunas dos produtos.
+    """
+    if dialect == "postgresql":
+        condition = ProductModel.id == any_(literal(list(product_ids), ARRAY(Integer)))
+    else:
+        condition = ProductModel.id.in_(product_ids)
+    return select(*ProductModel.__table__.columns).where(condition)
+
+
+def search_products(
+    db: Session, q: str, limit: int = 50, offset: int = 0
+) -> List[ProductModel]:
+    """
+    Busca produtos por nome e descrição, ordenados por relevância.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy utilizada para interagir com o banco de dados.
+        q (str): O texto buscado.
+        limit (int): Quantidade máxima de produtos retornados.
+        offset (int): Quantidade de resultados a pular, das páginas anteriores.
+
+    Returns:
+        List[ProductModel]: Os produtos encontrados, do mais ao menos relevante.
+    """
+    dialect = db.get_bind().dialect.name
+    return db.scalars(products_search_query(q, dialect, limit, offset)).all()
+
+
+def products_search_query(q: str, dialect: str, limit: int, offset: int = 0) -> Select:
+    """
+    Monta a consulta da busca textual, compartilhada pelas versões síncrona e assíncrona.
+
+    No PostgreSQL, um produto é encontrado quando a coluna gerada `search_vector` (nome e
+    descrição, com stemming em português) casa com `websearch_to_tsquery`, ou quando o nome é
+    similar ao texto segundo o `pg_trgm`, o que tolera erros de digitação. Ambos os
+    predicados usam índices GIN, e a relevância soma `ts_rank_cd` e `similarity`. Nos demais
+    bancos, usado em desenvolvimento, a busca é um `ILIKE` em nome e descrição ordenado por ID.
+
+    Args:
+        q (str): O texto buscado.
+        dialect (str): O nome do dialeto do banco de dados, como "postgresql".
+        limit (int): Quantidade máxima de produtos retornados.
+        offset (int): Quantidade de resultados a pular, das páginas anteriores.
+
+    Returns:
+        Select: A consulta `SELECT` ordenada por relevância e limitada a `limit` linhas.
+    """
+    if dialect != "postgresql":
+        query = select(ProductModel).where(
+            or_(
+                ProductModel.name.icontains(q, autoescape=True),
+                ProductModel.description.icontains(q, autoescape=True),
+            )
+        )
+        return query.order_by(ProductModel.id).offset(offset).limit(limit)
+
+    # a coluna não é mapeada em ProductModel: é gerada pelo banco e só existe no PostgreSQL
+    search_vector = literal_column("products.search_vector")
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(search_vector, tsquery) + func.similarity(
+        ProductModel.name, q
+    )
+    query = select(ProductModel).where(
+        or_(search_vector.op("@@")(tsquery), ProductModel.name.op("%")(q))
+    )
+    return query.order_by(rank.desc(), ProductModel.id).offset(offset).limit(limit)
+
+
+def get_product_stats(db: Session, bucket: str = "day", fornecedores: int = 20) -> dict:
+    """
+    Calcula as estatísticas agregadas do catálogo de produtos.
 
     Args:
         db (Session): A sessão do banco de dados SQLAlchemy utilizada para interagir com o banco de dados.
+        bucket (str): A largura dos intervalos do histograma: "hour", "day", "week" ou "month".
+        fornecedores (int): A quantidade máxima de fornecedores, dos que têm mais produtos.
 
     Returns:
-        List[ProductModel]: Uma lista de objetos `ProductModel` representando todos os produtos no banco de dados.
+        dict: As estatísticas no formato de `ProductStats`.
+    """
+    queries = product_stats_queries(db.get_bind().dialect.name, bucket, fornecedores)
+    stats = {
+        name: db.execute(query).mappings().all() for name, query in queries.items()
+    }
+    return {**stats, "total": stats["total"][0], "bucket": bucket}
+
+
+def product_stats_queries(
+    dialect: str, bucket: str, fornecedores: int
+) -> Dict[str, Select]:
+    """
+    Monta as consultas de agregação das estatísticas, compartilhadas pelas versões síncrona e assíncrona.
+
+    Todo o cálculo é feito no banco de dados: apenas as linhas agregadas são transferidas. Os
+    percentis usam `percentile_cont` e o histograma usa `date_trunc`, ambos do PostgreSQL;
+    nos demais bancos os percentis ficam nulos e o histograma usa `strftime`.
+
+    Args:
+        dialect (str): O nome do dialeto do banco de dados, como "postgresql".
+        bucket (str): A largura dos intervalos do histograma: "hour", "day", "week" ou "month".
+        fornecedores (int): A quantidade máxima de fornecedores, dos que têm mais produtos.
+
+    Returns:
+        Dict[str, Select]: As consultas de `total`, `by_categoria`, `by_fornecedor` e `created_histogram`.
+    """
+    price = ProductModel.price
+    columns = [
+        func.count().label("count"),
+        func.min(price).label("price_min"),
+        func.avg(price).label("price_avg"),
+        func.max(price).label("price_max"),
+    ]
+    if dialect == "postgresql":
+        columns += [
+            func.percentile_cont(fraction).within_group(price).label(label)
+            for fraction, label in (
+                (0.5, "price_p50"),
+                (0.9, "price_p90"),
+                (0.99, "price_p99"),
+            )
+        ]
+
+    if dialect == "postgresql":
+        start = func.date_trunc(bucket, ProductModel.created_at)
+    elif bucket == "week":
+        # segunda-feira da semana: o próximo domingo (ou o próprio) menos seis dias
+        start = func.strftime(
+            _BUCKET_FORMATS["day"],
+            func.date(ProductModel.created_at, "weekday 0", "-6 days"),
+        )
+    else:
+        start = func.strftime(_BUCKET_FORMATS[bucket], ProductModel.created_at)
+    start = start.label("start")
+
+    return {
+        "total": select(*columns),
+        "by_categoria": select(ProductModel.categoria.label("key"), *columns)
+        .group_by(ProductModel.categoria)
+        .order_by(ProductModel.categoria),
+        "by_fornecedor": select(ProductModel.email_fornecedor.label("key"), *columns)
+        .group_by(ProductModel.email_fornecedor)
+        .order_by(func.count().desc(), ProductModel.email_fornecedor)
+        .limit(fornecedores),
+        "created_histogram": select(start, func.count().label("count"))
+        .where(ProductModel.created_at.is_not(None))
+        .group_by(start)
+        .order_by(start),
+    }
+
+
+def iter_products(db: Session, batch_size: int = 1000) -> Iterator[List[RowMapping]]:
+    """
+    Percorre todos os produtos em lotes a partir de um cursor no servidor.
+
+    As colunas são selecionadas diretamente (sem instanciar `ProductModel`) e a consulta usa
+    `yield_per`, que ativa `stream_results`: o driver mantém um cursor no servidor e apenas
+    `batch_size` linhas ficam em memória por vez, independentemente do tamanho da tabela.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy utilizada para interagir com o banco de dados.
+        batch_size (int): Quantidade de linhas buscadas do servidor a cada lote.
+
+    Yields:
+        List[RowMapping]: Lotes de linhas, cada uma acessível como um mapeamento coluna -> valor.
     """
-    return db.query(ProductModel).all()
+    stmt = (
+        select(*ProductModel.__table__.columns)
+        .order_by(ProductModel.id)
+        .execution_options(yield_per=batch_size)
+    )
+    yield from db.execute(stmt).mappings().partitions()
 
 
-def create_product(db: Session, product: ProductCreate) -> ProductModel:
+def create_product(db: Session, product: ProductCreate) -> Row:
     """
     Cria um novo produto e o adiciona ao banco de dados.
 
-    Esta função cria uma instância de `ProductModel` com os dados fornecidos no objeto `ProductCreate`,
-    adiciona essa instância à sessão do banco de dados, realiza o commit para persistir as alterações e
-    retorna o produto criado.
+    O produto é inserido com um único `INSERT ... RETURNING`, que já devolve as colunas
+    geradas pelo banco (ID, datas e versão) sem um `SELECT` adicional.
 
     Args:
         db (Session): A sessão do banco de dados SQLAlchemy utilizada para interagir com o banco de dados.
         product (ProductCreate): O objeto contendo os dados do novo produto a ser criado.
 
     Returns:
-        ProductModel: O objeto `ProductModel` que representa o produto recém-criado e persistido no banco de dados.
+        Row: A linha do produto recém-criado e persistido no banco de dados.
     """
-    db_product = ProductModel(**product.model_dump())
-    db.add(db_product)
+    row = db.execute(
+        insert(ProductModel)
+        .values(**product.model_dump())
+        .returning(*ProductModel.__table__.columns)
+    ).one()
+    record_changes(db, "create", [row])
     db.commit()
-    db.refresh(db_product)
-    return db_product
+    return row
 
 
-def delete_product(db: Session, product_id: int) -> ProductModel:
+def delete_product(db: Session, product_id: int) -> Optional[Row]:
     """
     Deleta um produto do banco de dados com base no ID fornecido.
 
-    Esta função localiza e deleta um produto específico com o ID correspondente no banco de dados.
+    O produto é removido com um único `DELETE ... RETURNING`.
 
     Args:
         db (Session): A sessão do banco de dados SQLAlchemy utilizada para interagir com o banco de dados.
         product_id (int): O ID do produto a ser deletado.
 
     Returns:
-        ProductModel: O objeto `ProductModel` que foi deletado, ou None se o produto não foi encontrado.
+        Optional[Row]: A linha do produto que foi deletado, ou None se o produto não foi encontrado.
     """
-    db_product = db.query(ProductModel).filter(ProductModel.id == product_id).first()
-    db.delete(db_product)
+    row = db.execute(
+        delete(ProductModel)
+        .where(ProductModel.id == product_id)
+        .returning(*ProductModel.__table__.columns)
+    ).first()
+    if row is not None:
+        record_changes(db, "delete", [row])
     db.commit()
-    return db_product
+    if row is not None:
+        product_cache.delete(product_id)
+    return row
 
 
 def update_product(
     db: Session, product_id: int, product: ProductUpdate
-) -> ProductUpdate:
+) -> Optional[Row]:
     """
     Atualiza um produto existente com base no ID fornecido.
 
-    Esta função consulta o banco de dados para encontrar o produto com o ID correspondente e atualiza
-    seus campos conforme especificado no objeto `ProductUpdate`. Após a atualização, o produto modificado
-    é commitado no banco de dados.
+    Apenas os campos informados em `product` são alterados, com um único
+    `UPDATE ... RETURNING` que também confere a versão esperada e a incrementa. A consulta
+    adicional para distinguir produto inexistente de conflito de versão só acontece quando
+    nenhuma linha é alterada.
 
     Args:
         db (Session): A sessão do banco de dados SQLAlchemy utilizada para interagir com o banco de dados.
@@ -109,23 +515,189 @@ def update_product(
         product (ProductUpdate): O objeto contendo os campos a serem atualizados no produto.
 
     Returns:
-        ProductModel: O objeto `ProductModel` que foi atualizado, ou None se o produto não foi encontrado.
-    """
-    db_product = db.query(ProductModel).filter(ProductModel.id == product_id).first()
+        Optional[Row]: A linha do produto atualizado, ou None se o produto não foi encontrado.
 
-    if db_product is None:
+    Raises:
+        VersionConflictError: Se `product.version` não for a versão atual do produto.
+    """
+    query = product_update_query(product_id, product)
+    row = db.execute(query).first()
+    if row is None:
+        db.rollback()
+        if product.version is not None and db.get(ProductModel, product_id):
+            raise VersionConflictError(product_id)
         return None
+    if isinstance(query, Update):
+        record_changes(db, "update", [row])
+    db.commit()
+    product_cache.delete(product_id)
+    return row
 
-    if product.name is not None:
-        db_product.name = product.name
-    if product.description is not None:
-        db_product.description = product.description
-    if product.price is not None:
-        db_product.price = product.price
-    if product.categoria is not None:
-        db_product.categoria = product.categoria
-    if product.email_fornecedor is not None:
-        db_product.email_fornecedor = product.email_fornecedor
 
+def product_update_query(
+    product_id: int, product: ProductUpdate
+) -> Union[Update, Select]:
+    """
+    Monta a consulta de atualização de um produto, compartilhada pelas versões síncrona e assíncrona.
+
+    O `SET` é montado a partir de `product.model_dump(exclude_unset=True)`, ignorando campos
+    nulos, e incrementa `version`; `updated_at` é atualizado pelo `onupdate` da coluna. Sem
+    campos a alterar, retorna apenas um `SELECT` do produto, sem alterar a sua versão.
+
+    Args:
+        product_id (int): O ID do produto a ser atualizado.
+        product (ProductUpdate): O objeto contendo os campos a serem atualizados no produto.
+
+    Returns:
+        Union[Update, Select]: A consulta que retorna a linha do produto atualizado, ou nenhuma
+            linha se o produto não existir ou a versão não for a esperada.
+    """
+    values = product.model_dump(
+        exclude_unset=True, exclude_none=True, exclude={"version"}
+    )
+    if values:
+        query = (
+            update(ProductModel)
+            .values(**values, version=ProductModel.version + 1)
+            .returning(*ProductModel.__table__.columns)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        query = select(*ProductModel.__table__.columns)
+    query = query.where(ProductModel.id == product_id)
+    if product.version is not None:
+        query = query.where(ProductModel.version == product.version)
+    return query
+
+
+def create_products(db: Session, products: List[ProductCreate]) -> List[Row]:
+    """
+    Cria vários produtos em uma única transação.
+
+    Os produtos são inseridos com um único `INSERT ... RETURNING` em modo executemany
+    (agrupado pelo SQLAlchemy em poucos comandos multi-VALUES), em vez de um `add`,
+    `commit` e `refresh` por produto.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy utilizada para interagir com o banco de dados.
+        products (List[ProductCreate]): Os dados dos produtos a serem criados.
+
+    Returns:
+        List[Row]: As linhas dos produtos criados, na mesma ordem de `products`.
+    """
+    if not products:
+        return []
+    rows = db.execute(
+        insert(ProductModel).returning(
+            *ProductModel.__table__.columns, sort_by_parameter_order=True
+        ),
+        [product.model_dump() for product in products],
+    ).all()
+    record_changes(db, "create", rows)
+    db.commit()
+    return rows
+
+
+def update_products(
+    db: Session, products: List[ProductBulkUpdate]
+) -> Tuple[List[Row], Set[int]]:
+    """
+    Atualiza vários produtos existentes em uma única transação.
+
+    Apenas os campos informados (não nulos) em cada item são alterados. Os IDs inexistentes são
+    ignorados; o chamador pode identificá-los comparando com as linhas retornadas. Itens com
+    `version` diferente da versão atual do produto não são aplicados.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy utilizada para interagir com o banco de dados.
+        products (List[ProductBulkUpdate]): Os dados dos produtos a serem atualizados, cada um com seu ID.
+
+    Returns:
+        Tuple[List[Row], Set[int]]: As linhas dos produtos atualizados, ordenadas por ID, e os IDs
+            com conflito de versão.
+
+    Raises:
+        VersionConflictError: Se algum produto for alterado por outra transação durante o lote.
+    """
+    ids = [product.id for product in products]
+    versions = dict(
+        db.execute(
+            select(ProductModel.id, ProductModel.version).where(
+                ProductModel.id.in_(ids)
+            )
+        ).all()
+    )
+    values, conflicts = bulk_update_values(products, versions)
+    try:
+        if values:
+            db.execute(update(ProductModel), values)
+    except StaleDataError as exc:
+        db.rollback()
+        raise VersionConflictError() from exc
+    updated_ids = versions.keys() - conflicts
+    rows = db.execute(
+        select(*ProductModel.__table__.columns)
+        .where(ProductModel.id.in_(updated_ids))
+        .order_by(ProductModel.id)
+    ).all()
+    changed = {value["id"] for value in values}
+    record_changes(db, "update", [row for row in rows if row.id in changed])
+    db.commit()
+    product_cache.delete(*updated_ids)
+    return rows, conflicts
+
+
+def bulk_update_values(
+    products: List[ProductBulkUpdate], versions: Dict[int, int]
+) -> Tuple[List[dict], Set[int]]:
+    """
+    Monta os parâmetros da atualização em lote, compartilhada pelas versões síncrona e assíncrona.
+
+    Cada item leva a versão esperada do produto, que o ORM confere no `WHERE` e incrementa
+    no `SET` (`version_id_col`).
+
+    Args:
+        products (List[ProductBulkUpdate]): Os dados dos produtos a serem atualizados.
+        versions (Dict[int, int]): A versão atual de cada produto existente.
+
+    Returns:
+        Tuple[List[dict], Set[int]]: Os parâmetros de cada `UPDATE` e os IDs com conflito de versão.
+    """
+    values, conflicts = [], set()
+    for product in products:
+        if product.id not in versions:
+            continue
+        if product.version is not None and product.version != versions[product.id]:
+            conflicts.add(product.id)
+            continue
+        value = product.model_dump(exclude_none=True, exclude={"version"})
+        if len(value) > 1:
+            value["version"] = versions[product.id]
+            values.append(value)
+    return values, conflicts
+
+
+def delete_products(db: Session, product_ids: List[int]) -> List[Row]:
+    """
+    Deleta vários produtos em uma única transação.
+
+    Os produtos são removidos com um único `DELETE ... WHERE id IN (...) RETURNING`.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy utilizada para interagir com o banco de dados.
+        product_ids (List[int]): Os IDs dos produtos a serem deletados.
+
+    Returns:
+        List[Row]: As linhas dos produtos deletados. IDs inexistentes não aparecem no resultado.
+    """
+    if not product_ids:
+        return []
+    rows = db.execute(
+        delete(ProductModel)
+        .where(ProductModel.id.in_(product_ids))
+        .returning(*ProductModel.__table__.columns)
+    ).all()
+    record_changes(db, "delete", rows)
     db.commit()
-    return db_product
+    product_cache.delete(*product_ids)
+    return rows
@@ -0,0 +1,357 @@
+"""
+Este módulo fornece as versões assíncronas das operações CRUD para a entidade de produto.
+
+Utiliza `AsyncSession` do SQLAlchemy com o driver asyncpg, de modo que as rotas assíncronas
+não ocupam uma thread do threadpool enquanto aguardam o banco de dados. As consultas são as
+mesmas do módulo `crud`.
+
+Methods:
+    get_product(db, product_id): Retorna um produto específico com base no ID fornecido.
+
+    get_products(db, limit, after_id, categoria, price_min, price_max, email_fornecedor, as_rows, sort,
+        after_value, columns): Retorna uma página de produtos na ordem de `sort`, aplicando os filtros informados.
+
+    get_products_by_ids(db, product_ids): Retorna os produtos dos IDs informados, em uma única consulta.
+
+    search_products(db, q, limit, offset): Busca produtos por nome e descrição, ordenados por relevância.
+
+    get_product_stats(db, bucket, fornecedores): Calcula as estatísticas agregadas do catálogo de produtos.
+
+    create_product(db, product): Cria um novo produto e o adiciona ao banco de dados.
+
+    delete_product(db, product_id): Deleta um produto do banco de dados com base no ID fornecido.
+
+    update_product(db, product_id, product): Atualiza um produto existente com base no ID fornecido.
+
+    create_products(db, products): Cria vários produtos em uma única transação.
+
+    update_products(db, products): Atualiza vários produtos existentes em uma única transação.
+
+    delete_products(db, product_ids): Deleta vários produtos em uma única transação.
+"""
+
+from typing import Any, List, Optional, Sequence, Set, Tuple, Union
+
+from sqlalchemy import Row, Update, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+from cache import call_cache, product_cache
+from changes import change_values
+from crud import (
+    VersionConflictError,
+    bulk_update_values,
+    product_stats_queries,
+    product_update_query,
+    products_by_ids_query,
+    products_page_query,
+    products_search_query,
+)
+from models import ProductChangeModel, ProductModel
+from schemas import ProductBulkUpdate, ProductCreate, ProductUpdate
+
+
+async def _record_changes(db: AsyncSession, operation: str, rows: List[Row]) -> None:
+    # mesma gravação no outbox de `changes.record_changes`, na transação corrente
+    if rows:
+        await db.execute(insert(ProductChangeModel), change_values(operation, rows))
+
+
+async def get_product(db: AsyncSession, product_id: int) -> Optional[ProductModel]:
+    """
+    Retorna um produto específico com base no ID fornecido.
+
+    Args:
+        db (AsyncSession): A sessão assíncrona do banco de dados.
+        product_id (int): O ID do produto a ser recuperado.
+
+    Returns:
+        ProductModel: O objeto `ProductModel` que corresponde ao ID fornecido, ou None se não encontrado.
+    """
+    return await db.get(ProductModel, product_id)
+
+
+async def get_products(
+    db: AsyncSession,
+    limit: int = 50,
+    after_id: Optional[int] = None,
+    categoria: Optional[str] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+    email_fornecedor: Optional[str] = None,
+    as_rows: bool = False,
+    sort: str = "id",
+    after_value: Any = None,
+    columns: Optional[Sequence[str]] = None,
+) -> Union[List[ProductModel], List[Row]]:
+    """
+    Retorna uma página de produtos na ordem de `sort`, aplicando os filtros informados.
+
+    Args:
+        db (AsyncSession): A sessão assíncrona do banco de dados.
+        limit (int): Quantidade máxima de produtos retornados.
+        after_id (Optional[int]): O ID do último produto da página anterior.
+        categoria (Optional[str]): Filtra os produtos pela categoria.
+        price_min (Optional[float]): Filtra os produtos com preço maior ou igual a este valor.
+        price_max (Optional[float]): Filtra os produtos com preço menor ou igual a este valor.
+        email_fornecedor (Optional[str]): Filtra os produtos pelo e-mail do fornecedor.
+        as_rows (bool): Retorna linhas com as colunas da tabela em vez de objetos `ProductModel`,
+            evitando o custo de instanciar e rastrear objetos ORM em leituras somente para resposta.
+        sort (str): O campo de ordenação (um de `SORT_FIELDS`), precedido de "-" para ordem decrescente.
+        after_value (Any): O valor do campo de ordenação no último produto da página anterior.
+        columns (Optional[Sequence[str]]): Com `as_rows`, seleciona apenas estas colunas (além
+            das usadas pelo cursor e pela ETag); se None, todas.
+
+    Returns:
+        Union[List[ProductModel], List[Row]]: Os objetos `ProductModel` (ou linhas, com `as_rows`)
+            da página, com no máximo `limit` produtos.
+    """
+    query = products_page_query(
+        limit=limit,
+        after_id=after_id,
+        categoria=categoria,
+        price_min=price_min,
+        price_max=price_max,
+        email_fornecedor=email_fornecedor,
+        as_rows=as_rows,
+        sort=sort,
+        after_value=after_value,
+        dialect=db.get_bind().dialect.name,
+        columns=columns,
+    )
+    result = await (db.execute(query) if as_rows else db.scalars(query))
+    return result.all()
+
+
+async def get_products_by_ids(
+    db: AsyncSession, product_ids: Sequence[int]
+) -> List[Row]:
+    """
+    Retorna os produtos dos IDs informados, em uma única consulta.
+
+    Args:
+        db (AsyncSession): A sessão assíncrona do banco de dados.
+        product_ids (Sequence[int]): Os IDs dos produtos.
+
+    Returns:
+        List[Row]: As linhas dos produtos encontrados, em qualquer ordem.
+    """
+    dialect = db.get_bind().dialect.name
+    result = await db.execute(products_by_ids_query(product_ids, dialect))
+    return result.all()
+
+
+async def search_products(
+    db: AsyncSession, q: str, limit: int = 50, offset: int = 0
+) -> List[ProductModel]:
+    """
+    Busca produtos por nome e descrição, ordenados por relevância.
+
+    Args:
+        db (AsyncSession): A sessão assíncrona do banco de dados.
+        q (str): O texto buscado.
+        limit (int): Quantidade máxima de produtos retornados.
+        offset (int): Quantidade de resultados a pular, das páginas anteriores.
+
+    Returns:
+        List[ProductModel]: Os produtos encontrados, do mais ao menos relevante.
+    """
+    dialect = db.get_bind().dialect.name
+    result = await db.scalars(products_search_query(q, dialect, limit, offset))
+    return result.all()
+
+
+async def get_product_stats(
+    db: AsyncSession, bucket: str = "day", fornecedores: int = 20
+) -> dict:
+    """
+    Calcula as estatísticas agregadas do catálogo de produtos.
+
+    Args:
+        db (AsyncSession): A sessão assíncrona do banco de dados.
+        bucket (str): A largura dos intervalos do histograma: "hour", "day", "week" ou "month".
+        fornecedores (int): A quantidade máxima de fornecedores, dos que têm mais produtos.
+
+    Returns:
+        dict: As estatísticas no formato de `ProductStats`.
+    """
+    queries = product_stats_queries(db.get_bind().dialect.name, bucket, fornecedores)
+    stats = {}
+    for name, query in queries.items():
+        result = await db.execute(query)
+        stats[name] = result.mappings().all()
+    return {**stats, "total": stats["total"][0], "bucket": bucket}
+
+
+async def create_product(db: AsyncSession, product: ProductCreate) -> Row:
+    """
+    Cria um novo produto e o adiciona ao banco de dados.
+
+    Args:
+        db (AsyncSession): A sessão assíncrona do banco de dados.
+        product (ProductCreate): O objeto contendo os dados do novo produto a ser criado.
+
+    Returns:
+        Row: A linha do produto recém-criado e persistido no banco de dados.
+    """
+    result = await db.execute(
+        insert(ProductModel)
+        .values(**product.model_dump())
+        .returning(*ProductModel.__table__.columns)
+    )
+    row = result.one()
+    await _record_changes(db, "create", [row])
+    await db.commit()
+    return row
+
+
+async def delete_product(db: AsyncSession, product_id: int) -> Optional[Row]:
+    """
+    Deleta um produto do banco de dados com base no ID fornecido.
+
+    Args:
+        db (AsyncSession): A sessão assíncrona do banco de dados.
+        product_id (int): O ID do produto a ser deletado.
+
+    Returns:
+        Optional[Row]: A linha do produto que foi deletado, ou None se o produto não foi encontrado.
+    """
+    result = await db.execute(
+        delete(ProductModel)
+        .where(ProductModel.id == product_id)
+        .returning(*ProductModel.__table__.columns)
+    )
+    row = result.first()
+    if row is not None:
+        await _record_changes(db, "delete", [row])
+    await db.commit()
+    if row is not None:
+        await call_cache(product_cache.delete, product_id)
+    return row
+
+
+async def update_product(
+    db: AsyncSession, product_id: int, product: ProductUpdate
+) -> Optional[Row]:
+    """
+    Atualiza um produto existente com base no ID fornecido.
+
+    Apenas os campos informados em `product` são alterados.
+
+    Args:
+        db (AsyncSession): A sessão assíncrona do banco de dados.
+        product_id (int): O ID do produto a ser atualizado.
+        product (ProductUpdate): O objeto contendo os campos a serem atualizados no produto.
+
+    Returns:
+        Optional[Row]: A linha do produto atualizado, ou None se o produto não foi encontrado.
+
+    Raises:
+        VersionConflictError: Se `product.version` não for a versão atual do produto.
+    """
+    query = product_update_query(product_id, product)
+    result = await db.execute(query)
+    row = result.first()
+    if row is None:
+        await db.rollback()
+        if product.version is not None and await db.get(ProductModel, product_id):
+            raise VersionConflictError(product_id)
+        return None
+    if isinstance(query, Update):
+        await _record_changes(db, "update", [row])
+    await db.commit()
+    await call_cache(product_cache.delete, product_id)
+    return row
+
+
+async def create_products(db: AsyncSession, products: List[ProductCreate]) -> List[Row]:
+    """
+    Cria vários produtos em uma única transação.
+
+    Args:
+        db (AsyncSession): A sessão assíncrona do banco de dados.
+        products (List[ProductCreate]): Os dados dos produtos a serem criados.
+
+    Returns:
+        List[Row]: As linhas dos produtos criados, na mesma ordem de `products`.
+    """
+    if not products:
+        return []
+    result = await db.execute(
+        insert(ProductModel).returning(
+            *ProductModel.__table__.columns, sort_by_parameter_order=True
+        ),
+        [product.model_dump() for product in products],
+    )
+    rows = result.all()
+    await _record_changes(db, "create", rows)
+    await db.commit()
+    return rows
+
+
+async def update_products(
+    db: AsyncSession, products: List[ProductBulkUpdate]
+) -> Tuple[List[Row], Set[int]]:
+    """
+    Atualiza vários produtos existentes em uma única transação.
+
+    Args:
+        db (AsyncSession): A sessão assíncrona do banco de dados.
+        products (List[ProductBulkUpdate]): Os dados dos produtos a serem atualizados, cada um com seu ID.
+
+    Returns:
+        Tuple[List[Row], Set[int]]: As linhas dos produtos atualizados, ordenadas por ID, e os IDs
+            com conflito de versão.
+
+    Raises:
+        VersionConflictError: Se algum produto for alterado por outra transação durante o lote.
+    """
+    ids = [product.id for product in products]
+    result = await db.execute(
+        select(ProductModel.id, ProductModel.version).where(ProductModel.id.in_(ids))
+    )
+    versions = dict(result.all())
+    values, conflicts = bulk_update_values(products, versions)
+    try:
+        if values:
+            await db.execute(update(ProductModel), values)
+    except StaleDataError as exc:
+        await db.rollback()
+        raise VersionConflictError() from exc
+    updated_ids = versions.keys() - conflicts
+    result = await db.execute(
+        select(*ProductModel.__table__.columns)
+        .where(ProductModel.id.in_(updated_ids))
+        .order_by(ProductModel.id)
+    )
+    rows = result.all()
+    changed = {value["id"] for value in values}
+    await _record_changes(db, "update", [row for row in rows if row.id in changed])
+    await db.commit()
+    await call_cache(product_cache.delete, *updated_ids)
+    return rows, conflicts
+
+
+async def delete_products(db: AsyncSession, product_ids: List[int]) -> List[Row]:
+    """
+    Deleta vários produtos em uma única transação.
+
+    Args:
+        db (AsyncSession): A sessão assíncrona do banco de dados.
+        product_ids (List[int]): Os IDs dos produtos a serem deletados.
+
+    Returns:
+        List[Row]: As linhas dos produtos deletados. IDs inexistentes não aparecem no resultado.
+    """
+    if not product_ids:
+        return []
+    result = await db.execute(
+        delete(ProductModel)
+        .where(ProductModel.id.in_(product_ids))
+        .returning(*ProductModel.__table__.columns)
+    )
+    rows = result.all()
+    await _record_changes(db, "delete", rows)
+    await db.commit()
+    await call_cache(product_cache.delete, *product_ids)
+    return rows
@@ -0,0 +1,144 @@
+"""
+Módulo de ETags fracos e requisições condicionais (`If-None-Match`) para produtos.
+
+As ETags são calculadas a partir da versão de cada linha (`id` e `version`), sem
+serializar o corpo da resposta. A projeção de `fields`, quando informada, também entra no
+cálculo, pois cada projeção é uma representação diferente do mesmo recurso. Quando o cliente envia uma ETag ainda válida, a rota
+responde `304 Not Modified` sem corpo, economizando banda e CPU de serialização.
+
+Methods:
+    product_etag(product_id, version, fields): Calcula a ETag de um produto a partir da sua versão.
+    page_etag(products, next_cursor, fields): Calcula a ETag de uma página de produtos.
+    categories_etag(categories): Calcula a ETag da lista de categorias.
+    etag_matches(if_none_match, etag): Verifica se o cabeçalho `If-None-Match` contém a ETag atual.
+    not_modified(etag): Monta a resposta `304 Not Modified` para a ETag informada.
+"""
+
+import hashlib
+from typing import Any, Iterable, List, Optional
+
+from fastapi import Response
+
+
+def _weak_etag(*parts: Any) -> str:
+    """
+    Gera uma ETag fraca a partir do hash das partes informadas.
+
+    Args:
+        *parts (Any): Os valores que identificam a versão do recurso.
+
+    Returns:
+        str: A ETag no formato `W/"<hash>"`.
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\x1f")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _projection(fields: Optional[List[str]]) -> tuple:
+    """
+    Retorna as partes da ETag que identificam a projeção de `fields`.
+
+    Args:
+        fields (Optional[List[str]]): Os campos da resposta, como em `parse_fields`, ou None
+            para todos os campos.
+
+    Returns:
+        tuple: Vazia para a representação completa, que mantém a ETag de antes.
+    """
+    return () if fields is None else ("fields=" + ",".join(fields),)
+
+
+def product_etag(
+    product_id: int, version: int, fields: Optional[List[str]] = None
+) -> str:
+    """
+    Calcula a ETag de um produto a partir da sua versão.
+
+    Args:
+        product_id (int): O ID do produto.
+        version (int): A versão atual do produto.
+        fields (Optional[List[str]]): Os campos da resposta, ou None para todos os campos.
+
+    Returns:
+        str: A ETag fraca do produto.
+    """
+    return _weak_etag(product_id, version, *_projection(fields))
+
+
+def page_etag(
+    products: Iterable[Any],
+    next_cursor: Optional[str],
+    fields: Optional[List[str]] = None,
+) -> str:
+    """
+    Calcula a ETag de uma página de produtos.
+
+    A ETag muda quando algum produto da página é criado, alterado ou removido, ou quando
+    a existência de uma próxima página muda, e difere entre projeções de `fields`.
+
+    Args:
+        products (Iterable[Any]): Os produtos da página, com os atributos `id` e `version`.
+        next_cursor (Optional[str]): O cursor da próxima página.
+        fields (Optional[List[str]]): Os campos da resposta, ou None para todos os campos.
+
+    Returns:
+        str: A ETag fraca da página.
+    """
+    return _weak_etag(
+        *_projection(fields),
+        next_cursor,
+        *(f"{product.id}:{product.version}" for product in products),
+    )
+
+
+def categories_etag(categories: Iterable[str]) -> str:
+    """
+    Calcula a ETag da lista de categorias.
+
+    Args:
+        categories (Iterable[str]): Os valores das categorias, na ordem da resposta.
+
+    Returns:
+        str: A ETag fraca da lista.
+    """
+    return _weak_etag("categories", *categories)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Verifica se o cabeçalho `If-None-Match` contém a ETag atual.
+
+    A comparação é fraca, como definido para `If-None-Match`: o prefixo `W/` é ignorado.
+
+    Args:
+        if_none_match (Optional[str]): O valor do cabeçalho `If-None-Match` da requisição.
+        etag (str): A ETag atual do recurso.
+
+    Returns:
+        bool: Verdadeiro se o recurso não mudou desde a versão que o cliente possui.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == current
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Monta a resposta `304 Not Modified` para a ETag informada.
+
+    Args:
+        etag (str): A ETag atual do recurso.
+
+    Returns:
+        Response: A resposta sem corpo com o cabeçalho `ETag`.
+    """
+    return Response(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,81 @@
+"""
+Módulo de exportação do catálogo de produtos em streaming.
+
+Gera o conteúdo da exportação em NDJSON ou CSV lote a lote, a partir de um cursor no
+servidor, para ser enviado por um `StreamingResponse` com uso de memória constante.
+
+Methods:
+    stream_products(export_format, batch_size): Gera a exportação de todos os produtos no formato informado.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Iterator
+
+from crud import iter_products
+from database import SessionLocal
+from models import ProductModel
+
+EXPORT_COLUMNS = [column.name for column in ProductModel.__table__.columns]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value: Any) -> str:
+    """
+    Converte valores não suportados nativamente pelo `json` (como datetime) para texto.
+
+    Args:
+        value (Any): O valor a ser convertido.
+
+    Returns:
+        str: O valor em formato ISO 8601.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+def stream_products(export_format: str, batch_size: int = 1000) -> Iterator[str]:
+    """
+    Gera a exportação de todos os produtos no formato informado.
+
+    A sessão é aberta dentro do gerador, e não recebida por `Depends(get_db)`, porque o
+    FastAPI encerra as dependências antes de o corpo do `StreamingResponse` ser enviado.
+
+    Args:
+        export_format (str): O formato da exportação, "ndjson" ou "csv".
+        batch_size (int): Quantidade de linhas lidas do banco e enviadas a cada bloco.
+
+    Yields:
+        str: Blocos de texto da exportação, um por lote de linhas.
+    """
+    db = SessionLocal()
+    try:
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            for rows in iter_products(db, batch_size=batch_size):
+                writer.writerows(
+                    [row[column] for column in EXPORT_COLUMNS] for row in rows
+                )
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            for rows in iter_products(db, batch_size=batch_size):
+                yield "".join(
+                    json.dumps(dict(row), default=_json_default, ensure_ascii=False)
+                    + "\n"
+                    for row in rows
+                )
+    finally:
+        db.close()
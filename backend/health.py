@@ -0,0 +1,85 @@
+"""
+Módulo das sondas de saúde do backend.
+
+`GET /health/live` indica apenas que o processo responde, e é usado para reiniciar processos
+travados. `GET /health/ready` indica que o processo pode receber tráfego: o banco de dados
+responde e o esquema está na última migração do Alembic. Enquanto as migrações não forem
+aplicadas, a sonda de prontidão responde 503.
+
+Methods:
+    head_revision: Retorna a última revisão das migrações do Alembic.
+    read_liveness: Rota da sonda de vida.
+    read_readiness: Rota da sonda de prontidão.
+"""
+
+import os
+from functools import lru_cache
+from typing import Optional
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from database import get_db
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+
+@lru_cache(maxsize=None)
+def head_revision() -> Optional[str]:
+    """
+    Retorna a última revisão das migrações do Alembic, lida uma única vez por processo.
+
+    Returns:
+        Optional[str]: O identificador da revisão, como "0006".
+    """
+    config = Config(ALEMBIC_INI)
+    config.set_main_option(
+        "script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations")
+    )
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+router = APIRouter()
+
+
+@router.get("/health/live", include_in_schema=False)
+def read_liveness() -> dict:
+    """
+    Rota da sonda de vida.
+
+    Returns:
+        dict: {"status": "ok"}.
+    """
+    return {"status": "ok"}
+
+
+@router.get("/health/ready", include_in_schema=False)
+def read_readiness(db: Session = Depends(get_db)) -> JSONResponse:
+    """
+    Rota da sonda de prontidão.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy.
+
+    Returns:
+        JSONResponse: 200 com a revisão do esquema quando o backend está pronto, ou 503 com o
+            motivo quando o banco não responde ou as migrações não foram aplicadas.
+    """
+    try:
+        revision = db.scalar(text("SELECT version_num FROM alembic_version"))
+    except SQLAlchemyError as exc:
+        return JSONResponse(
+            {"status": "unavailable", "detail": type(exc).__name__}, status_code=503
+        )
+    if revision != head_revision():
+        detail = f"Schema at revision {revision}, expected {head_revision()}"
+        return JSONResponse(
+            {"status": "unavailable", "detail": detail},
+            status_code=503,
+        )
+    return JSONResponse({"status": "ok", "revision": revision})
@@ -0,0 +1,442 @@
+"""
+Módulo da fila de tarefas em segundo plano.
+
+Operações longas sobre o catálogo (alteração de preços em massa, exportação para arquivo e
+reconstrução dos índices) não rodam na requisição: `POST /jobs` grava a tarefa na tabela
+`jobs` e um processo do worker (`python -m worker`) a reserva com
+`SELECT ... FOR UPDATE SKIP LOCKED`, de modo que vários processos consomem a fila sem
+disputar a mesma tarefa. O progresso é gravado na própria tarefa e consultado por
+`GET /jobs/{job_id}`.
+
+Tarefas interrompidas (o worker parou sem concluí-las) são marcadas como "failed" e não são
+reexecutadas, pois as alterações feitas até a interrupção já foram confirmadas.
+
+Methods:
+    enqueue_job(db, kind, params): Grava uma nova tarefa na fila.
+    claim_job(db): Reserva a próxima tarefa pendente para o processo atual.
+    report_progress(db, job_id, processed, total): Registra o progresso de uma tarefa em execução.
+    finish_job(db, job_id, status, result, error): Registra o fim de uma tarefa.
+    fail_stale_jobs(db, stale_after): Marca como falhas as tarefas sem sinal de vida recente.
+    run_job(job): Executa uma tarefa reservada, registrando o resultado ou o erro.
+    change_prices(db, job_id, params): Aplica um reajuste percentual aos preços dos produtos.
+    export_catalog(db, job_id, params): Exporta o catálogo de produtos para um arquivo.
+    reindex_products(db, job_id, params): Reconstrói os índices da tabela de produtos.
+    create_job: Rota que enfileira uma tarefa.
+    read_job: Rota que retorna a situação de uma tarefa.
+    read_job_result: Rota que retorna o arquivo gerado por uma tarefa de exportação.
+"""
+
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import FileResponse
+from pydantic import BaseModel
+from sqlalchemy import Numeric, case, cast, func, select, text, update
+from sqlalchemy.orm import Session
+
+from cache import product_cache, stats_cache
+from changes import record_changes
+from config import JOBS_EXPORT_DIR, JOBS_STALE_AFTER
+from database import SessionLocal, get_db
+from export import MEDIA_TYPES, stream_products
+from models import JobModel, ProductModel
+from schemas import (
+    MIN_PRICE,
+    ExportParams,
+    JobCreate,
+    JobResponse,
+    PriceChangeParams,
+    ReindexParams,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_job(db: Session, kind: str, params: BaseModel) -> JobModel:
+    """
+    Grava uma nova tarefa na fila.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy.
+        kind (str): O tipo da tarefa, uma das chaves de `JOB_HANDLERS`.
+        params (BaseModel): Os parâmetros já validados da tarefa.
+
+    Returns:
+        JobModel: A tarefa criada, com a situação "queued".
+    """
+    job = JobModel(kind=kind, params=params.model_dump(mode="json"))
+    db.add(job)
+    db.commit()
+    return job
+
+
+def claim_job(db: Session) -> Optional[JobModel]:
+    """
+    Reserva a próxima tarefa pendente para o processo atual.
+
+    A tarefa é escolhida e marcada como "running" em um único `UPDATE ... RETURNING`, cuja
+    subconsulta usa `FOR UPDATE SKIP LOCKED`: tarefas já bloqueadas por outro worker são
+    ignoradas em vez de aguardadas. No SQLite, que serializa as escritas, a cláusula é omitida.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy.
+
+    Returns:
+        Optional[JobModel]: A tarefa reservada, desanexada da sessão, ou None se a fila
+            estiver vazia.
+    """
+    next_job = (
+        select(JobModel.id)
+        .where(JobModel.status == "queued")
+        .order_by(JobModel.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(JobModel)
+        .where(JobModel.id == next_job)
+        .values(status="running", started_at=func.now(), heartbeat_at=func.now())
+        .returning(JobModel)
+        .execution_options(synchronize_session=False)
+    )
+    job = db.scalars(stmt).first()
+    if job is not None:
+        # desanexada antes do commit, a tarefa mantém os atributos carregados e pode ser
+        # usada sem reabrir uma transação nesta sessão
+        db.expunge(job)
+    db.commit()
+    return job
+
+
+def report_progress(
+    db: Session, job_id: int, processed: int, total: Optional[int] = None
+) -> None:
+    """
+    Registra o progresso de uma tarefa em execução.
+
+    A alteração entra na transação corrente, de modo que o progresso é confirmado junto com
+    o lote de trabalho a que se refere.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy.
+        job_id (int): O ID da tarefa.
+        processed (int): A quantidade de itens já processados.
+        total (Optional[int]): A quantidade total de itens; se None, mantém o valor atual.
+    """
+    values: Dict[str, Any] = {"processed": processed}
+    if total is not None:
+        values["total"] = total
+    db.execute(update(JobModel).where(JobModel.id == job_id).values(**values))
+
+
+def finish_job(
+    db: Session,
+    job_id: int,
+    status: str,
+    result: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None,
+) -> None:
+    """
+    Registra o fim de uma tarefa.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy.
+        job_id (int): O ID da tarefa.
+        status (str): A situação final: "done" ou "failed".
+        result (Optional[Dict[str, Any]]): O resultado da tarefa concluída.
+        error (Optional[str]): A mensagem de erro da tarefa que falhou.
+    """
+    db.execute(
+        update(JobModel)
+        .where(JobModel.id == job_id)
+        .values(status=status, result=result, error=error, finished_at=func.now())
+    )
+    db.commit()
+
+
+def fail_stale_jobs(db: Session, stale_after: float) -> int:
+    """
+    Marca como falhas as tarefas em execução sem sinal de vida recente.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy.
+        stale_after (float): Segundos sem sinal de vida após os quais a tarefa é considerada
+            interrompida.
+
+    Returns:
+        int: A quantidade de tarefas marcadas como falhas.
+    """
+    limit = datetime.now(timezone.utc) - timedelta(seconds=stale_after)
+    result = db.execute(
+        update(JobModel)
+        .where(JobModel.status == "running", JobModel.heartbeat_at < limit)
+        .values(
+            status="failed",
+            error="Interrompida: o worker parou sem concluir a tarefa",
+            finished_at=func.now(),
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def change_prices(
+    db: Session, job_id: int, params: PriceChangeParams
+) -> Dict[str, Any]:
+    """
+    Aplica um reajuste percentual aos preços dos produtos, em lotes.
+
+    Os produtos são percorridos por keyset (`WHERE id > :ultimo ORDER BY id`) e cada lote é
+    alterado e confirmado em sua própria transação, junto com o progresso, sem manter um
+    bloqueio sobre a tabela inteira. Cada produto alterado tem a versão incrementada e um
+    evento de alteração gravado no feed de `GET /products/changes`. Um preço reduzido abaixo
+    de `MIN_PRICE` pelo arredondamento fica em `MIN_PRICE`, pois `ProductResponse` exige
+    preços positivos.
+
+    A tarefa roda no processo do worker: as remoções do cache ao final de cada lote só
+    alcançam o servidor com um cache compartilhado (`CACHE_BACKEND=redis`). Com o cache em
+    memória, cada processo do servidor descarta as entradas alteradas ao ler os eventos do
+    feed (`changes.invalidate_caches`).
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy.
+        job_id (int): O ID da tarefa.
+        params (PriceChangeParams): O percentual e os filtros dos produtos.
+
+    Returns:
+        Dict[str, Any]: A quantidade de produtos alterados.
+    """
+    filters = []
+    if params.categoria is not None:
+        filters.append(ProductModel.categoria == params.categoria.value)
+    if params.email_fornecedor is not None:
+        filters.append(ProductModel.email_fornecedor == params.email_fornecedor)
+    total = db.scalar(select(func.count()).select_from(ProductModel).where(*filters))
+    report_progress(db, job_id, 0, total)
+    db.commit()
+
+    factor = 1 + params.percent / 100
+    # round(double precision, int) não existe no PostgreSQL, apenas em numeric
+    new_price = func.round(cast(ProductModel.price * factor, Numeric), 2)
+    processed, last_id = 0, 0
+    while True:
+        ids = db.scalars(
+            select(ProductModel.id)
+            .where(ProductModel.id > last_id, *filters)
+            .order_by(ProductModel.id)
+            .limit(params.batch_size)
+        ).all()
+        if not ids:
+            break
+        rows = db.execute(
+            update(ProductModel)
+            .where(ProductModel.id.in_(ids))
+            .values(
+                # CASE em vez de greatest(), que o SQLite não possui
+                price=case((new_price < MIN_PRICE, MIN_PRICE), else_=new_price),
+                version=ProductModel.version + 1,
+                updated_at=func.now(),
+            )
+            .returning(*ProductModel.__table__.columns)
+            .execution_options(synchronize_session=False)
+        ).all()
+        record_changes(db, "update", rows)
+        processed += len(ids)
+        last_id = ids[-1]
+        report_progress(db, job_id, processed)
+        db.commit()
+        product_cache.delete(*ids)
+    stats_cache.clear()
+    return {"updated": processed}
+
+
+def export_catalog(db: Session, job_id: int, params: ExportParams) -> Dict[str, Any]:
+    """
+    Exporta o catálogo de produtos para um arquivo em `JOBS_EXPORT_DIR`.
+
+    O conteúdo é o mesmo de `GET /products/export`, gravado em um arquivo temporário e
+    renomeado ao final, de modo que um arquivo incompleto nunca é servido.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy, usada para o progresso.
+        job_id (int): O ID da tarefa.
+        params (ExportParams): O formato e o tamanho dos lotes.
+
+    Returns:
+        Dict[str, Any]: O caminho e o formato do arquivo gerado.
+    """
+    total = db.scalar(select(func.count()).select_from(ProductModel))
+    report_progress(db, job_id, 0, total)
+    db.commit()
+
+    os.makedirs(JOBS_EXPORT_DIR, exist_ok=True)
+    path = os.path.join(JOBS_EXPORT_DIR, f"job-{job_id}.{params.format}")
+    processed = 0
+    with open(f"{path}.tmp", "w", encoding="utf-8", newline="") as file:
+        for chunk in stream_products(params.format, params.batch_size):
+            file.write(chunk)
+            processed = min(processed + params.batch_size, total)
+            report_progress(db, job_id, processed)
+            db.commit()
+    os.replace(f"{path}.tmp", path)
+    return {"path": path, "format": params.format}
+
+
+def reindex_products(db: Session, job_id: int, params: ReindexParams) -> Dict[str, Any]:
+    """
+    Reconstrói os índices da tabela de produtos e atualiza as estatísticas do planejador.
+
+    No PostgreSQL usa `REINDEX TABLE CONCURRENTLY`, que não bloqueia escritas e não pode
+    rodar dentro de uma transação; nos demais bancos usa `REINDEX` simples.
+
+    Args:
+        db (Session): A sessão do banco de dados SQLAlchemy, usada para o progresso.
+        job_id (int): O ID da tarefa.
+        params (ReindexParams): Sem parâmetros.
+
+    Returns:
+        Dict[str, Any]: A tabela reindexada.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql":
+        steps = ["REINDEX TABLE CONCURRENTLY products", "ANALYZE products"]
+    else:
+        steps = ["REINDEX products", "ANALYZE products"]
+    report_progress(db, job_id, 0, len(steps))
+    db.commit()
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for done, statement in enumerate(steps, start=1):
+            connection.execute(text(statement))
+            report_progress(db, job_id, done)
+            db.commit()
+    return {"table": "products"}
+
+
+# tipo da tarefa -> (modelo dos parâmetros, função que a executa)
+JOB_HANDLERS: Dict[str, Tuple[Type[BaseModel], Callable[..., Dict[str, Any]]]] = {
+    "price_change": (PriceChangeParams, change_prices),
+    "export": (ExportParams, export_catalog),
+    "reindex": (ReindexParams, reindex_products),
+}
+
+
+def _heartbeat(job_id: int, stop: threading.Event, interval: float) -> None:
+    while not stop.wait(interval):
+        with SessionLocal() as db:
+            db.execute(
+                update(JobModel)
+                .where(JobModel.id == job_id)
+                .values(heartbeat_at=func.now())
+            )
+            db.commit()
+
+
+def run_job(job: JobModel) -> None:
+    """
+    Executa uma tarefa reservada, registrando o resultado ou o erro.
+
+    Enquanto a tarefa roda, uma thread renova `heartbeat_at` a cada terço de
+    `JOBS_STALE_AFTER`, inclusive durante comandos longos como o `REINDEX`, para que
+    `fail_stale_jobs` só marque como falhas as tarefas de workers que pararam de fato.
+
+    Args:
+        job (JobModel): A tarefa reservada por `claim_job`.
+    """
+    params_model, handler = JOB_HANDLERS[job.kind]
+    stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat, args=(job.id, stop, JOBS_STALE_AFTER / 3), daemon=True
+    )
+    heartbeat.start()
+    try:
+        with SessionLocal() as db:
+            try:
+                result = handler(db, job.id, params_model.model_validate(job.params))
+            except Exception as exc:
+                logger.exception("Falha na tarefa %s (%s)", job.id, job.kind)
+                db.rollback()
+                error = f"{type(exc).__name__}: {exc}"
+                finish_job(db, job.id, "failed", error=error)
+            else:
+                finish_job(db, job.id, "done", result=result)
+    finally:
+        stop.set()
+        heartbeat.join()
+
+
+router = APIRouter()
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=202)
+def create_job(
+    job: JobCreate, response: Response, db: Session = Depends(get_db)
+) -> JobModel:
+    """
+    Enfileira uma tarefa para ser executada por um processo do worker.
+
+    Args:
+        job (JobCreate): O tipo (`kind`) e os parâmetros (`params`) da tarefa.
+        response (Response): Resposta usada para definir o cabeçalho `Location`.
+        db (Session, optional): Sessão do banco de dados SQLAlchemy. Defaults to Depends(get_db).
+
+    Returns:
+        JobModel: A tarefa enfileirada, com `202 Accepted`.
+    """
+    db_job = enqueue_job(db, job.kind, job.params)
+    response.headers["Location"] = f"/jobs/{db_job.id}"
+    return db_job
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+def read_job(job_id: int, db: Session = Depends(get_db)) -> JobModel:
+    """
+    Retorna a situação e o progresso de uma tarefa.
+
+    Args:
+        job_id (int): O ID da tarefa.
+        db (Session, optional): Sessão do banco de dados SQLAlchemy. Defaults to Depends(get_db).
+
+    Returns:
+        JobModel: A tarefa.
+
+    Raises:
+        HTTPException: Se a tarefa não existir.
+    """
+    db_job = db.get(JobModel, job_id)
+    if db_job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return db_job
+
+
+@router.get("/jobs/{job_id}/result")
+def read_job_result(job_id: int, db: Session = Depends(get_db)) -> FileResponse:
+    """
+    Retorna o arquivo gerado por uma tarefa de exportação concluída.
+
+    Args:
+        job_id (int): O ID da tarefa.
+        db (Session, optional): Sessão do banco de dados SQLAlchemy. Defaults to Depends(get_db).
+
+    Returns:
+        FileResponse: O arquivo da exportação.
+
+    Raises:
+        HTTPException: Se a tarefa não existir ou não for uma exportação (404), ou se ainda
+            não tiver sido concluída (409).
+    """
+    db_job = db.get(JobModel, job_id)
+    if db_job is None or db_job.kind != "export":
+        raise HTTPException(status_code=404, detail="Job not found")
+    if db_job.status != "done":
+        raise HTTPException(status_code=409, detail="Job not finished")
+    export_format = db_job.result["format"]
+    return FileResponse(
+        db_job.result["path"],
+        media_type=MEDIA_TYPES[export_format],
+        filename=f"products.{export_format}",
+    )
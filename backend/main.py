@@ -1,9 +1,91 @@
-from fastapi import FastAPI
-from database import engine
-import models
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from categories import router as categories_router
+from changes import invalidate_caches, router as changes_router
+from compression import CompressionMiddleware
+from config import (
+    ADMISSION_CONCURRENCY,
+    ADMISSION_QUEUE_SIZE,
+    ADMISSION_QUEUE_TIMEOUT,
+    CACHE_BACKEND,
+    CHANGES_POLL_INTERVAL,
+    COMPRESSION_ENCODINGS,
+    COMPRESSION_MIN_SIZE,
+    DATABASE_ASYNC,
+    DB_READ_YOUR_WRITES_SECONDS,
+    JSON_FAST_PATH,
+    RATE_LIMIT_BACKEND,
+)
+from database import replicas
+from health import router as health_router
+from jobs import router as jobs_router
+from metrics import MetricsMiddleware, router as metrics_router
+from ratelimit import AdmissionMiddleware, rate_limit
+from replicas import ReadYourWritesMiddleware
 from router import router
+from router_async import router as async_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # o cache em memória não recebe as remoções feitas por outros processos e pelo worker
+    task = None
+    if CACHE_BACKEND == "memory":
+        task = asyncio.create_task(invalidate_caches(CHANGES_POLL_INTERVAL))
+    yield
+    if task is not None:
+        task.cancel()
+
 
-models.Base.metadata.create_all(bind=engine)
+app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if JSON_FAST_PATH else JSONResponse,
+    dependencies=[Depends(rate_limit)] if RATE_LIMIT_BACKEND != "none" else [],
+)
+if replicas is not None and DB_READ_YOUR_WRITES_SECONDS > 0:
+    app.add_middleware(ReadYourWritesMiddleware, window=DB_READ_YOUR_WRITES_SECONDS)
+app.add_middleware(
+    AdmissionMiddleware,
+    max_concurrency=ADMISSION_CONCURRENCY,
+    queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+    queue_size=ADMISSION_QUEUE_SIZE,
+)
+app.add_middleware(
+    CompressionMiddleware,
+    encodings=[
+        item.strip() for item in COMPRESSION_ENCODINGS.split(",") if item.strip()
+    ],
+    minimum_size=COMPRESSION_MIN_SIZE,
+)
+# adicionado por último, o middleware de métricas é o mais externo: mede as requisições
+# recusadas pelo controle de admissão e o tamanho das respostas já comprimidas
+app.add_middleware(MetricsMiddleware)
+app.include_router(metrics_router)
+app.include_router(health_router)
+app.include_router(jobs_router)
+app.include_router(categories_router)
+# registrado antes das rotas de produtos, para não ser capturado por "/products/{product_id}"
+app.include_router(changes_router)
 
-app = FastAPI()
-app.include_router(router)
+if DATABASE_ASYNC:
+    # As rotas assíncronas substituem as síncronas de mesmo caminho e método;
+    # as demais (como a exportação) continuam sendo servidas pelo router síncrono,
+    # registradas antes para não serem capturadas por "/products/{product_id}".
+    overridden = {
+        (route.path, method)
+        for route in async_router.routes
+        for method in route.methods
+    }
+    sync_router = APIRouter()
+    sync_router.routes = [
+        route
+        for route in router.routes
+        if not any((route.path, method) in overridden for method in route.methods)
+    ]
+    app.include_router(sync_router)
+    app.include_router(async_router)
+else:
+    app.include_router(router)
@@ -0,0 +1,279 @@
+"""
+Módulo de métricas da aplicação no formato Prometheus.
+
+Define as métricas das requisições HTTP (latência por rota, requisições em andamento,
+tamanho das respostas e consultas por requisição), das consultas ao banco de dados e do pool
+de conexões, e a rota `/metrics`, que as expõe para coleta pelo Prometheus.
+
+Com vários processos do servidor (`SERVER_WORKERS`), as métricas são gravadas em
+`PROMETHEUS_MULTIPROC_DIR` e a rota `/metrics` soma as de todos os processos. As métricas do
+pool de conexões são lidas no momento da coleta e, nesse modo, são as do processo que
+atendeu a coleta.
+
+Methods:
+    MetricsMiddleware: Middleware ASGI que mede cada requisição HTTP.
+    timed_pool_class(base, name): Cria uma classe de pool que mede o tempo de espera no checkout.
+    register_pool(name, engine): Registra o pool de um engine para exportar seu estado atual.
+    instrument_engine(name, engine): Mede o tempo e a quantidade das consultas executadas pelo engine.
+    read_metrics: Rota que retorna as métricas no formato de texto do Prometheus.
+"""
+
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Type
+
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.pool import Pool
+
+from config import DB_SLOW_QUERY_MS
+
+logger = logging.getLogger(__name__)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Tempo de resposta das requisições HTTP, por rota.",
+    ["method", "route", "status"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requisições HTTP em andamento.",
+    ["method"],
+    # com vários processos, soma os valores dos processos ativos
+    multiprocess_mode="livesum",
+)
+HTTP_RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes",
+    "Tamanho do corpo das respostas HTTP, por rota.",
+    ["method", "route"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000),
+)
+HTTP_REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Consultas ao banco de dados executadas por requisição HTTP, por rota.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds",
+    "Tempo de execução das consultas ao banco de dados, por tipo de comando.",
+    ["engine", "operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+)
+
+POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "Tempo de espera para obter uma conexão do pool.",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+)
+
+DB_READ_SESSIONS = Counter(
+    "db_read_sessions_total",
+    "Sessões de leitura abertas, por engine (primário ou réplica).",
+    ["engine"],
+)
+
+_pools: Dict[str, object] = {}
+
+# contador de consultas da requisição atual; as threads do threadpool herdam o contexto
+_request_queries: ContextVar[Optional[List[int]]] = ContextVar(
+    "request_queries", default=None
+)
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede cada requisição HTTP.
+
+    Registra a latência e o tamanho da resposta pelo caminho da rota (por exemplo,
+    `/products/{product_id}`), evitando um rótulo por URL, e a quantidade de consultas ao
+    banco de dados feitas durante a requisição. O tamanho é a soma dos blocos enviados, o que
+    também cobre as respostas em streaming.
+
+    Parameters:
+        app: A aplicação ASGI envolvida.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        queries = [0]
+        token = _request_queries.set(queries)
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            _request_queries.reset(token)
+            # o roteamento do FastAPI grava a rota encontrada no próprio scope
+            route = scope.get("route")
+            path = getattr(route, "path", "<unmatched>")
+            HTTP_REQUEST_SECONDS.labels(method, path, status).observe(elapsed)
+            HTTP_RESPONSE_BYTES.labels(method, path).observe(size)
+            HTTP_REQUEST_QUERIES.labels(method, path).observe(queries[0])
+
+
+class _CheckoutTimerMixin:
+    """
+    Mixin para classes de pool do SQLAlchemy que registra o tempo de cada checkout.
+
+    O tempo medido inclui a espera por uma conexão livre e, quando necessário, a abertura
+    de uma nova conexão, que é exatamente o custo percebido pela requisição.
+    """
+
+    metric_label = "primary"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            POOL_CHECKOUT_SECONDS.labels(self.metric_label).observe(
+                time.perf_counter() - start
+            )
+
+
+def timed_pool_class(base: Type[Pool], name: str) -> Type[Pool]:
+    """
+    Cria uma classe de pool que mede o tempo de espera no checkout.
+
+    Args:
+        base (Type[Pool]): A classe de pool do SQLAlchemy a ser estendida, como `QueuePool`.
+        name (str): O nome do engine usado no rótulo `engine` das métricas.
+
+    Returns:
+        Type[Pool]: A subclasse de `base` que registra `db_pool_checkout_seconds`.
+    """
+    return type(
+        f"Timed{base.__name__}",
+        (_CheckoutTimerMixin, base),
+        {"metric_label": name},
+    )
+
+
+def register_pool(name: str, engine) -> None:
+    """
+    Registra o pool de um engine para exportar seu estado atual.
+
+    Args:
+        name (str): O nome do engine usado no rótulo `engine` das métricas.
+        engine: O engine (síncrono ou assíncrono) cujo pool será observado.
+    """
+    _pools[name] = getattr(engine, "sync_engine", engine)
+
+
+def instrument_engine(name: str, engine) -> None:
+    """
+    Mede o tempo e a quantidade das consultas executadas pelo engine.
+
+    Registra `db_query_duration_seconds`, soma as consultas da requisição atual e, se
+    `DB_SLOW_QUERY_MS` for maior que zero, registra no log as consultas mais lentas que o limite.
+
+    Args:
+        name (str): O nome do engine usado no rótulo `engine` das métricas.
+        engine: O engine (síncrono ou assíncrono) a ser observado.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+        DB_QUERY_SECONDS.labels(name, operation).observe(elapsed)
+        queries = _request_queries.get()
+        if queries is not None:
+            queries[0] += 1
+        if DB_SLOW_QUERY_MS and elapsed * 1000 >= DB_SLOW_QUERY_MS:
+            logger.warning(
+                "Consulta lenta (%.1f ms, engine %s): %s",
+                elapsed * 1000,
+                name,
+                " ".join(statement.split())[:1000],
+            )
+
+
+class _PoolCollector:
+    """
+    Coletor Prometheus que lê o estado dos pools registrados no momento da coleta.
+    """
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        size = GaugeMetricFamily(
+            "db_pool_size", "Conexões mantidas no pool.", labels=["engine"]
+        )
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out", "Conexões em uso.", labels=["engine"]
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow", "Conexões acima do tamanho do pool.", labels=["engine"]
+        )
+        for name, engine in _pools.items():
+            pool = engine.pool
+            if not hasattr(pool, "checkedout"):
+                continue
+            size.add_metric([name], pool.size())
+            checked_out.add_metric([name], pool.checkedout())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+        yield size
+        yield checked_out
+        yield overflow
+
+
+REGISTRY.register(_PoolCollector())
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def read_metrics() -> Response:
+    """
+    Rota que retorna as métricas no formato de texto do Prometheus.
+
+    Returns:
+        Response: As métricas registradas, no formato de exposição do Prometheus.
+    """
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(_PoolCollector())
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,41 @@
+"""
+Ambiente de execução das migrações do Alembic.
+
+Usa a mesma URL de banco de dados da aplicação (`DATABASE_URL`) e os metadados dos modelos
+SQLAlchemy, de modo que `alembic revision --autogenerate` compara o banco com `models.py`.
+
+As migrações inspecionam o esquema existente (bancos criados por `create_all` em versões
+anteriores), por isso são executadas apenas conectadas ao banco, sem o modo `--sql`.
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+import models
+from config import DATABASE_URL
+
+if context.config.config_file_name is not None:
+    fileConfig(context.config.config_file_name)
+
+target_metadata = models.Base.metadata
+
+# objetos criados apenas por migrações no PostgreSQL e não mapeados em models.py,
+# que o `--autogenerate` não deve propor remover
+UNMAPPED = {"search_vector", "ix_products_search_vector", "ix_products_name_trgm"}
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    return not (reflected and compare_to is None and name in UNMAPPED)
+
+
+connectable = create_engine(DATABASE_URL, poolclass=pool.NullPool)
+with connectable.connect() as connection:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
@@ -0,0 +1,38 @@
+"""Cria a tabela products.
+
+Corresponde ao esquema criado por `Base.metadata.create_all` nas versões anteriores da
+aplicação; bancos que já possuem a tabela apenas são marcados com esta revisão.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("products"):
+        return
+    op.create_table(
+        "products",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String()),
+        sa.Column("description", sa.String()),
+        sa.Column("price", sa.Float()),
+        sa.Column("categoria", sa.String()),
+        sa.Column("email_fornecedor", sa.String()),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("products")
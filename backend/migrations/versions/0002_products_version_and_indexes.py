@@ -0,0 +1,65 @@
+"""Adiciona updated_at, version e os índices de filtro em products.
+
+Linhas existentes recebem `updated_at = created_at` e `version = 1`. No PostgreSQL os
+índices são criados com `CREATE INDEX CONCURRENTLY`, sem bloquear escritas na tabela
+durante a migração.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_products_categoria_id": ["categoria", "id"],
+    "ix_products_email_fornecedor_id": ["email_fornecedor", "id"],
+    "ix_products_created_at": ["created_at"],
+    "ix_products_price": ["price"],
+}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("products")}
+
+    if "updated_at" not in columns:
+        op.add_column("products", sa.Column("updated_at", sa.DateTime(timezone=True)))
+        op.execute("UPDATE products SET updated_at = created_at")
+    if "version" not in columns:
+        op.add_column(
+            "products",
+            sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+        )
+
+    existing = {index["name"] for index in inspector.get_indexes("products")}
+    missing = {name: cols for name, cols in INDEXES.items() if name not in existing}
+    if op.get_bind().dialect.name == "postgresql":
+        # CONCURRENTLY não pode ser executado dentro de uma transação
+        with op.get_context().autocommit_block():
+            for name, cols in missing.items():
+                op.create_index(
+                    name,
+                    "products",
+                    cols,
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+    else:
+        for name, cols in missing.items():
+            op.create_index(name, "products", cols)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="products")
+    op.drop_column("products", "version")
+    op.drop_column("products", "updated_at")
@@ -0,0 +1,52 @@
+"""Adiciona a busca textual de produtos (tsvector e pg_trgm).
+
+Cria a coluna gerada `search_vector`, com nome (peso A) e descrição (peso B) processados
+pelo dicionário `portuguese`, o índice GIN dessa coluna e um índice GIN de trigramas
+(`pg_trgm`) no nome, usado para tolerar erros de digitação. Os índices são criados com
+`CREATE INDEX CONCURRENTLY`; a coluna gerada reescreve a tabela uma única vez.
+
+Apenas no PostgreSQL: nos demais bancos a busca usa `ILIKE` e esta revisão não faz nada.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("""
+        ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('portuguese', coalesce(name, '')), 'A')
+            || setweight(to_tsvector('portuguese', coalesce(description, '')), 'B')
+        ) STORED
+        """)
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_search_vector "
+            "ON products USING gin (search_vector)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_products_name_trgm "
+            "ON products USING gin (name gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS ix_products_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_products_search_vector")
+    op.execute("ALTER TABLE products DROP COLUMN IF EXISTS search_vector")
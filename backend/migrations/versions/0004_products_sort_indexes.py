@@ -0,0 +1,72 @@
+"""Troca os índices de preço e data de criação por índices (campo, id) de ordenação.
+
+A listagem ordenada por nome, preço ou data de criação pagina por keyset com
+`WHERE (campo, id) > (:valor, :id) ORDER BY campo, id`, que usa um índice composto
+(campo, id) nos dois sentidos. Os índices `ix_products_price` e `ix_products_created_at`
+ficam redundantes, pois os novos atendem também aos filtros por esses campos. No
+PostgreSQL os índices são criados e removidos com `CONCURRENTLY`.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_products_name_id": ["name", "id"],
+    "ix_products_price_id": ["price", "id"],
+    "ix_products_created_at_id": ["created_at", "id"],
+}
+REPLACED = {
+    "ix_products_created_at": ["created_at"],
+    "ix_products_price": ["price"],
+}
+
+
+def _swap(create: dict, drop: dict) -> None:
+    existing = {
+        index["name"] for index in sa.inspect(op.get_bind()).get_indexes("products")
+    }
+    if op.get_bind().dialect.name == "postgresql":
+        # CONCURRENTLY não pode ser executado dentro de uma transação; os novos índices
+        # são criados antes de remover os antigos, para o filtro nunca ficar sem índice
+        with op.get_context().autocommit_block():
+            for name, cols in create.items():
+                op.create_index(
+                    name,
+                    "products",
+                    cols,
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+            for name in drop:
+                op.drop_index(
+                    name,
+                    table_name="products",
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
+    else:
+        for name, cols in create.items():
+            if name not in existing:
+                op.create_index(name, "products", cols)
+        for name in drop:
+            if name in existing:
+                op.drop_index(name, table_name="products")
+
+
+def upgrade() -> None:
+    _swap(INDEXES, REPLACED)
+
+
+def downgrade() -> None:
+    _swap(REPLACED, INDEXES)
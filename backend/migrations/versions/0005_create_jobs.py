@@ -0,0 +1,44 @@
+"""Cria a tabela jobs, a fila de tarefas em segundo plano.
+
+O índice (status, id) atende à busca da próxima tarefa pendente feita pelos workers com
+`SELECT ... FOR UPDATE SKIP LOCKED`. A tabela é nova, então o índice é criado junto com ela.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("jobs"):
+        return
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("params", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False, server_default="queued"),
+        sa.Column("processed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total", sa.Integer()),
+        sa.Column("result", sa.JSON()),
+        sa.Column("error", sa.String()),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+        sa.Column("started_at", sa.DateTime(timezone=True)),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True)),
+        sa.Column("finished_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_jobs_status_id", "jobs", ["status", "id"])
+
+
+def downgrade() -> None:
+    op.drop_table("jobs")
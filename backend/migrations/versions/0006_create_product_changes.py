@@ -0,0 +1,38 @@
+"""Cria a tabela product_changes, o outbox do feed de alterações de produtos.
+
+Os eventos são lidos em ordem de `id` pelo feed `GET /products/changes` e removidos pelo
+worker após o período de retenção, com a ajuda do índice em `created_at`.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("product_changes"):
+        return
+    op.create_table(
+        "product_changes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("operation", sa.String(), nullable=False),
+        sa.Column("version", sa.Integer()),
+        sa.Column("data", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_product_changes_created_at", "product_changes", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("product_changes")
@@ -1,15 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import JSON, Column, Integer, String, Float, DateTime, Index, Text
 from sqlalchemy.sql import func
 from database import Base
-from enum import Enum
-
-
-class CategoriaBase(Enum):
-    categoria1 = "Eletrônico"
-    categoria2 = "Eletrodoméstico"
-    categoria3 = "Móveis"
-    categoria4 = "Roupas"
-    categoria5 = "Calçados"
 
 
 class ProductModel(Base):
@@ -23,9 +14,11 @@ class ProductModel(Base):
         name (str): Nome do produto.
         description (str): Descrição do produto.
         price (float): Preço do produto.
-        categoria (str): Categoria do produto, escolhida a partir de `CategoriaBase`.
+        categoria (str): Categoria do produto, escolhida a partir de `categories.CategoriaBase`.
         email_fornecedor (str): E-mail do fornecedor do produto.
         created_at (DateTime): Data e hora de criação do registro, definido automaticamente.
+        updated_at (DateTime): Data e hora da última alteração do registro, atualizada automaticamente.
+        version (int): Versão do registro, incrementada a cada alteração (controle de concorrência otimista).
 
     Methods:
         __repr__():
@@ -33,6 +26,15 @@ class ProductModel(Base):
     """
 
     __tablename__ = "products"  # esse será o nome da tabela
+    __table_args__ = (
+        # (coluna, id) atende ao filtro e à ordenação da paginação por keyset
+        Index("ix_products_categoria_id", "categoria", "id"),
+        Index("ix_products_email_fornecedor_id", "email_fornecedor", "id"),
+        # (campo, id) atende à ordenação da listagem e aos filtros por faixa de preço
+        Index("ix_products_name_id", "name", "id"),
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_created_at_id", "created_at", "id"),
+    )
     id = Column(Integer, primary_key=True)
     name = Column(String)
     description = Column(String)
@@ -40,6 +42,94 @@ class ProductModel(Base):
     categoria = Column(String)
     email_fornecedor = Column(String)
     created_at = Column(DateTime(timezone=True), default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), default=func.now(), onupdate=func.now()
+    )
+    version = Column(Integer, nullable=False, server_default="1")
+
+    # busca created_at/updated_at gerados pelo banco via RETURNING no próprio flush,
+    # e o ORM incrementa `version` e a confere no WHERE de cada UPDATE
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": version}
 
     def __repr__(self):
         return f"<Product(categoria={self.categoria})>"
+
+
+class JobModel(Base):
+    """
+    Modelo SQLAlchemy para as tarefas em segundo plano.
+
+    Cada linha é uma tarefa enfileirada por `POST /jobs` e executada por um processo do
+    worker, que a reserva com `SELECT ... FOR UPDATE SKIP LOCKED`.
+
+    Parameters:
+        id (int): Identificador único da tarefa.
+        kind (str): O tipo da tarefa, como "price_change", "export" ou "reindex".
+        params (dict): Os parâmetros da tarefa, validados pelo modelo do seu tipo.
+        status (str): A situação da tarefa: "queued", "running", "done" ou "failed".
+        processed (int): A quantidade de itens já processados.
+        total (int): A quantidade total de itens, quando conhecida.
+        result (dict): O resultado da tarefa concluída.
+        error (str): A mensagem de erro da tarefa que falhou.
+        created_at (DateTime): Data e hora em que a tarefa foi enfileirada.
+        started_at (DateTime): Data e hora em que um worker iniciou a tarefa.
+        heartbeat_at (DateTime): Data e hora do último sinal de vida do worker.
+        finished_at (DateTime): Data e hora em que a tarefa terminou.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # atende à busca da próxima tarefa pendente, em ordem de chegada
+        Index("ix_jobs_status_id", "status", "id"),
+    )
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    params = Column(JSON, nullable=False)
+    status = Column(String, nullable=False, server_default="queued")
+    processed = Column(Integer, nullable=False, server_default="0")
+    total = Column(Integer)
+    result = Column(JSON)
+    error = Column(String)
+    created_at = Column(DateTime(timezone=True), default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    heartbeat_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    # busca os valores gerados pelo banco (status, processed, created_at) no próprio flush
+    __mapper_args__ = {"eager_defaults": True}
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status})>"
+
+
+class ProductChangeModel(Base):
+    """
+    Modelo SQLAlchemy para os eventos de alteração de produtos (outbox).
+
+    Cada criação, alteração ou remoção de produto grava um evento na mesma transação da
+    escrita, de modo que o feed `GET /products/changes` nunca publica uma alteração
+    desfeita nem perde uma confirmada.
+
+    Parameters:
+        id (int): Identificador do evento, crescente, usado para retomar o feed.
+        product_id (int): O ID do produto alterado.
+        operation (str): A operação: "create", "update" ou "delete".
+        version (int): A versão do produto após a alteração.
+        data (str): O produto após a alteração (ou o produto removido), em JSON.
+        created_at (DateTime): Data e hora da alteração.
+    """
+
+    __tablename__ = "product_changes"
+    __table_args__ = (
+        # atende à remoção dos eventos mais antigos que a retenção
+        Index("ix_product_changes_created_at", "created_at"),
+    )
+    id = Column(Integer, primary_key=True)
+    product_id = Column(Integer, nullable=False)
+    operation = Column(String, nullable=False)
+    version = Column(Integer)
+    data = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=func.now())
+
+    def __repr__(self):
+        return f"<ProductChange(id={self.id}, operation={self.operation})>"
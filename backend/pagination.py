@@ -0,0 +1,153 @@
+"""
+Módulo de paginação por cursor (keyset) para listagens de produtos.
+
+O cursor é um token opaco para o cliente: internamente guarda o último `id`
+retornado na página, de modo que a próxima página é obtida com `WHERE id > :id`
+usando o índice da chave primária, com custo constante em qualquer profundidade.
+Quando a listagem é ordenada por outro campo, o cursor guarda também o valor desse
+campo no último produto, e a próxima página é obtida com `WHERE (campo, id) > (:valor, :id)`.
+
+A busca textual é ordenada por relevância, que não é uma chave estável; nela o cursor
+guarda o deslocamento (`offset`) da próxima página.
+
+Methods:
+    encode_cursor(last_id, sort, value): Gera o cursor opaco a partir do último produto da página.
+    decode_cursor(cursor, sort): Recupera o último produto da página a partir de um cursor opaco.
+    split_page(rows, limit, sort): Separa a página atual e calcula o cursor da próxima página.
+    encode_offset_cursor(offset): Gera o cursor opaco a partir do deslocamento da próxima página.
+    decode_offset_cursor(cursor): Recupera o deslocamento a partir de um cursor opaco.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """
+    Exceção lançada quando o cursor recebido não pode ser decodificado.
+    """
+
+
+def _dump(payload: Dict[str, Any]) -> str:
+    data = json.dumps(payload, separators=(",", ":"), default=_json_default).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Valor não serializável no cursor: {value!r}")
+
+
+def _load(cursor: str) -> Dict[str, Any]:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise InvalidCursorError("Cursor inválido") from exc
+    if not isinstance(payload, dict):
+        raise InvalidCursorError("Cursor inválido")
+    return payload
+
+
+def encode_cursor(last_id: int, sort: str = "id", value: Any = None) -> str:
+    """
+    Gera o cursor opaco a partir do último produto da página.
+
+    Args:
+        last_id (int): O ID do último produto retornado na página atual.
+        sort (str): A ordenação da listagem, como "price" ou "-created_at".
+        value (Any): O valor do campo de ordenação no último produto, quando não é o ID.
+
+    Returns:
+        str: O cursor codificado em base64 seguro para URLs.
+    """
+    payload: Dict[str, Any] = {"id": last_id}
+    if sort != "id":
+        payload["sort"] = sort
+    if value is not None:
+        payload["value"] = value
+    return _dump(payload)
+
+
+def decode_cursor(cursor: str, sort: str = "id") -> Tuple[int, Any]:
+    """
+    Recupera o último produto da página a partir de um cursor opaco.
+
+    Args:
+        cursor (str): O cursor recebido do cliente.
+        sort (str): A ordenação da listagem; deve ser a mesma usada para gerar o cursor.
+
+    Returns:
+        Tuple[int, Any]: O ID e o valor do campo de ordenação a partir dos quais a próxima
+            página deve começar. O valor é None quando a ordenação é pelo ID.
+
+    Raises:
+        InvalidCursorError: Se o cursor estiver malformado ou for de outra ordenação.
+    """
+    payload = _load(cursor)
+    last_id = payload.get("id")
+    if not isinstance(last_id, int) or payload.get("sort", "id") != sort:
+        raise InvalidCursorError("Cursor inválido")
+    return last_id, payload.get("value")
+
+
+def split_page(
+    rows: Sequence, limit: int, sort: str = "id"
+) -> Tuple[Sequence, Optional[str]]:
+    """
+    Separa a página atual e calcula o cursor da próxima página.
+
+    A consulta deve buscar `limit + 1` linhas: a linha excedente apenas indica que existe
+    uma próxima página e não é retornada.
+
+    Args:
+        rows (Sequence): As linhas retornadas pela consulta, na ordem de `sort`.
+        limit (int): O tamanho da página solicitado pelo cliente.
+        sort (str): A ordenação da listagem, como "price" ou "-created_at".
+
+    Returns:
+        Tuple[Sequence, Optional[str]]: As linhas da página e o cursor da próxima página,
+            ou None se esta for a última.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    field = sort.lstrip("-")
+    value = None if field == "id" else getattr(rows[-1], field)
+    return rows, encode_cursor(rows[-1].id, sort, value)
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """
+    Gera o cursor opaco a partir do deslocamento da próxima página.
+
+    Args:
+        offset (int): A quantidade de linhas já retornadas nas páginas anteriores.
+
+    Returns:
+        str: O cursor codificado em base64 seguro para URLs.
+    """
+    return _dump({"offset": offset})
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """
+    Recupera o deslocamento a partir de um cursor opaco.
+
+    Args:
+        cursor (str): O cursor recebido do cliente.
+
+    Returns:
+        int: A quantidade de linhas a pular.
+
+    Raises:
+        InvalidCursorError: Se o cursor estiver malformado ou o deslocamento for negativo.
+    """
+    offset = _load(cursor).get("offset")
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidCursorError("Cursor inválido")
+    return offset
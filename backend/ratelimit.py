@@ -0,0 +1,313 @@
+"""
+Módulo de limitação de taxa e controle de admissão das requisições.
+
+A limitação de taxa usa um balde de fichas (token bucket) por cliente e por rota: cada
+requisição consome uma ficha, as fichas são repostas a `RATE_LIMIT_RATE` por segundo até
+`RATE_LIMIT_BURST`, e sem ficha disponível a requisição é recusada com 429 e `Retry-After`.
+Os baldes ficam em memória do processo ou em um servidor compatível com Redis, escolhido por
+`RATE_LIMIT_BACKEND`.
+
+O controle de admissão limita as requisições atendidas ao mesmo tempo por processo
+(`ADMISSION_CONCURRENCY`). As demais aguardam uma vaga por até `ADMISSION_QUEUE_TIMEOUT`
+segundos e, passado esse tempo (ou com a fila cheia), são recusadas com 503 e
+`Retry-After`, de modo que a latência das requisições aceitas continua limitada em
+sobrecarga, em vez de todas esperarem pelo pool de conexões.
+
+Methods:
+    parse_route_limits(value): Converte os limites por rota informados em `RATE_LIMIT_ROUTES`.
+    create_limiter: Cria o limitador configurado em `RATE_LIMIT_BACKEND`.
+    rate_limit(request): Dependência que aplica a limitação de taxa à requisição.
+    AdmissionMiddleware: Middleware ASGI que limita as requisições em andamento.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from fastapi import HTTPException, Request
+from prometheus_client import Counter, Histogram
+
+from config import (
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_RATE,
+    RATE_LIMIT_REDIS_URL,
+    RATE_LIMIT_ROUTES,
+)
+from serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+REQUESTS_REJECTED = Counter(
+    "http_requests_rejected_total",
+    "Requisições recusadas, por motivo (rate_limit ou overload).",
+    ["reason"],
+)
+ADMISSION_WAIT_SECONDS = Histogram(
+    "http_admission_wait_seconds",
+    "Tempo de espera por uma vaga no controle de admissão.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+# rotas de observabilidade, que precisam responder mesmo em sobrecarga
+EXEMPT_PATHS = {"/metrics", "/health/live", "/health/ready"}
+
+# rotas que mantêm a conexão aberta sem ocupar o banco, e não contam na concorrência
+STREAMING_PATHS = {"/products/changes"}
+
+# baldes mantidos no limitador em memória; os menos usados recentemente são descartados
+MEMORY_MAXSIZE = 100_000
+
+
+def parse_route_limits(value: str) -> Dict[Tuple[str, str], Tuple[float, int]]:
+    """
+    Converte os limites por rota informados em `RATE_LIMIT_ROUTES`.
+
+    Args:
+        value (str): Os limites no formato "MÉTODO /caminho=taxa:capacidade", separados por
+            vírgula, por exemplo "POST /products/bulk=2:5".
+
+    Returns:
+        Dict[Tuple[str, str], Tuple[float, int]]: A taxa e a capacidade de cada rota, pelo
+            método e pelo caminho da rota (como "/products/{product_id}").
+
+    Raises:
+        ValueError: Se algum item não estiver no formato esperado.
+    """
+    limits = {}
+    for item in filter(None, (item.strip() for item in value.split(","))):
+        try:
+            route, limit = item.rsplit("=", 1)
+            method, path = route.split()
+            rate, burst = limit.split(":")
+            limits[(method.upper(), path)] = (float(rate), int(burst))
+        except ValueError:
+            raise ValueError(f"RATE_LIMIT_ROUTES inválido: {item}") from None
+    return limits
+
+
+class NullLimiter:
+    """
+    Limitador desativado: toda requisição é aceita.
+    """
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        return 0.0
+
+
+class MemoryLimiter:
+    """
+    Baldes de fichas em memória do processo.
+
+    É usado apenas pelo event loop (a dependência `rate_limit` é assíncrona), sem
+    necessidade de lock. Cada processo do servidor tem os seus próprios baldes, de modo que
+    o limite efetivo é multiplicado pela quantidade de processos.
+
+    Parameters:
+        maxsize (int): A quantidade máxima de baldes; o menos usado recentemente é descartado.
+    """
+
+    def __init__(self, maxsize: int = MEMORY_MAXSIZE):
+        self.maxsize = maxsize
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(burst), now]
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / rate
+
+
+class RedisLimiter:
+    """
+    Baldes de fichas compartilhados entre processos, compatível com o protocolo Redis.
+
+    Cada consulta executa um script Lua, que repõe e consome as fichas atomicamente. Recebe o
+    cliente já construído, o que permite usar qualquer implementação compatível com
+    `redis.asyncio.Redis` (por exemplo, um `fakeredis.aioredis.FakeRedis` local). Se o
+    servidor não responder, a requisição é aceita.
+
+    Parameters:
+        client: O cliente Redis assíncrono.
+        prefix (str): O prefixo das chaves dos baldes.
+    """
+
+    SCRIPT = """
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'time')
+    local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local tokens = tonumber(bucket[1]) or burst
+    local last = tonumber(bucket[2]) or now
+    tokens = math.min(burst, tokens + math.max(now - last, 0) * rate)
+    local wait = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        wait = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'time', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(self.SCRIPT)
+
+    async def acquire(self, key: str, rate: float, burst: int) -> float:
+        try:
+            wait = await self._script(
+                keys=[f"{self.prefix}:{key}"], args=[rate, burst, time.time()]
+            )
+        except Exception as exc:
+            # com o servidor indisponível, a requisição é aceita em vez de falhar
+            logger.warning("Limitador de taxa indisponível: %s", exc)
+            return 0.0
+        return float(wait)
+
+
+def create_limiter():
+    """
+    Cria o limitador configurado em `RATE_LIMIT_BACKEND`.
+
+    Returns:
+        NullLimiter | MemoryLimiter | RedisLimiter: O limitador do backend configurado.
+
+    Raises:
+        ValueError: Se `RATE_LIMIT_BACKEND` não for "memory", "redis" ou "none".
+    """
+    if RATE_LIMIT_BACKEND == "none":
+        return NullLimiter()
+    if RATE_LIMIT_BACKEND == "memory":
+        return MemoryLimiter()
+    if RATE_LIMIT_BACKEND == "redis":
+        import redis.asyncio
+
+        return RedisLimiter(redis.asyncio.Redis.from_url(RATE_LIMIT_REDIS_URL))
+    raise ValueError(f"RATE_LIMIT_BACKEND inválido: {RATE_LIMIT_BACKEND}")
+
+
+limiter = create_limiter()
+route_limits = parse_route_limits(RATE_LIMIT_ROUTES)
+
+
+async def rate_limit(request: Request) -> None:
+    """
+    Dependência que aplica a limitação de taxa à requisição.
+
+    O cliente é identificado pelo endereço de origem (o Uvicorn considera `X-Forwarded-For`
+    de proxies confiáveis) e a rota pelo seu caminho, como "/products/{product_id}", de modo
+    que todas as leituras de produtos por ID compartilham o mesmo balde.
+
+    Args:
+        request (Request): A requisição.
+
+    Raises:
+        HTTPException: 429 com `Retry-After`, se o cliente excedeu o limite da rota.
+    """
+    route = request.scope.get("route")
+    path = getattr(route, "path", request.url.path)
+    if path in EXEMPT_PATHS:
+        return
+    rate, burst = route_limits.get(
+        (request.method, path), (RATE_LIMIT_RATE, RATE_LIMIT_BURST)
+    )
+    if rate <= 0:
+        return
+    client = request.client.host if request.client else "unknown"
+    wait = await limiter.acquire(f"{client}:{request.method} {path}", rate, burst)
+    if wait > 0:
+        REQUESTS_REJECTED.labels("rate_limit").inc()
+        raise HTTPException(
+            status_code=429,
+            detail="Too many requests",
+            headers={"Retry-After": str(max(math.ceil(wait), 1))},
+        )
+
+
+class AdmissionMiddleware:
+    """
+    Middleware ASGI que limita as requisições em andamento no processo.
+
+    Parameters:
+        app: A aplicação ASGI envolvida.
+        max_concurrency (int): As requisições atendidas ao mesmo tempo; 0 desativa o limite.
+        queue_timeout (float): Segundos de espera por uma vaga antes de recusar com 503.
+        queue_size (int): As requisições aguardando vaga; acima disso, as novas são recusadas
+            de imediato.
+    """
+
+    def __init__(
+        self, app, max_concurrency: int, queue_timeout: float, queue_size: int
+    ):
+        self.app = app
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.queue_size = queue_size
+        self._slots = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._waiting = 0
+
+    async def __call__(self, scope, receive, send):
+        if (
+            self._slots is None
+            or scope["type"] != "http"
+            or scope["path"] in EXEMPT_PATHS
+            or scope["path"] in STREAMING_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if self._slots.locked():
+            if self._waiting >= self.queue_size:
+                await self._reject(send)
+                return
+            self._waiting += 1
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                await self._reject(send)
+                return
+            finally:
+                self._waiting -= 1
+                ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - start)
+        else:
+            await self._slots.acquire()
+            ADMISSION_WAIT_SECONDS.observe(0)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._slots.release()
+
+    async def _reject(self, send) -> None:
+        REQUESTS_REJECTED.labels("overload").inc()
+        retry_after = str(max(math.ceil(self.queue_timeout), 1)).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"retry-after", retry_after),
+                ],
+            }
+        )
+        await send(
+            {
+                "type": "http.response.body",
+                "body": dumps({"detail": "Server overloaded"}),
+            }
+        )
@@ -0,0 +1,177 @@
+"""
+Módulo de roteamento das leituras para as réplicas do banco de dados.
+
+As rotas de leitura de produtos (listagem, consulta por ID, busca e estatísticas) obtêm a
+sessão de `database.get_read_db`, que escolhe uma das réplicas de `DATABASE_REPLICA_URLS`
+por rodízio (`round_robin`) ou pela réplica com menos sessões abertas no processo
+(`least_connections`). As escritas continuam no primário.
+
+Como as réplicas recebem as alterações com atraso, um cliente que acabou de escrever poderia
+não ler a própria escrita. Por isso, toda escrita bem-sucedida devolve o cookie
+`read_primary_until`, e as leituras do cliente vão ao primário enquanto ele for válido
+(`DB_READ_YOUR_WRITES_SECONDS`).
+
+O cache de produtos segue as mesmas regras: é preenchido apenas por leituras no primário,
+para que uma réplica atrasada não guarde uma versão antiga logo após uma escrita, e é
+ignorado nas leituras de um cliente que acabou de escrever, que vão sempre ao banco.
+
+Methods:
+    ReplicaSet: Escolhe a réplica de cada sessão de leitura.
+    reads_from_primary(cookie): Verifica se o cookie de leitura das próprias escritas é válido.
+    cache_policy(db): Indica se a leitura pode usar e se pode preencher o cache de produtos.
+    ReadYourWritesMiddleware: Middleware ASGI que devolve o cookie após as escritas.
+"""
+
+import math
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+
+READ_PRIMARY_COOKIE = "read_primary_until"
+
+# chaves de `Session.info` definidas por `database.get_read_db`
+REPLICA_SESSION = "replica"
+FRESH_READ = "fresh_read"
+
+STRATEGIES = ("round_robin", "least_connections")
+
+# métodos que não alteram dados e não renovam o cookie
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# rotas POST que apenas leem dados e também não renovam o cookie
+READ_ONLY_PATHS = {"/products/lookup"}
+
+
+class ReplicaSet:
+    """
+    Escolhe a réplica de cada sessão de leitura.
+
+    A escolha é feita por processo: cada processo do servidor faz o seu próprio rodízio e
+    conta apenas as suas próprias sessões abertas. É usado tanto pelas threads das rotas
+    síncronas quanto pelo event loop, por isso a escolha é protegida por um lock.
+
+    Parameters:
+        factories (List[Callable]): As fábricas de sessões de cada réplica.
+        names (List[str]): Os nomes das réplicas, usados nas métricas.
+        strategy (str): "round_robin" ou "least_connections".
+
+    Raises:
+        ValueError: Se a estratégia não for uma das suportadas.
+    """
+
+    def __init__(self, factories: List[Callable], names: List[str], strategy: str):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"DB_REPLICA_STRATEGY inválido: {strategy}")
+        self.factories = factories
+        self.names = names
+        self.strategy = strategy
+        self._in_use = [0] * len(factories)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> int:
+        """
+        Escolhe a réplica de uma nova sessão e a conta como aberta.
+
+        Com `least_connections`, os empates são desfeitos a partir da réplica seguinte à
+        última escolhida, para que as réplicas ociosas também se revezem.
+
+        Returns:
+            int: O índice da réplica escolhida.
+        """
+        with self._lock:
+            count = len(self.factories)
+            if self.strategy == "round_robin":
+                index = self._next
+            else:
+                index = min(
+                    ((self._next + offset) % count for offset in range(count)),
+                    key=self._in_use.__getitem__,
+                )
+            self._next = (index + 1) % count
+            self._in_use[index] += 1
+            return index
+
+    def release(self, index: int) -> None:
+        """
+        Conta a sessão da réplica como fechada.
+
+        Args:
+            index (int): O índice retornado por `acquire`.
+        """
+        with self._lock:
+            self._in_use[index] -= 1
+
+
+def reads_from_primary(cookie: Optional[str]) -> bool:
+    """
+    Verifica se o cookie de leitura das próprias escritas é válido.
+
+    Args:
+        cookie (Optional[str]): O valor do cookie `read_primary_until`: o instante, em
+            segundos desde a época, até o qual as leituras devem ir ao primário.
+
+    Returns:
+        bool: Verdadeiro se as leituras do cliente devem ir ao primário.
+    """
+    if not cookie:
+        return False
+    try:
+        return float(cookie) > time.time()
+    except ValueError:
+        return False
+
+
+def cache_policy(db) -> Tuple[bool, bool]:
+    """
+    Indica se a leitura pode usar e se pode preencher o cache de produtos.
+
+    Args:
+        db: A sessão de leitura (`Session` ou `AsyncSession`) de `database.get_read_db`.
+
+    Returns:
+        Tuple[bool, bool]: Se o cache pode ser consultado (falso quando o cliente acabou de
+            escrever) e se os produtos lidos podem ser armazenados nele (falso nas réplicas).
+    """
+    return not db.info.get(FRESH_READ, False), not db.info.get(REPLICA_SESSION, False)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Middleware ASGI que devolve o cookie `read_primary_until` após as escritas.
+
+    O cookie é definido nas respostas de sucesso (status abaixo de 400) de métodos que
+    alteram dados, como POST, PUT, PATCH e DELETE, exceto nas rotas POST que apenas leem,
+    como `POST /products/lookup`.
+
+    Parameters:
+        app: A aplicação ASGI envolvida.
+        window (float): Segundos em que as leituras do cliente vão ao primário após a escrita.
+    """
+
+    def __init__(self, app, window: float):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or scope["path"] in READ_ONLY_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{READ_PRIMARY_COOKIE}={until:.3f}; Max-Age={math.ceil(self.window)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
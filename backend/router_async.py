@@ -0,0 +1,506 @@
+"""
+Módulo de rotas FastAPI assíncronas para operações CRUD de produtos.
+
+Versão assíncrona das rotas de `router`, usada quando `DATABASE_ASYNC` está habilitado.
+Os handlers são `async def` e usam `AsyncSession` (asyncpg), de modo que um único processo
+atende milhares de requisições concorrentes sem depender do threadpool do FastAPI.
+As rotas que não possuem versão assíncrona continuam sendo servidas por `router`.
+
+Methods:
+    create_product_route: Cria um novo produto no banco de dados.
+    detele_product: Deleta um produto do banco de dados com base no ID fornecido.
+    read_all_products: Retorna uma página de produtos, com filtros e paginação por cursor.
+    search_products_route: Busca produtos por nome e descrição, ordenados por relevância.
+    read_product_stats: Retorna as estatísticas agregadas do catálogo de produtos.
+    lookup_products_route: Retorna vários produtos pelos seus IDs, em uma única requisição.
+    read_products_by_ids: Retorna vários produtos pelos IDs informados na query string.
+    read_one_product: Retorna um produto específico com base no ID fornecido.
+    update_product_route: Atualiza um produto existente com base no ID fornecido.
+    create_products_bulk: Cria vários produtos em uma única transação.
+    update_products_bulk: Atualiza vários produtos existentes em uma única transação.
+    delete_products_bulk: Deleta vários produtos em uma única transação.
+"""
+
+from typing import Any, Dict, List, Literal, Optional
+
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bulk import (
+    lookup_result,
+    not_found_errors,
+    parse_ids,
+    split_repeated_ids,
+    validate_bulk_items,
+    version_conflict_errors,
+)
+from cache import call_cache, product_cache, serialize_product, stats_cache
+from config import JSON_FAST_PATH
+from crud import VersionConflictError
+from crud_async import (
+    create_product,
+    create_products,
+    delete_product,
+    delete_products,
+    get_product,
+    get_product_stats,
+    get_products,
+    get_products_by_ids,
+    search_products,
+    update_product,
+    update_products,
+)
+from database import get_async_db, get_async_read_db
+from etag import etag_matches, not_modified, page_etag, product_etag
+from pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    decode_offset_cursor,
+    encode_offset_cursor,
+    split_page,
+)
+from replicas import cache_policy
+from schemas import (
+    MAX_BULK_ITEMS,
+    MAX_LOOKUP_IDS,
+    CategoriaBase,
+    ProductBulkDelete,
+    ProductBulkResult,
+    ProductBulkUpdate,
+    ProductCreate,
+    ProductLookup,
+    ProductLookupResult,
+    ProductPage,
+    ProductResponse,
+    ProductStats,
+    ProductUpdate,
+)
+from serialization import (
+    dumps,
+    parse_fields,
+    product_page_response,
+    product_response,
+)
+
+router = APIRouter()
+
+
+@router.post("/products/", response_model=ProductResponse)
+async def create_product_route(
+    product: ProductCreate, db: AsyncSession = Depends(get_async_db)
+) -> ProductResponse:
+    """
+    Cria um novo produto no banco de dados.
+
+    Args:
+        product (ProductCreate): Dados do produto a ser criado.
+        db (AsyncSession, optional): Sessão assíncrona do banco de dados. Defaults to Depends(get_async_db).
+
+    Returns:
+        ProductResponse: Objeto representando o produto criado.
+    """
+    return await create_product(db=db, product=product)
+
+
+@router.get("/products/", response_model=ProductPage)
+async def read_all_products(
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    categoria: Optional[CategoriaBase] = None,
+    price_min: Optional[float] = Query(None, ge=0),
+    price_max: Optional[float] = Query(None, ge=0),
+    email_fornecedor: Optional[str] = None,
+    sort: Literal[
+        "id", "-id", "name", "-name", "price", "-price", "created_at", "-created_at"
+    ] = "id",
+    fields: Optional[str] = Query(
+        None, description="Campos retornados, separados por vírgula, como id,name,price"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> ProductPage:
+    """
+    Retorna uma página de produtos, com filtros e paginação por cursor.
+
+    Args:
+        response (Response): Resposta usada para definir o cabeçalho `ETag`.
+        limit (int): Quantidade máxima de produtos na página (entre 1 e 500).
+        cursor (Optional[str]): Cursor opaco retornado em `next_cursor` pela página anterior.
+        categoria (Optional[CategoriaBase]): Filtra os produtos pela categoria.
+        price_min (Optional[float]): Filtra os produtos com preço maior ou igual a este valor.
+        price_max (Optional[float]): Filtra os produtos com preço menor ou igual a este valor.
+        email_fornecedor (Optional[str]): Filtra os produtos pelo e-mail do fornecedor.
+        sort (str): O campo de ordenação, precedido de "-" para ordem decrescente; o cursor
+            só vale para a ordenação em que foi emitido. Defaults to "id".
+        fields (Optional[str]): Os campos de cada produto na resposta, separados por vírgula;
+            apenas esses campos são lidos do banco. Se não informado, todos os campos.
+        if_none_match (Optional[str]): ETag da página que o cliente já possui.
+        db (AsyncSession, optional): Sessão assíncrona de leitura, em uma réplica ou no primário. Defaults to Depends(get_async_read_db).
+
+    Returns:
+        ProductPage: Os produtos da página e o cursor para a próxima página, ou
+            `304 Not Modified` se a página não mudou desde a ETag informada.
+
+    Raises:
+        HTTPException: Se o cursor ou os campos informados forem inválidos.
+    """
+    try:
+        after_id, after_value = decode_cursor(cursor, sort) if cursor else (None, None)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    try:
+        selected = parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    products = await get_products(
+        db,
+        limit=limit + 1,
+        after_id=after_id,
+        categoria=categoria.value if categoria else None,
+        price_min=price_min,
+        price_max=price_max,
+        email_fornecedor=email_fornecedor,
+        as_rows=JSON_FAST_PATH or selected is not None,
+        sort=sort,
+        after_value=after_value,
+        columns=selected,
+    )
+    products, next_cursor = split_page(products, limit, sort)
+    etag = page_etag(products, next_cursor, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    if JSON_FAST_PATH or selected is not None:
+        return product_page_response(products, next_cursor, etag, selected)
+    response.headers["ETag"] = etag
+    return ProductPage(items=products, next_cursor=next_cursor)
+
+
+@router.get("/products/search", response_model=ProductPage)
+async def search_products_route(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db),
+) -> ProductPage:
+    """
+    Busca produtos por nome e descrição, ordenados por relevância.
+
+    No PostgreSQL a busca usa o índice de texto completo (português) e tolera erros de
+    digitação no nome do produto.
+
+    Args:
+        q (str): O texto buscado.
+        limit (int): Quantidade máxima de produtos na página (entre 1 e 100).
+        cursor (Optional[str]): Cursor opaco retornado em `next_cursor` pela página anterior.
+        db (AsyncSession, optional): Sessão assíncrona de leitura, em uma réplica ou no primário. Defaults to Depends(get_async_read_db).
+
+    Returns:
+        ProductPage: Os produtos da página e o cursor para a próxima página.
+
+    Raises:
+        HTTPException: Se o cursor informado for inválido.
+    """
+    try:
+        offset = decode_offset_cursor(cursor) if cursor else 0
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    products = await search_products(db, q=q, limit=limit + 1, offset=offset)
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        next_cursor = encode_offset_cursor(offset + limit)
+    return ProductPage(items=products, next_cursor=next_cursor)
+
+
+@router.get("/products/stats", response_model=ProductStats)
+async def read_product_stats(
+    bucket: Literal["hour", "day", "week", "month"] = "day",
+    fornecedores: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> ProductStats:
+    """
+    Retorna as estatísticas agregadas do catálogo de produtos.
+
+    Contagem e preço mínimo, médio, máximo e percentis por categoria e por fornecedor, além do
+    histograma de criação dos produtos, calculados no banco de dados. O resultado fica no cache
+    por `STATS_CACHE_TTL` segundos.
+
+    Args:
+        bucket (Literal["hour", "day", "week", "month"]): A largura dos intervalos do histograma.
+        fornecedores (int): A quantidade máxima de fornecedores, dos que têm mais produtos (entre 1 e 100).
+        db (AsyncSession, optional): Sessão assíncrona de leitura, em uma réplica ou no primário. Defaults to Depends(get_async_read_db).
+
+    Returns:
+        ProductStats: As estatísticas agregadas dos produtos.
+    """
+    key = f"{bucket}:{fornecedores}"
+    stats = await call_cache(stats_cache.get, key)
+    if stats is None:
+        stats = ProductStats.model_validate(
+            await get_product_stats(db, bucket=bucket, fornecedores=fornecedores)
+        ).model_dump(mode="json")
+        await call_cache(stats_cache.set, key, stats)
+    return stats
+
+
+@router.post("/products/bulk", response_model=ProductBulkResult)
+async def create_products_bulk(
+    items: List[Dict[str, Any]] = Body(..., max_length=MAX_BULK_ITEMS),
+    db: AsyncSession = Depends(get_async_db),
+) -> ProductBulkResult:
+    """
+    Cria vários produtos em uma única transação.
+
+    Cada item é validado individualmente: os inválidos são reportados em `errors` e os
+    válidos são inseridos juntos, sem que um item inválido aborte o lote inteiro.
+
+    Args:
+        items (List[Dict[str, Any]]): Os dados dos produtos a serem criados.
+        db (AsyncSession, optional): Sessão assíncrona do banco de dados. Defaults to Depends(get_async_db).
+
+    Returns:
+        ProductBulkResult: Os produtos criados e os erros por item.
+    """
+    valid, errors = validate_bulk_items(ProductCreate, items)
+    created = await create_products(db, [product for _, product in valid])
+    return ProductBulkResult(items=created, errors=errors)
+
+
+@router.patch("/products/bulk", response_model=ProductBulkResult)
+async def update_products_bulk(
+    items: List[Dict[str, Any]] = Body(..., max_length=MAX_BULK_ITEMS),
+    db: AsyncSession = Depends(get_async_db),
+) -> ProductBulkResult:
+    """
+    Atualiza vários produtos existentes em uma única transação.
+
+    Cada item deve conter o `id` do produto e apenas os campos a serem alterados. Itens
+    inválidos, IDs repetidos, produtos inexistentes e versões desatualizadas são
+    reportados em `errors`.
+
+    Args:
+        items (List[Dict[str, Any]]): Os dados dos produtos a serem atualizados.
+        db (AsyncSession, optional): Sessão assíncrona do banco de dados. Defaults to Depends(get_async_db).
+
+    Returns:
+        ProductBulkResult: Os produtos atualizados e os erros por item.
+
+    Raises:
+        HTTPException: Se algum produto for alterado por outra transação durante o lote (409).
+    """
+    valid, errors = validate_bulk_items(ProductBulkUpdate, items)
+    unique, positions, repeated = split_repeated_ids(valid)
+    try:
+        updated, conflicts = await update_products(db, unique)
+    except VersionConflictError:
+        raise HTTPException(status_code=409, detail="Version conflict")
+    errors += (
+        repeated
+        + version_conflict_errors(positions, conflicts)
+        + not_found_errors(positions, updated, ignore=conflicts)
+    )
+    errors.sort(key=lambda error: error.index)
+    return ProductBulkResult(items=updated, errors=errors)
+
+
+@router.delete("/products/bulk", response_model=ProductBulkResult)
+async def delete_products_bulk(
+    payload: ProductBulkDelete, db: AsyncSession = Depends(get_async_db)
+) -> ProductBulkResult:
+    """
+    Deleta vários produtos em uma única transação.
+
+    Args:
+        payload (ProductBulkDelete): Os IDs dos produtos a serem deletados.
+        db (AsyncSession, optional): Sessão assíncrona do banco de dados. Defaults to Depends(get_async_db).
+
+    Returns:
+        ProductBulkResult: Os produtos deletados e os IDs não encontrados em `errors`.
+    """
+    positions = {}
+    for index, product_id in enumerate(payload.ids):
+        positions.setdefault(product_id, index)
+    deleted = await delete_products(db, list(positions))
+    return ProductBulkResult(items=deleted, errors=not_found_errors(positions, deleted))
+
+
+@router.post("/products/lookup", response_model=ProductLookupResult)
+async def lookup_products_route(
+    payload: ProductLookup, db: AsyncSession = Depends(get_async_read_db)
+) -> ProductLookupResult:
+    """
+    Retorna vários produtos pelos seus IDs, em uma única requisição.
+
+    Substitui uma chamada de `GET /products/{product_id}` por item: os produtos presentes no
+    cache são lidos dele e os demais são buscados em uma única consulta ao banco.
+
+    Args:
+        payload (ProductLookup): Os IDs dos produtos, na ordem desejada na resposta.
+        db (AsyncSession, optional): Sessão assíncrona de leitura, em uma réplica ou no primário. Defaults to Depends(get_async_read_db).
+
+    Returns:
+        ProductLookupResult: Os produtos encontrados, na ordem dos IDs pedidos, e os IDs
+            não encontrados.
+    """
+    return await _lookup_products(db, payload.ids)
+
+
+@router.get("/products/lookup", response_model=ProductLookupResult)
+async def read_products_by_ids(
+    ids: str = Query(
+        ..., description="IDs dos produtos, separados por vírgula, como 1,2,3"
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> ProductLookupResult:
+    """
+    Retorna vários produtos pelos seus IDs, informados na query string.
+
+    Versão de `POST /products/lookup` para clientes que preferem requisições GET.
+
+    Args:
+        ids (str): Os IDs dos produtos, separados por vírgula, como "1,2,3".
+        db (AsyncSession, optional): Sessão assíncrona de leitura, em uma réplica ou no primário. Defaults to Depends(get_async_read_db).
+
+    Returns:
+        ProductLookupResult: Os produtos encontrados, na ordem dos IDs pedidos, e os IDs
+            não encontrados.
+
+    Raises:
+        HTTPException: 400, se os IDs forem inválidos ou mais numerosos que o limite.
+    """
+    try:
+        product_ids = parse_ids(ids, MAX_LOOKUP_IDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return await _lookup_products(db, product_ids)
+
+
+async def _lookup_products(db: AsyncSession, product_ids: List[int]) -> Any:
+    # mesma leitura de `cache.read_through_many`, com a consulta aguardada no event loop
+    use_cached, store = cache_policy(db)
+    unique_ids = list(dict.fromkeys(product_ids))
+    products = (
+        await call_cache(product_cache.get_many, unique_ids) if use_cached else {}
+    )
+    missing = [product_id for product_id in unique_ids if product_id not in products]
+    if missing:
+        loaded = {
+            row.id: serialize_product(row)
+            for row in await get_products_by_ids(db, missing)
+        }
+        if loaded and store:
+            await call_cache(product_cache.set_many, loaded)
+        products.update(loaded)
+    result = lookup_result(product_ids, products)
+    if JSON_FAST_PATH:
+        return Response(dumps(result), media_type="application/json")
+    return result
+
+
+@router.get("/products/{product_id}", response_model=ProductResponse)
+async def read_one_product(
+    product_id: int,
+    response: Response,
+    fields: Optional[str] = Query(
+        None, description="Campos retornados, separados por vírgula, como id,name,price"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> ProductResponse:
+    """
+    Retorna um produto específico com base no ID fornecido.
+
+    A leitura passa pelo cache de produtos, que é invalidado nas alterações e preenchido
+    apenas por leituras no primário (`replicas.cache_policy`). A projeção de `fields` é
+    aplicada ao produto do cache, que guarda todos os campos.
+
+    Args:
+        product_id (int): ID do produto a ser recuperado.
+        response (Response): Resposta usada para definir o cabeçalho `ETag`.
+        fields (Optional[str]): Os campos do produto na resposta, separados por vírgula; se
+            não informado, todos os campos.
+        if_none_match (Optional[str]): ETag do produto que o cliente já possui.
+        db (AsyncSession, optional): Sessão assíncrona de leitura, em uma réplica ou no primário. Defaults to Depends(get_async_read_db).
+
+    Returns:
+        ProductResponse: Objeto representando o produto recuperado, ou `304 Not Modified`
+            se o produto não mudou desde a ETag informada.
+
+    Raises:
+        HTTPException: Se o produto com o ID especificado não for encontrado ou se os campos
+            informados forem inválidos.
+    """
+    try:
+        selected = parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    use_cached, store = cache_policy(db)
+    product = await call_cache(product_cache.get, product_id) if use_cached else None
+    if product is None:
+        db_product = await get_product(db, product_id=product_id)
+        if db_product is None:
+            raise HTTPException(status_code=404, detail="Product not found")
+        product = serialize_product(db_product)
+        if store:
+            await call_cache(product_cache.set, product_id, product)
+    etag = product_etag(product["id"], product["version"], selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    if JSON_FAST_PATH or selected is not None:
+        return product_response(product, etag, selected)
+    response.headers["ETag"] = etag
+    return product
+
+
+@router.delete("/products/{product_id}", response_model=ProductResponse)
+async def detele_product(
+    product_id: int, db: AsyncSession = Depends(get_async_db)
+) -> ProductResponse:
+    """
+    Deleta um produto do banco de dados com base no ID fornecido.
+
+    Args:
+        product_id (int): ID do produto a ser deletado.
+        db (AsyncSession, optional): Sessão assíncrona do banco de dados. Defaults to Depends(get_async_db).
+
+    Returns:
+        ProductResponse: Objeto representando o produto deletado.
+
+    Raises:
+        HTTPException: Se o produto com o ID especificado não for encontrado.
+    """
+    db_product = await delete_product(db, product_id=product_id)
+    if db_product is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return db_product
+
+
+@router.put("/products/{product_id}", response_model=ProductResponse)
+async def update_product_route(
+    product_id: int, product: ProductUpdate, db: AsyncSession = Depends(get_async_db)
+) -> ProductResponse:
+    """
+    Atualiza um produto existente com base no ID fornecido.
+
+    Args:
+        product_id (int): ID do produto a ser atualizado.
+        product (ProductUpdate): Dados do produto a serem atualizados.
+        db (AsyncSession, optional): Sessão assíncrona do banco de dados. Defaults to Depends(get_async_db).
+
+    Returns:
+        ProductResponse: Objeto representando o produto atualizado.
+
+    Raises:
+        HTTPException: Se o produto com o ID especificado não for encontrado, ou se a
+            versão informada não for a versão atual do produto (409).
+    """
+    try:
+        db_product = await update_product(db=db, product_id=product_id, product=product)
+    except VersionConflictError:
+        raise HTTPException(status_code=409, detail="Version conflict")
+    if db_product is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return db_product
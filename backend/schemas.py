@@ -3,35 +3,23 @@ Este módulo define modelos Pydantic para produtos com categorias e informaçõe
 """
 
 from datetime import datetime
-from enum import Enum
-from typing import Optional
+from typing import Annotated, Any, Dict, List, Literal, Optional, Union
 
 from pydantic import (
     BaseModel,
     EmailStr,
+    Field,
     PositiveFloat,
     field_validator,
 )
 
+from categories import CategoriaBase, is_valid_category
 
-class CategoriaBase(Enum):
-    """
-    Uma enumeração que representa categorias disponíveis para produtos.
-
-    Valores da Enum:
+MAX_BULK_ITEMS = 5000
+MAX_LOOKUP_IDS = 1000
 
-    - categoria1: "Eletrônico".
-    - categoria2: "Eletrodoméstico".
-    - categoria3: "Móveis".
-    - categoria4: "Roupas".
-    - categoria5: "Calçados".
-    """
-
-    categoria1 = "Eletrônico"
-    categoria2 = "Eletrodoméstico"
-    categoria3 = "Móveis"
-    categoria4 = "Roupas"
-    categoria5 = "Calçados"
+# menor preço resultante de um reajuste em massa, para que nenhum produto fique com preço zero
+MIN_PRICE = 0.01
 
 
 class ProductBase(BaseModel):
@@ -57,7 +45,7 @@ class ProductBase(BaseModel):
 
     @field_validator("categoria")
     def check_categoria(cls, v):
-        if v in [item.value for item in CategoriaBase]:
+        if is_valid_category(v):
             return v
         raise ValueError("Categoria inválida")
 
@@ -80,15 +68,32 @@ class ProductResponse(ProductBase):
     Parameters:
         id (int): O identificador único do produto.
         created_at (datetime): Data e hora de criação do produto.
+        updated_at (Optional[datetime]): Data e hora da última alteração do produto.
+        version (int): Versão atual do produto, incrementada a cada alteração.
     """
 
     id: int
     created_at: datetime
+    updated_at: Optional[datetime] = None
+    version: int
 
     class Config:
         from_attributes = True
 
 
+class ProductPage(BaseModel):
+    """
+    Modelo Pydantic para uma página da listagem de produtos.
+
+    Parameters:
+        items (List[ProductResponse]): Os produtos da página atual.
+        next_cursor (Optional[str]): Cursor opaco para obter a próxima página, ou None se esta for a última.
+    """
+
+    items: List[ProductResponse]
+    next_cursor: Optional[str] = None
+
+
 class ProductUpdate(BaseModel):
     """
     Modelo Pydantic para atualização de informações de produtos existentes.
@@ -99,6 +104,8 @@ class ProductUpdate(BaseModel):
         price (Optional[PositiveFloat]): Preço atualizado do produto.
         categoria (Optional[CategoriaBase]): Categoria atualizada do produto.
         email_fornecedor (Optional[EmailStr]): Email do fornecedor atualizado do produto.
+        version (Optional[int]): Versão do produto que o cliente leu; se informada e diferente da
+            versão atual, a atualização é recusada com conflito.
 
     Methods:
         check_categoria(cls, v): Método validador que garante que o valor da categoria seja válido.
@@ -109,14 +116,261 @@ class ProductUpdate(BaseModel):
     price: Optional[PositiveFloat] = None
     categoria: Optional[CategoriaBase] = None
     email_fornecedor: Optional[EmailStr] = None
+    version: Optional[int] = None
 
     @field_validator("categoria")
     def check_categoria(cls, v):
         if v is None:
             return v
-        if v in [item.value for item in CategoriaBase]:
+        if is_valid_category(v):
             return v
         raise ValueError("Categoria inválida")
 
     class Config:
         use_enum_values = True
+
+
+class ProductBulkUpdate(ProductUpdate):
+    """
+    Modelo Pydantic para um item da atualização em lote, que herda de ProductUpdate.
+
+    Parameters:
+        id (int): O identificador do produto a ser atualizado.
+    """
+
+    id: int
+
+
+class ProductBulkDelete(BaseModel):
+    """
+    Modelo Pydantic para a deleção em lote de produtos.
+
+    Parameters:
+        ids (List[int]): Os identificadores dos produtos a serem deletados.
+    """
+
+    ids: List[int] = Field(max_length=MAX_BULK_ITEMS)
+
+
+class ProductLookup(BaseModel):
+    """
+    Modelo Pydantic para a consulta de vários produtos pelos seus IDs.
+
+    Parameters:
+        ids (List[int]): Os identificadores dos produtos, na ordem desejada na resposta.
+    """
+
+    ids: List[int] = Field(min_length=1, max_length=MAX_LOOKUP_IDS)
+
+
+class ProductLookupResult(BaseModel):
+    """
+    Modelo Pydantic para o resultado da consulta de vários produtos pelos seus IDs.
+
+    Parameters:
+        items (List[ProductResponse]): Os produtos encontrados, na ordem dos IDs pedidos.
+        missing (List[int]): Os IDs pedidos que não foram encontrados.
+    """
+
+    items: List[ProductResponse] = []
+    missing: List[int] = []
+
+
+class BulkItemError(BaseModel):
+    """
+    Modelo Pydantic para o erro de um item de uma operação em lote.
+
+    Parameters:
+        index (int): A posição do item no lote enviado.
+        id (Optional[int]): O identificador do produto, quando disponível.
+        detail (Any): A mensagem de erro ou a lista de erros de validação do item.
+    """
+
+    index: int
+    id: Optional[int] = None
+    detail: Any
+
+
+class ProductBulkResult(BaseModel):
+    """
+    Modelo Pydantic para o resultado de uma operação em lote.
+
+    Parameters:
+        items (List[ProductResponse]): Os produtos criados, atualizados ou deletados com sucesso.
+        errors (List[BulkItemError]): Os itens que não puderam ser processados e o motivo.
+    """
+
+    items: List[ProductResponse] = []
+    errors: List[BulkItemError] = []
+
+
+class PriceStats(BaseModel):
+    """
+    Modelo Pydantic para as estatísticas de preço de um conjunto de produtos.
+
+    Os percentis são calculados apenas no PostgreSQL e são None nos demais bancos.
+
+    Parameters:
+        count (int): A quantidade de produtos.
+        price_min (Optional[float]): O menor preço.
+        price_avg (Optional[float]): O preço médio.
+        price_max (Optional[float]): O maior preço.
+        price_p50 (Optional[float]): A mediana dos preços.
+        price_p90 (Optional[float]): O percentil 90 dos preços.
+        price_p99 (Optional[float]): O percentil 99 dos preços.
+    """
+
+    count: int
+    price_min: Optional[float] = None
+    price_avg: Optional[float] = None
+    price_max: Optional[float] = None
+    price_p50: Optional[float] = None
+    price_p90: Optional[float] = None
+    price_p99: Optional[float] = None
+
+
+class GroupStats(PriceStats):
+    """
+    Modelo Pydantic para as estatísticas de preço de um grupo, que herda de PriceStats.
+
+    Parameters:
+        key (Optional[str]): O valor que identifica o grupo, como a categoria ou o e-mail do fornecedor.
+    """
+
+    key: Optional[str] = None
+
+
+class HistogramBucket(BaseModel):
+    """
+    Modelo Pydantic para um intervalo do histograma de criação de produtos.
+
+    Parameters:
+        start (datetime): O início do intervalo.
+        count (int): A quantidade de produtos criados no intervalo.
+    """
+
+    start: datetime
+    count: int
+
+
+class ProductStats(BaseModel):
+    """
+    Modelo Pydantic para as estatísticas agregadas do catálogo de produtos.
+
+    Parameters:
+        total (PriceStats): As estatísticas de todos os produtos.
+        by_categoria (List[GroupStats]): As estatísticas de cada categoria.
+        by_fornecedor (List[GroupStats]): As estatísticas dos fornecedores com mais produtos.
+        bucket (str): A largura dos intervalos do histograma ("hour", "day", "week" ou "month").
+        created_histogram (List[HistogramBucket]): A quantidade de produtos criados por intervalo.
+    """
+
+    total: PriceStats
+    by_categoria: List[GroupStats]
+    by_fornecedor: List[GroupStats]
+    bucket: str
+    created_histogram: List[HistogramBucket]
+
+
+class PriceChangeParams(BaseModel):
+    """
+    Modelo Pydantic para os parâmetros da alteração de preços em massa.
+
+    Parameters:
+        percent (float): O percentual de reajuste, negativo para redução (maior que -100); os
+            preços reduzidos nunca ficam abaixo de `MIN_PRICE`.
+        categoria (Optional[CategoriaBase]): Altera apenas os produtos desta categoria.
+        email_fornecedor (Optional[EmailStr]): Altera apenas os produtos deste fornecedor.
+        batch_size (int): A quantidade de produtos alterados por transação.
+    """
+
+    percent: float = Field(gt=-100, le=1000)
+    categoria: Optional[CategoriaBase] = None
+    email_fornecedor: Optional[EmailStr] = None
+    batch_size: int = Field(1000, ge=1, le=10000)
+
+
+class ExportParams(BaseModel):
+    """
+    Modelo Pydantic para os parâmetros da exportação do catálogo para um arquivo.
+
+    Parameters:
+        format (Literal["ndjson", "csv"]): O formato do arquivo.
+        batch_size (int): A quantidade de linhas lidas do banco a cada lote.
+    """
+
+    format: Literal["ndjson", "csv"] = "ndjson"
+    batch_size: int = Field(1000, ge=1, le=10000)
+
+
+class ReindexParams(BaseModel):
+    """
+    Modelo Pydantic para os parâmetros da reconstrução dos índices de produtos (sem campos).
+    """
+
+
+class PriceChangeJob(BaseModel):
+    """
+    Modelo Pydantic para enfileirar uma alteração de preços em massa.
+    """
+
+    kind: Literal["price_change"]
+    params: PriceChangeParams
+
+
+class ExportJob(BaseModel):
+    """
+    Modelo Pydantic para enfileirar uma exportação do catálogo para um arquivo.
+    """
+
+    kind: Literal["export"]
+    params: ExportParams = ExportParams()
+
+
+class ReindexJob(BaseModel):
+    """
+    Modelo Pydantic para enfileirar a reconstrução dos índices de produtos.
+    """
+
+    kind: Literal["reindex"]
+    params: ReindexParams = ReindexParams()
+
+
+# o campo `kind` escolhe o modelo, e portanto a validação, dos parâmetros
+JobCreate = Annotated[
+    Union[PriceChangeJob, ExportJob, ReindexJob], Field(discriminator="kind")
+]
+
+
+class JobResponse(BaseModel):
+    """
+    Modelo Pydantic para responder com a situação de uma tarefa em segundo plano.
+
+    Parameters:
+        id (int): O identificador único da tarefa.
+        kind (str): O tipo da tarefa.
+        params (Dict[str, Any]): Os parâmetros da tarefa.
+        status (str): A situação da tarefa: "queued", "running", "done" ou "failed".
+        processed (int): A quantidade de itens já processados.
+        total (Optional[int]): A quantidade total de itens, quando conhecida.
+        result (Optional[Dict[str, Any]]): O resultado da tarefa concluída.
+        error (Optional[str]): A mensagem de erro da tarefa que falhou.
+        created_at (datetime): Data e hora em que a tarefa foi enfileirada.
+        started_at (Optional[datetime]): Data e hora em que um worker iniciou a tarefa.
+        finished_at (Optional[datetime]): Data e hora em que a tarefa terminou.
+    """
+
+    id: int
+    kind: str
+    params: Dict[str, Any]
+    status: str
+    processed: int
+    total: Optional[int] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
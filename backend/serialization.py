@@ -0,0 +1,117 @@
+"""
+Módulo de serialização rápida das respostas JSON de produtos.
+
+Quando `JSON_FAST_PATH` está habilitado, as rotas de leitura montam o corpo da resposta
+diretamente com orjson: a listagem serializa as linhas retornadas pelo banco (sem criar
+objetos `ProductModel` nem `ProductResponse`) e a leitura de um produto serializa o
+dicionário já validado que está no cache. O formato do JSON é o mesmo de `ProductResponse`.
+
+As respostas projetadas (parâmetro `fields`) também são montadas aqui, com apenas os campos
+pedidos, independentemente de `JSON_FAST_PATH`.
+
+Methods:
+    dumps(content): Serializa o conteúdo em JSON com orjson.
+    parse_fields(value): Converte o parâmetro `fields` na lista de campos da projeção.
+    product_response(product, etag, fields): Monta a resposta de um produto já serializado.
+    product_page_response(rows, next_cursor, etag, fields): Monta a resposta de uma página de produtos.
+"""
+
+from typing import Any, List, Optional, Sequence
+
+import orjson
+from fastapi import Response
+from sqlalchemy import Row
+
+from schemas import ProductResponse
+
+# datas em UTC com o sufixo "Z", como o Pydantic
+_OPTIONS = orjson.OPT_UTC_Z
+
+# campos aceitos na projeção, na ordem de `ProductResponse`
+PRODUCT_FIELDS = tuple(ProductResponse.model_fields)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serializa o conteúdo em JSON com orjson.
+
+    Args:
+        content (Any): O conteúdo a ser serializado; `datetime` é convertido para ISO 8601.
+
+    Returns:
+        bytes: O JSON codificado em UTF-8.
+    """
+    return orjson.dumps(content, option=_OPTIONS)
+
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """
+    Converte o parâmetro `fields` na lista de campos da projeção.
+
+    Args:
+        value (Optional[str]): Os nomes dos campos de `ProductResponse`, separados por vírgula.
+
+    Returns:
+        Optional[List[str]]: Os campos pedidos, sem repetições e na ordem informada, ou None
+            se o parâmetro não foi informado (todos os campos).
+
+    Raises:
+        ValueError: Se algum campo não existir em `ProductResponse`.
+    """
+    if not value:
+        return None
+    fields = list(dict.fromkeys(filter(None, map(str.strip, value.split(",")))))
+    unknown = [field for field in fields if field not in PRODUCT_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown fields: {', '.join(unknown) or value}")
+    return fields
+
+
+def product_response(
+    product: dict, etag: str, fields: Optional[List[str]] = None
+) -> Response:
+    """
+    Monta a resposta de um produto já serializado.
+
+    Args:
+        product (dict): O produto no formato de `ProductResponse`, como armazenado no cache.
+        etag (str): A ETag do produto.
+        fields (Optional[List[str]]): Os campos da resposta; se None, todos.
+
+    Returns:
+        Response: A resposta JSON com o cabeçalho `ETag`.
+    """
+    if fields is not None:
+        product = {field: product[field] for field in fields}
+    return Response(
+        dumps(product), media_type="application/json", headers={"ETag": etag}
+    )
+
+
+def product_page_response(
+    rows: Sequence[Row],
+    next_cursor: Optional[str],
+    etag: str,
+    fields: Optional[List[str]] = None,
+) -> Response:
+    """
+    Monta a resposta de uma página de produtos a partir das linhas do banco de dados.
+
+    Args:
+        rows (Sequence[Row]): As linhas da página, com as colunas de `ProductResponse`.
+        next_cursor (Optional[str]): O cursor da próxima página.
+        etag (str): A ETag da página.
+        fields (Optional[List[str]]): Os campos de cada produto; se None, todas as colunas
+            das linhas.
+
+    Returns:
+        Response: A resposta JSON no formato de `ProductPage`, com o cabeçalho `ETag`.
+    """
+    if fields is None:
+        items = [row._asdict() for row in rows]
+    else:
+        items = [{field: row._mapping[field] for field in fields} for row in rows]
+    content = {"items": items, "next_cursor": next_cursor}
+    return Response(
+        dumps(content), media_type="application/json", headers={"ETag": etag}
+    )
@@ -0,0 +1,81 @@
+"""
+Servidor de produção do backend.
+
+Inicia o Uvicorn com `SERVER_WORKERS` processos, cada um com o seu próprio event loop
+(uvloop) e parser HTTP (httptools), de modo que o backend usa vários núcleos. O processo
+principal apenas supervisiona os processos do servidor, reiniciando os que terminam. As
+migrações não são aplicadas aqui nem na importação da aplicação: devem ser aplicadas uma
+única vez antes (`alembic upgrade head`), como no `Dockerfile`.
+
+Com mais de um processo, as métricas do Prometheus são gravadas em `PROMETHEUS_MULTIPROC_DIR`
+e somadas entre os processos na coleta.
+
+Uso:
+    python -m serve
+
+Methods:
+    prepare_metrics_dir(workers): Prepara o diretório das métricas compartilhadas entre processos.
+    main: Inicia o servidor.
+"""
+
+import os
+import shutil
+import tempfile
+
+import uvicorn
+
+from config import (
+    SERVER_BACKLOG,
+    SERVER_GRACEFUL_TIMEOUT,
+    SERVER_HOST,
+    SERVER_KEEPALIVE,
+    SERVER_MAX_REQUESTS,
+    SERVER_PORT,
+    SERVER_WORKERS,
+)
+
+
+def prepare_metrics_dir(workers: int) -> None:
+    """
+    Prepara o diretório das métricas compartilhadas entre os processos do servidor.
+
+    Sem `PROMETHEUS_MULTIPROC_DIR` definido, um diretório temporário é criado. O diretório é
+    esvaziado, pois arquivos de uma execução anterior seriam somados às métricas atuais. A
+    variável precisa estar definida antes de os processos importarem o `prometheus_client`.
+
+    Args:
+        workers (int): A quantidade de processos do servidor; com um só, nada é feito.
+    """
+    if workers <= 1:
+        return
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path is None:
+        path = os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(
+            prefix="prometheus-"
+        )
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def main() -> None:
+    """
+    Inicia o servidor.
+    """
+    prepare_metrics_dir(SERVER_WORKERS)
+    uvicorn.run(
+        "main:app",
+        host=SERVER_HOST,
+        port=SERVER_PORT,
+        workers=SERVER_WORKERS,
+        loop="uvloop",
+        http="httptools",
+        backlog=SERVER_BACKLOG,
+        timeout_keep_alive=SERVER_KEEPALIVE,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT,
+        limit_max_requests=SERVER_MAX_REQUESTS or None,
+        access_log=False,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Worker das tarefas em segundo plano.
+
+Inicia `JOBS_WORKERS` processos, cada um com o seu próprio engine e pool de conexões, que
+consomem a fila da tabela `jobs`. Por serem processos, e não threads, tarefas pesadas em
+CPU (como a serialização de uma exportação) usam vários núcleos. Os processos são iniciados
+com `spawn`, para não herdar as conexões abertas do processo principal.
+
+Uso:
+    python -m worker --processes 4
+
+Methods:
+    work(stop, poll_interval, stale_after): Laço de um processo do worker.
+    main: Inicia os processos do worker e aguarda o sinal de término.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import signal
+import time
+from multiprocessing.synchronize import Event
+
+from config import (
+    CHANGES_RETENTION_HOURS,
+    JOBS_POLL_INTERVAL,
+    JOBS_STALE_AFTER,
+    JOBS_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+# segundos entre as remoções dos eventos de alteração mais antigos que a retenção
+PURGE_INTERVAL = 600.0
+
+
+def work(stop: Event, poll_interval: float, stale_after: float) -> None:
+    """
+    Laço de um processo do worker: reserva e executa tarefas até `stop` ser sinalizado.
+
+    A cada `PURGE_INTERVAL` segundos, também remove os eventos do feed de alterações de
+    produtos mais antigos que `CHANGES_RETENTION_HOURS`.
+
+    Args:
+        stop (Event): Sinaliza que o processo deve terminar após a tarefa atual.
+        poll_interval (float): Segundos de espera entre consultas quando a fila está vazia.
+        stale_after (float): Segundos sem sinal de vida após os quais uma tarefa em execução
+            é considerada interrompida.
+    """
+    # o processo principal trata SIGINT/SIGTERM e avisa os filhos por `stop`
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    from changes import purge_changes
+    from database import SessionLocal
+    from jobs import claim_job, fail_stale_jobs, run_job
+
+    next_purge = time.monotonic()
+    while not stop.is_set():
+        with SessionLocal() as db:
+            if fail_stale_jobs(db, stale_after):
+                logger.warning("Tarefas interrompidas marcadas como falhas")
+            if time.monotonic() >= next_purge:
+                purged = purge_changes(db, CHANGES_RETENTION_HOURS)
+                if purged:
+                    logger.info("%s eventos de alteração removidos", purged)
+                next_purge = time.monotonic() + PURGE_INTERVAL
+            job = claim_job(db)
+        if job is None:
+            stop.wait(poll_interval)
+        else:
+            run_job(job)
+
+
+def main() -> None:
+    """
+    Inicia os processos do worker e aguarda o sinal de término.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--processes", type=int, default=JOBS_WORKERS)
+    parser.add_argument("--poll-interval", type=float, default=JOBS_POLL_INTERVAL)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    context = multiprocessing.get_context("spawn")
+    stop = context.Event()
+    # o tratador apenas marca o término: sinalizar `stop` dentro dele pode travar se o
+    # sinal chegar enquanto o processo principal segura o lock do próprio evento
+    terminated = []
+    signal.signal(signal.SIGTERM, lambda *_: terminated.append(True))
+    processes = [
+        context.Process(
+            target=work,
+            args=(stop, args.poll_interval, JOBS_STALE_AFTER),
+            name=f"worker-{index}",
+        )
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    logger.info("%s processos do worker iniciados", len(processes))
+    try:
+        while not terminated and any(process.is_alive() for process in processes):
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    stop.set()
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,40 @@ para adicionar, visualizar, atualizar e deletar produtos em um backend.
 """
 
 import pandas as pd
+import requests
 import streamlit as st
+from importacao import importar_produtos
 from produto import (
     adicionar_produto,
     atualizar_produto,
+    carregar_categorias,
+    carregar_estatisticas,
+    carregar_produto,
+    carregar_produtos,
     deletar_produto,
-    obter_detalhes_do_produto,
     show_response_message,
-    visualizar_produtos,
 )
 
+COLUNAS = [
+    "id",
+    "name",
+    "description",
+    "price",
+    "categoria",
+    "email_fornecedor",
+    "created_at",
+]
+ORDENACOES = {
+    "id": "ID",
+    "-id": "ID (decrescente)",
+    "name": "Nome",
+    "-name": "Nome (decrescente)",
+    "price": "Preço",
+    "-price": "Preço (decrescente)",
+    "created_at": "Criação",
+    "-created_at": "Criação (decrescente)",
+}
+
 
 def configurar_pagina():
     """
@@ -33,13 +57,18 @@ def adicionar_novo_produto():
     Ao enviar o formulário, chama a função `adicionar_produto` e exibe uma mensagem de resposta.
     """
     with st.expander("Adicionar um Novo Produto"):
+        try:
+            categorias = carregar_categorias()
+        except requests.HTTPError as exc:
+            show_response_message(exc.response)
+            return
         with st.form("new_product"):
             name = st.text_input("Nome do Produto")
             description = st.text_area("Descrição do Produto")
             price = st.number_input("Preço", min_value=0.01, format="%f")
             categoria = st.selectbox(
                 "Categoria",
-                ["Eletrônico", "Eletrodoméstico", "Móveis", "Roupas", "Calçados"],
+                categorias,
             )
             email_fornecedor = st.text_input("Email do Fornecedor")
             submit_button = st.form_submit_button("Adicionar Produto")
@@ -51,46 +80,156 @@ def adicionar_novo_produto():
                 show_response_message(response)
 
 
+def importar_planilha():
+    """
+    Exibe um formulário para importar produtos de uma planilha CSV ou Excel.
+    A planilha deve ter as colunas name, price, categoria e email_fornecedor (description
+    é opcional). As linhas são validadas e enviadas ao backend em lotes paralelos, com uma
+    barra de progresso, e as linhas rejeitadas são listadas ao final com o motivo.
+    """
+    with st.expander("Importar Produtos de uma Planilha"):
+        with st.form("import_products"):
+            arquivo = st.file_uploader("Planilha", type=["csv", "xlsx"])
+            col_lote, col_concorrencia = st.columns(2)
+            tamanho_lote = col_lote.number_input(
+                "Produtos por requisição", min_value=1, max_value=5000, value=500
+            )
+            concorrencia = col_concorrencia.number_input(
+                "Requisições simultâneas", min_value=1, max_value=8, value=4
+            )
+            submit_button = st.form_submit_button("Importar Produtos")
+
+        if submit_button and arquivo is not None:
+            progresso = st.progress(0.0, text="Importando...")
+
+            def ao_progredir(processadas: int, total: int) -> None:
+                progresso.progress(
+                    processadas / total if total else 0.0,
+                    text=f"{processadas} linhas processadas",
+                )
+
+            try:
+                criados, erros = importar_produtos(
+                    arquivo,
+                    arquivo.name,
+                    int(tamanho_lote),
+                    int(concorrencia),
+                    ao_progredir,
+                )
+            except requests.HTTPError as exc:
+                show_response_message(exc.response)
+                return
+            progresso.progress(1.0, text="Importação concluída")
+            st.success(f"{criados} produtos importados")
+            if erros:
+                st.error(f"{len(erros)} linhas rejeitadas")
+                relatorio = pd.DataFrame(erros)
+                st.dataframe(relatorio, hide_index=True, use_container_width=True)
+                st.download_button(
+                    "Baixar relatório de erros",
+                    relatorio.to_csv(index=False),
+                    file_name="erros_importacao.csv",
+                    mime="text/csv",
+                )
+
+
 def visualizar_todos_produtos():
     """
-    Exibe todos os produtos em um formato tabular.
-    Ao clicar no botão "Exibir Todos os Produtos", chama a função `visualizar_produtos`.
-    Se a resposta for bem-sucedida, converte a resposta em um DataFrame do Pandas e a exibe.
+    Exibe os produtos em uma grade paginada, ordenável e com seleção de colunas.
+    As colunas selecionadas são pedidas ao backend em `fields`, que envia apenas esses campos.
+    Busca apenas a página visível pelo cursor do backend e guarda na sessão os cursores
+    das páginas já visitadas, para voltar sem refazer a paginação. Após exibir a grade,
+    busca antecipadamente a próxima página, que fica no cache de `carregar_produtos`.
     """
     with st.expander("Visualizar Produtos"):
-        if st.button("Exibir Todos os Produtos"):
-            response = visualizar_produtos()
-            if response.status_code == 200:
-                product = response.json()
-                df = pd.DataFrame(product)
-                df = df[
-                    [
-                        "id",
-                        "name",
-                        "description",
-                        "price",
-                        "categoria",
-                        "email_fornecedor",
-                        "created_at",
-                    ]
-                ]
-                st.write(df.to_html(index=False), unsafe_allow_html=True)
+        col_ordem, col_tamanho = st.columns(2)
+        sort = col_ordem.selectbox(
+            "Ordenar por", list(ORDENACOES), format_func=ORDENACOES.get
+        )
+        limit = col_tamanho.selectbox("Produtos por página", [25, 50, 100, 250])
+        colunas = st.multiselect("Colunas", COLUNAS, default=COLUNAS, key="colunas")
+
+        # os cursores valem apenas para a ordenação e o tamanho em que foram emitidos
+        if st.session_state.get("consulta_produtos") != (sort, limit):
+            st.session_state["consulta_produtos"] = (sort, limit)
+            st.session_state["cursores_produtos"] = [None]
+        cursores = st.session_state["cursores_produtos"]
+        # na ordem de COLUNAS, para que a mesma seleção reaproveite o cache
+        campos = tuple(coluna for coluna in COLUNAS if coluna in colunas) or None
+
+        try:
+            page = carregar_produtos(cursores[-1], limit, sort, campos)
+        except requests.HTTPError as exc:
+            show_response_message(exc.response)
+            return
+
+        df = pd.DataFrame(page["items"], columns=COLUNAS)
+        st.dataframe(df[colunas or COLUNAS], hide_index=True, use_container_width=True)
+
+        col_anterior, col_pagina, col_proxima = st.columns([1, 2, 1])
+        col_pagina.caption(f"Página {len(cursores)}")
+        if col_anterior.button("Anterior", disabled=len(cursores) == 1):
+            cursores.pop()
+            st.rerun()
+        if col_proxima.button("Próxima", disabled=page["next_cursor"] is None):
+            cursores.append(page["next_cursor"])
+            st.rerun()
+
+        if page["next_cursor"] is not None:
+            try:
+                carregar_produtos(page["next_cursor"], limit, sort, campos)
+            except requests.HTTPError:
+                pass
+
+
+def visualizar_estatisticas():
+    """
+    Exibe as estatísticas agregadas dos produtos, calculadas pelo backend.
+    Mostra a quantidade e os preços por categoria e por fornecedor, e o histograma de criação
+    dos produtos, sem baixar a lista completa de produtos.
+    """
+    with st.expander("Estatísticas dos Produtos"):
+        bucket = st.selectbox(
+            "Intervalo do histograma",
+            ["day", "week", "month", "hour"],
+            format_func={
+                "hour": "Hora",
+                "day": "Dia",
+                "week": "Semana",
+                "month": "Mês",
+            }.get,
+        )
+        if st.button("Exibir Estatísticas"):
+            try:
+                stats = carregar_estatisticas(bucket)
+            except requests.HTTPError as exc:
+                show_response_message(exc.response)
             else:
-                show_response_message(response)
+                st.metric("Total de produtos", stats["total"]["count"])
+                st.subheader("Por categoria")
+                st.dataframe(pd.DataFrame(stats["by_categoria"]), hide_index=True)
+                st.subheader("Por fornecedor")
+                st.dataframe(pd.DataFrame(stats["by_fornecedor"]), hide_index=True)
+                st.subheader("Produtos criados")
+                histogram = pd.DataFrame(stats["created_histogram"])
+                if not histogram.empty:
+                    st.bar_chart(histogram, x="start", y="count")
 
 
 def obter_detalhes_produto():
     """
     Exibe detalhes de um produto específico baseado no ID fornecido.
-    Coleta o ID do produto do usuário e chama a função `obter_detalhes_do_produto`.
+    Coleta o ID do produto do usuário e chama a função `carregar_produto`.
     Se a resposta for bem-sucedida, converte a resposta em um DataFrame do Pandas e a exibe.
     """
     with st.expander("Obter Detalhes de um Produto"):
         get_id = st.number_input("ID do Produto", min_value=1, format="%d")
         if st.button("Buscar Produto"):
-            response = obter_detalhes_do_produto(get_id)
-            if response.status_code == 200:
-                product = response.json()
+            try:
+                product = carregar_produto(get_id)
+            except requests.HTTPError as exc:
+                show_response_message(exc.response)
+            else:
                 df = pd.DataFrame([product])
                 df = df[
                     [
@@ -104,8 +243,6 @@ def obter_detalhes_produto():
                     ]
                 ]
                 st.write(df.to_html(index=False), unsafe_allow_html=True)
-            else:
-                show_response_message(response)
 
 
 def deletar_produto_funcao():
@@ -130,6 +267,11 @@ def atualizar_produto_funcao():
     Ao enviar o formulário, chama a função `atualizar_produto` com os dados fornecidos e exibe uma mensagem de resposta.
     """
     with st.expander("Atualizar Produto"):
+        try:
+            categorias = carregar_categorias()
+        except requests.HTTPError as exc:
+            show_response_message(exc.response)
+            return
         with st.form("update_product"):
             update_id = st.number_input("ID do Produto", min_value=1, format="%d")
             new_name = st.text_input("Novo Nome do Produto")
@@ -141,7 +283,7 @@ def atualizar_produto_funcao():
             )
             new_categoria = st.selectbox(
                 "Nova Categoria",
-                ["Eletrônico", "Eletrodoméstico", "Móveis", "Roupas", "Calçados"],
+                categorias,
             )
             new_email = st.text_input("Novo Email do Fornecedor")
 
@@ -174,7 +316,9 @@ def main():
     """
     configurar_pagina()
     adicionar_novo_produto()
+    importar_planilha()
     visualizar_todos_produtos()
+    visualizar_estatisticas()
     obter_detalhes_produto()
     deletar_produto_funcao()
     atualizar_produto_funcao()
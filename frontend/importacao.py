@@ -0,0 +1,275 @@
+"""
+Importa produtos em lote a partir de planilhas CSV ou Excel.
+
+A planilha é lida em blocos com o pandas, cada bloco é validado localmente (colunas,
+nome, preço, categoria e e-mail) e as linhas válidas são enviadas a `POST /products/bulk`
+em lotes, com várias requisições em paralelo. Os erros locais e os erros devolvidos pelo
+backend são reunidos em um relatório com o número da linha na planilha. Um lote recusado
+com 429 (limite de taxa) ou 503 (servidor sobrecarregado) não chegou a ser processado e é
+reenviado após o tempo indicado em `Retry-After`.
+
+Methods:
+    ler_planilha(arquivo, nome, tamanho_bloco): Lê a planilha em blocos de linhas.
+
+    contar_linhas(arquivo, nome): Estima a quantidade de linhas de dados da planilha.
+
+    validar_bloco(bloco, categorias): Valida um bloco de linhas da planilha.
+
+    enviar_lote(produtos, cliente): Envia um lote, reenviando-o enquanto o backend o recusar
+        por limite de taxa ou sobrecarga.
+
+    importar_produtos(arquivo, nome, tamanho_lote, concorrencia, ao_progredir): Importa os
+        produtos da planilha, enviando os lotes ao backend em paralelo.
+"""
+
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import IO, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import requests
+from produto import (
+    ClienteAPI,
+    adicionar_produtos,
+    carregar_categorias,
+    limpar_cache,
+    obter_cliente,
+)
+
+COLUNAS_OBRIGATORIAS = ["name", "price", "categoria", "email_fornecedor"]
+COLUNAS = COLUNAS_OBRIGATORIAS + ["description"]
+EMAIL = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+# a primeira linha da planilha é o cabeçalho e o índice do pandas começa em 0
+PRIMEIRA_LINHA = 2
+# respostas de lotes recusados antes do processamento, que podem ser reenviados
+STATUS_REENVIO = frozenset({429, 503})
+MAX_REENVIOS = 8
+MAX_ESPERA = 30.0
+
+
+def ler_planilha(
+    arquivo: IO[bytes], nome: str, tamanho_bloco: int
+) -> Iterator[pd.DataFrame]:
+    """
+    Lê a planilha em blocos de linhas.
+
+    Arquivos CSV são lidos de forma incremental; arquivos Excel são lidos de uma vez,
+    pois o formato não permite leitura parcial, e divididos em blocos.
+
+    Args:
+        arquivo (IO[bytes]): O conteúdo da planilha.
+        nome (str): O nome do arquivo, cuja extensão define o formato.
+        tamanho_bloco (int): A quantidade de linhas por bloco.
+
+    Yields:
+        pd.DataFrame: Os blocos da planilha, com o índice contínuo entre os blocos.
+    """
+    if nome.lower().endswith((".xlsx", ".xls")):
+        planilha = pd.read_excel(arquivo, dtype=str)
+        for inicio in range(0, len(planilha), tamanho_bloco):
+            yield planilha.iloc[inicio : inicio + tamanho_bloco]
+    else:
+        yield from pd.read_csv(arquivo, dtype=str, chunksize=tamanho_bloco)
+
+
+def contar_linhas(arquivo: IO[bytes], nome: str) -> Optional[int]:
+    """
+    Estima a quantidade de linhas de dados da planilha, usada na barra de progresso.
+
+    Args:
+        arquivo (IO[bytes]): O conteúdo da planilha; a posição de leitura é restaurada.
+        nome (str): O nome do arquivo, cuja extensão define o formato.
+
+    Returns:
+        Optional[int]: A quantidade de linhas de um CSV, ou None para arquivos Excel.
+    """
+    if nome.lower().endswith((".xlsx", ".xls")):
+        return None
+    linhas = sum(1 for _ in arquivo) - 1
+    arquivo.seek(0)
+    return max(linhas, 0)
+
+
+def validar_bloco(
+    bloco: pd.DataFrame, categorias: FrozenSet[str]
+) -> Tuple[List[Tuple[int, dict]], List[dict]]:
+    """
+    Valida um bloco de linhas da planilha.
+
+    Args:
+        bloco (pd.DataFrame): As linhas da planilha.
+        categorias (FrozenSet[str]): As categorias válidas, obtidas de `GET /categories`.
+
+    Returns:
+        Tuple[List[Tuple[int, dict]], List[dict]]: As linhas válidas, com o número da linha
+            na planilha e os dados do produto, e os erros de cada linha inválida.
+    """
+    faltando = [coluna for coluna in COLUNAS_OBRIGATORIAS if coluna not in bloco]
+    if faltando:
+        detalhe = f"Colunas ausentes: {', '.join(faltando)}"
+        return [], [
+            {"linha": indice + PRIMEIRA_LINHA, "erro": detalhe}
+            for indice in bloco.index
+        ]
+
+    validos, erros = [], []
+    bloco = bloco.reindex(columns=COLUNAS)
+    precos = pd.to_numeric(bloco["price"], errors="coerce")
+    for indice, linha in bloco.iterrows():
+        numero = indice + PRIMEIRA_LINHA
+        problemas = []
+        name = linha["name"].strip() if isinstance(linha["name"], str) else ""
+        if not name:
+            problemas.append("nome vazio")
+        if not precos[indice] > 0:
+            problemas.append("preço deve ser um número positivo")
+        if linha["categoria"] not in categorias:
+            problemas.append(f"categoria inválida: {linha['categoria']}")
+        if not isinstance(linha["email_fornecedor"], str) or not EMAIL.match(
+            linha["email_fornecedor"].strip()
+        ):
+            problemas.append(f"e-mail inválido: {linha['email_fornecedor']}")
+        if problemas:
+            erros.append({"linha": numero, "erro": "; ".join(problemas)})
+            continue
+        description = linha["description"]
+        validos.append(
+            (
+                numero,
+                {
+                    "name": name,
+                    "description": (
+                        description if isinstance(description, str) else None
+                    ),
+                    "price": float(precos[indice]),
+                    "categoria": linha["categoria"],
+                    "email_fornecedor": linha["email_fornecedor"].strip(),
+                },
+            )
+        )
+    return validos, erros
+
+
+def enviar_lote(produtos: List[dict], cliente: ClienteAPI) -> requests.Response:
+    """
+    Envia um lote, reenviando-o enquanto o backend o recusar por limite de taxa ou sobrecarga.
+
+    As respostas 429 e 503 são dadas antes de o lote ser processado, então reenviá-lo não
+    duplica produtos. A espera segue o cabeçalho `Retry-After` ou, sem ele, dobra a cada
+    tentativa, limitada a `MAX_ESPERA` segundos.
+
+    Args:
+        produtos (List[dict]): Os dados dos produtos do lote.
+        cliente (ClienteAPI): O cliente da API, obtido na thread do Streamlit.
+
+    Returns:
+        requests.Response: A resposta do último envio; após `MAX_REENVIOS` recusas, a
+            própria recusa.
+    """
+    for tentativa in range(MAX_REENVIOS + 1):
+        response = adicionar_produtos(produtos, cliente)
+        if response.status_code not in STATUS_REENVIO or tentativa == MAX_REENVIOS:
+            return response
+        try:
+            espera = float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            espera = 2.0**tentativa
+        time.sleep(min(max(espera, 0.0), MAX_ESPERA))
+    return response
+
+
+def _mensagem(detail) -> str:
+    if isinstance(detail, list):
+        return "; ".join(error["msg"] for error in detail)
+    return str(detail)
+
+
+def _erros_do_lote(numeros: List[int], future: Future) -> Tuple[int, List[dict]]:
+    try:
+        response = future.result()
+    except requests.RequestException as exc:
+        # falha de conexão mesmo após as novas tentativas do cliente
+        return 0, [{"linha": numero, "erro": str(exc)} for numero in numeros]
+    if response.status_code != 200:
+        return 0, [
+            {"linha": numero, "erro": f"HTTP {response.status_code}: {response.text}"}
+            for numero in numeros
+        ]
+    resultado = response.json()
+    return len(resultado["items"]), [
+        {"linha": numeros[erro["index"]], "erro": _mensagem(erro["detail"])}
+        for erro in resultado["errors"]
+    ]
+
+
+def importar_produtos(
+    arquivo: IO[bytes],
+    nome: str,
+    tamanho_lote: int = 500,
+    concorrencia: int = 4,
+    ao_progredir: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[int, List[Dict]]:
+    """
+    Importa os produtos da planilha, enviando os lotes ao backend em paralelo.
+
+    Cada bloco lido da planilha é validado e suas linhas válidas formam um lote de
+    `POST /products/bulk`. No máximo `2 * concorrencia` lotes ficam lidos e não confirmados
+    ao mesmo tempo, de modo que um CSV não precisa caber inteiro na memória. Os lotes
+    recusados com 429 ou 503 são reenviados por `enviar_lote`.
+
+    Args:
+        arquivo (IO[bytes]): O conteúdo da planilha.
+        nome (str): O nome do arquivo, cuja extensão define o formato (CSV ou Excel).
+        tamanho_lote (int): A quantidade de linhas por requisição.
+        concorrencia (int): A quantidade de requisições simultâneas.
+        ao_progredir (Optional[Callable[[int, int], None]]): Chamada na thread atual a cada
+            lote concluído, com as linhas processadas e o total estimado (0 se desconhecido).
+
+    Returns:
+        Tuple[int, List[Dict]]: A quantidade de produtos criados e os erros por linha,
+            ordenados pelo número da linha.
+
+    Raises:
+        requests.HTTPError: Se o backend não retornar as categorias válidas.
+    """
+    categorias = frozenset(carregar_categorias())
+    total = contar_linhas(arquivo, nome) or 0
+    cliente = obter_cliente()
+    criados, processadas, erros = 0, 0, []
+    pendentes: List[Tuple[List[int], Future, int]] = []
+
+    def concluir(limite: int) -> None:
+        nonlocal criados, processadas
+        while len(pendentes) > limite:
+            wait([future for _, future, _ in pendentes], return_when=FIRST_COMPLETED)
+            for item in [item for item in pendentes if item[1].done()]:
+                pendentes.remove(item)
+                numeros, future, tamanho = item
+                quantidade, falhas = _erros_do_lote(numeros, future)
+                criados += quantidade
+                processadas += tamanho
+                erros.extend(falhas)
+                if ao_progredir:
+                    ao_progredir(processadas, max(total, processadas))
+
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        for bloco in ler_planilha(arquivo, nome, tamanho_lote):
+            validos, invalidos = validar_bloco(bloco, categorias)
+            erros.extend(invalidos)
+            if not validos:
+                processadas += len(bloco)
+                if ao_progredir:
+                    ao_progredir(processadas, max(total, processadas))
+                continue
+            numeros = [numero for numero, _ in validos]
+            produtos = [produto for _, produto in validos]
+            future = executor.submit(enviar_lote, produtos, cliente)
+            pendentes.append((numeros, future, len(bloco)))
+            concluir(2 * concorrencia)
+        concluir(0)
+
+    if criados:
+        limpar_cache()
+    erros.sort(key=lambda erro: erro["linha"])
+    return criados, erros
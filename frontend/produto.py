@@ -1,6 +1,11 @@
 """
 Obtem um produto com atributos como nome, descrição, preço, categoria e email do fornecedor.
 
+As requisições ao backend passam por um único `ClienteAPI`, criado uma vez por processo
+com `st.cache_resource`: a sessão HTTP reutiliza conexões keep-alive, aplica timeouts e
+repete com backoff as falhas de conexão e as respostas 429, 502, 503 e 504. As leituras usadas
+pela interface ficam em cache com `st.cache_data`, que é limpo após cada alteração.
+
 Methods:
     show_response_message(response): Exibe uma mensagem baseada no status da resposta HTTP.
                                                         Se o status da resposta for 200, exibe uma mensagem de sucesso.
@@ -17,9 +22,15 @@ Methods:
                                         Se o detalhe do erro for uma lista, exibe cada mensagem de erro em uma nova linha.
                                         Caso contrário, exibe o detalhe do erro diretamente.
 
+    obter_cliente(): Retorna o cliente da API compartilhado pelas sessões do Streamlit.
+
+    limpar_cache(): Descarta as leituras em cache, após uma alteração de produto.
+
     adicionar_produto(name,description,price,categoria,email_fornecedor): Envia uma requisição para adicionar um novo produto.
 
-    visualizar_produtos():  Envia uma requisição para obter a lista de todos os produtos.
+    adicionar_produtos(produtos, cliente): Envia uma requisição para adicionar vários produtos em lote.
+
+    visualizar_produtos(cursor, limit, sort, colunas):  Envia uma requisição para obter uma página da lista de produtos.
 
     obter_detalhes_do_produto(id_produto):  Envia uma requisição para obter os detalhes de um produto específico.
 
@@ -27,10 +38,125 @@ Methods:
 
     atualizar_produto(id_produto, dados_atualizados): Envia uma requisição para atualizar um produto específico.
 
+    obter_estatisticas(bucket): Envia uma requisição para obter as estatísticas agregadas dos produtos.
+
+    carregar_produtos(cursor, limit, sort, colunas): Retorna uma página de produtos, com cache.
+
+    carregar_produto(id_produto): Retorna os detalhes de um produto, com cache.
+
+    carregar_estatisticas(bucket): Retorna as estatísticas agregadas dos produtos, com cache.
+
+    obter_categorias(): Envia uma requisição para obter as categorias de produtos.
+
+    carregar_categorias(): Retorna as categorias de produtos, com cache.
+
 """
 
+import os
+from typing import Any, List, Optional, Tuple
+
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BACKEND_URL = os.getenv("BACKEND_URL", "http://backend:8000")
+BACKEND_CONNECT_TIMEOUT = float(os.getenv("BACKEND_CONNECT_TIMEOUT", "3.05"))
+BACKEND_READ_TIMEOUT = float(os.getenv("BACKEND_READ_TIMEOUT", "30"))
+BACKEND_RETRIES = int(os.getenv("BACKEND_RETRIES", "3"))
+BACKEND_BACKOFF = float(os.getenv("BACKEND_BACKOFF", "0.3"))
+FRONTEND_CACHE_TTL = int(os.getenv("FRONTEND_CACHE_TTL", "60"))
+FRONTEND_CATEGORIES_TTL = int(os.getenv("FRONTEND_CATEGORIES_TTL", "3600"))
+
+
+class ClienteAPI:
+    """
+    Cliente HTTP do backend de produtos.
+
+    Mantém uma `requests.Session` com um pool de conexões keep-alive, de modo que as
+    requisições não abrem uma conexão TCP nova a cada chamada. Falhas de conexão são
+    repetidas em qualquer método, pois a requisição não chegou ao backend; respostas
+    429, 502, 503 e 504 e falhas de leitura são repetidas apenas em GET, que não altera dados,
+    respeitando o cabeçalho `Retry-After` enviado pelo backend.
+
+    Parameters:
+        base_url (str): O endereço do backend, como "http://backend:8000".
+        timeout (Tuple[float, float]): Os timeouts de conexão e de leitura, em segundos.
+        retries (int): A quantidade máxima de novas tentativas por requisição.
+        backoff (float): O fator de espera exponencial entre as tentativas, em segundos.
+        pool_size (int): A quantidade de conexões mantidas abertas com o backend.
+
+    Methods:
+        request(method, path, **kwargs): Envia uma requisição ao backend.
+        get(path, **kwargs): Envia uma requisição GET ao backend.
+        post(path, **kwargs): Envia uma requisição POST ao backend.
+        put(path, **kwargs): Envia uma requisição PUT ao backend.
+        delete(path, **kwargs): Envia uma requisição DELETE ao backend.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: Tuple[float, float] = (3.05, 30.0),
+        retries: int = 3,
+        backoff: float = 0.3,
+        pool_size: int = 10,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry, pool_connections=1, pool_maxsize=pool_size
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        """
+        Envia uma requisição ao backend.
+
+        Args:
+            method (str): O método HTTP.
+            path (str): O caminho da rota, como "/products/".
+            **kwargs: Os argumentos de `requests.Session.request`; o timeout padrão do
+                cliente é usado quando `timeout` não é informado.
+
+        Returns:
+            requests.Response: A resposta HTTP da requisição.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, f"{self.base_url}{path}", **kwargs)
+
+    def get(self, path: str, **kwargs: Any) -> requests.Response:
+        """
+        Envia uma requisição GET ao backend.
+        """
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs: Any) -> requests.Response:
+        """
+        Envia uma requisição POST ao backend.
+        """
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path: str, **kwargs: Any) -> requests.Response:
+        """
+        Envia uma requisição PUT ao backend.
+        """
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path: str, **kwargs: Any) -> requests.Response:
+        """
+        Envia uma requisição DELETE ao backend.
+        """
+        return self.request("DELETE", path, **kwargs)
 
 
 def show_response_message(response: requests.Response) -> None:
@@ -90,6 +216,34 @@ def mostrar_erro_detalhado(data: dict) -> None:
         st.error(f"Erro: {data['detail']}")
 
 
+@st.cache_resource
+def obter_cliente() -> ClienteAPI:
+    """
+    Retorna o cliente da API compartilhado pelas sessões do Streamlit.
+
+    O cliente é criado uma única vez por processo, com o endereço, os timeouts e as
+    tentativas definidos pelas variáveis de ambiente.
+
+    Returns:
+        ClienteAPI: O cliente do backend de produtos.
+    """
+    return ClienteAPI(
+        BACKEND_URL,
+        timeout=(BACKEND_CONNECT_TIMEOUT, BACKEND_READ_TIMEOUT),
+        retries=BACKEND_RETRIES,
+        backoff=BACKEND_BACKOFF,
+    )
+
+
+def limpar_cache() -> None:
+    """
+    Descarta as leituras em cache, após uma alteração de produto.
+    """
+    carregar_produtos.clear()
+    carregar_produto.clear()
+    carregar_estatisticas.clear()
+
+
 def adicionar_produto(
     name: str,
     description: str,
@@ -110,8 +264,8 @@ def adicionar_produto(
     Returns:
         response(requests.Response): A resposta HTTP da requisição.
     """
-    response = requests.post(
-        "http://backend:8000/products/",
+    response = obter_cliente().post(
+        "/products/",
         json={
             "name": name,
             "description": description,
@@ -120,17 +274,57 @@ def adicionar_produto(
             "email_fornecedor": email_fornecedor,
         },
     )
+    if response.ok:
+        limpar_cache()
+    return response
+
+
+def adicionar_produtos(
+    produtos: List[dict], cliente: Optional[ClienteAPI] = None
+) -> requests.Response:
+    """
+    Envia uma requisição para adicionar vários produtos em lote.
+
+    Pode ser chamada fora da thread do Streamlit, recebendo o cliente já obtido; por isso
+    não limpa o cache de leituras, o que cabe a quem chama após o último lote.
+
+    Args:
+        produtos (List[dict]): Os dados dos produtos, com os campos de `adicionar_produto`.
+        cliente (Optional[ClienteAPI]): O cliente da API; se None, usa `obter_cliente()`.
+
+    Returns:
+        response(requests.Response): A resposta HTTP da requisição, com os produtos criados
+            em `items` e os erros por posição no lote em `errors`.
+    """
+    response = (cliente or obter_cliente()).post("/products/bulk", json=produtos)
     return response
 
 
-def visualizar_produtos() -> requests.Response:
+def visualizar_produtos(
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    sort: str = "id",
+    colunas: Optional[Tuple[str, ...]] = None,
+) -> requests.Response:
     """
-    Envia uma requisição para obter a lista de todos os produtos.
+    Envia uma requisição para obter uma página da lista de produtos.
+
+    Args:
+        cursor (Optional[str]): Cursor retornado pela página anterior em `next_cursor`.
+        limit (int): Quantidade máxima de produtos na página.
+        sort (str): Campo de ordenação, precedido de "-" para ordem decrescente.
+        colunas (Optional[Tuple[str, ...]]): Os campos pedidos ao backend em `fields`, além
+            do `id`; se não informado, todos os campos.
 
     Returns:
         response(requests.Response): A resposta HTTP da requisição.
     """
-    response = requests.get("http://backend:8000/products/")
+    params = {"limit": limit, "sort": sort}
+    if cursor:
+        params["cursor"] = cursor
+    if colunas:
+        params["fields"] = ",".join(dict.fromkeys(("id", *colunas)))
+    response = obter_cliente().get("/products/", params=params)
     return response
 
 
@@ -144,7 +338,7 @@ def obter_detalhes_do_produto(id_produto: str) -> requests.Response:
     Returns:
         response(requests.Response): A resposta HTTP da requisição.
     """
-    response = requests.get(f"http://backend:8000/products/{id_produto}")
+    response = obter_cliente().get(f"/products/{id_produto}")
     return response
 
 
@@ -158,7 +352,9 @@ def deletar_produto(id_produto: str) -> requests.Response:
     Returns:
         response(requests.Response): A resposta HTTP da requisição.
     """
-    response = requests.delete(f"http://backend:8000/products/{id_produto}")
+    response = obter_cliente().delete(f"/products/{id_produto}")
+    if response.ok:
+        limpar_cache()
     return response
 
 
@@ -173,7 +369,121 @@ def atualizar_produto(id_produto: str, dados_atualizados: str) -> requests.Respo
     Returns:
         response (requests.Response): A resposta HTTP da requisição.
     """
-    response = requests.put(
-        f"http://backend:8000/products/{id_produto}", json=dados_atualizados
-    )
+    response = obter_cliente().put(f"/products/{id_produto}", json=dados_atualizados)
+    if response.ok:
+        limpar_cache()
+    return response
+
+
+def obter_estatisticas(bucket: str = "day") -> requests.Response:
+    """
+    Envia uma requisição para obter as estatísticas agregadas dos produtos.
+
+    Args:
+        bucket (str): A largura dos intervalos do histograma de criação: "hour", "day", "week" ou "month".
+
+    Returns:
+        response (requests.Response): A resposta HTTP da requisição.
+    """
+    response = obter_cliente().get("/products/stats", params={"bucket": bucket})
     return response
+
+
+@st.cache_data(ttl=FRONTEND_CACHE_TTL, show_spinner=False)
+def carregar_produtos(
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    sort: str = "id",
+    colunas: Optional[Tuple[str, ...]] = None,
+) -> dict:
+    """
+    Retorna uma página de produtos, com cache.
+
+    Voltar a uma página já vista, ou avançar para uma página buscada antecipadamente,
+    não faz uma nova requisição. As colunas fazem parte da chave do cache: mudar a seleção
+    busca a página de novo, apenas com os campos pedidos.
+
+    Args:
+        cursor (Optional[str]): Cursor retornado pela página anterior em `next_cursor`.
+        limit (int): Quantidade máxima de produtos na página.
+        sort (str): Campo de ordenação, precedido de "-" para ordem decrescente.
+        colunas (Optional[Tuple[str, ...]]): Os campos da página, além do `id`; se não
+            informado, todos os campos.
+
+    Returns:
+        dict: Os produtos da página em `items` e o cursor da próxima em `next_cursor`.
+
+    Raises:
+        requests.HTTPError: Se o backend responder com erro; erros não ficam em cache.
+    """
+    response = visualizar_produtos(cursor, limit, sort, colunas)
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(ttl=FRONTEND_CACHE_TTL, show_spinner=False)
+def carregar_produto(id_produto: int) -> dict:
+    """
+    Retorna os detalhes de um produto, com cache.
+
+    Args:
+        id_produto (int): ID do produto para obter detalhes.
+
+    Returns:
+        dict: Os dados do produto.
+
+    Raises:
+        requests.HTTPError: Se o backend responder com erro; erros não ficam em cache.
+    """
+    response = obter_detalhes_do_produto(id_produto)
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(ttl=FRONTEND_CACHE_TTL, show_spinner=False)
+def carregar_estatisticas(bucket: str = "day") -> dict:
+    """
+    Retorna as estatísticas agregadas dos produtos, com cache.
+
+    Args:
+        bucket (str): A largura dos intervalos do histograma de criação: "hour", "day", "week" ou "month".
+
+    Returns:
+        dict: As estatísticas, no formato de `GET /products/stats`.
+
+    Raises:
+        requests.HTTPError: Se o backend responder com erro; erros não ficam em cache.
+    """
+    response = obter_estatisticas(bucket)
+    response.raise_for_status()
+    return response.json()
+
+
+def obter_categorias() -> requests.Response:
+    """
+    Envia uma requisição para obter as categorias de produtos.
+
+    Returns:
+        response (requests.Response): A resposta HTTP da requisição.
+    """
+    response = obter_cliente().get("/categories")
+    return response
+
+
+@st.cache_data(ttl=FRONTEND_CATEGORIES_TTL, show_spinner=False)
+def carregar_categorias() -> List[str]:
+    """
+    Retorna as categorias de produtos, com cache.
+
+    As categorias não mudam com as alterações de produtos, por isso não são descartadas por
+    `limpar_cache` e ficam em cache por `FRONTEND_CATEGORIES_TTL` segundos.
+
+    Returns:
+        List[str]: As categorias, na ordem de exibição.
+
+    Raises:
+        requests.HTTPError: Se o backend responder com erro; erros não ficam em cache.
+    """
+    response = obter_categorias()
+    response.raise_for_status()
+    return response.json()